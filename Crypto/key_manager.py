@@ -1,38 +1,159 @@
 import os
 import json
+import time
+from concurrent.futures import ProcessPoolExecutor
 from hashlib import sha256
 from cryptography.hazmat.primitives.asymmetric import rsa
 from cryptography.hazmat.primitives import serialization
 
+
+def _generate_pem_pair(key_size=2048):
+   """Generate an RSA key pair as (private_pem, public_pem). Module-level so worker processes can run it."""
+   private_key = rsa.generate_private_key(
+      public_exponent=65537,
+      key_size=key_size
+   )
+   public_key = private_key.public_key()
+
+   private_pem = private_key.private_bytes(
+      encoding=serialization.Encoding.PEM,
+      format=serialization.PrivateFormat.PKCS8,
+      encryption_algorithm=serialization.NoEncryption()
+   ).decode('utf-8')
+
+   public_pem = public_key.public_bytes(
+      encoding=serialization.Encoding.PEM,
+      format=serialization.PublicFormat.SubjectPublicKeyInfo
+   ).decode('utf-8')
+
+   return private_pem, public_pem
+
+
 class KeyManager:
    """Manage RSA key generation, saving, and loading."""
 
-   def __init__(self, keys_directory='keys'):
+   def __init__(self, keys_directory='keys', refresh_interval=1.0):
+      """
+      :param keys_directory: Directory holding the PEM files
+      :param refresh_interval: Minimum seconds between checks of the directory for changes
+      """
       self.keys_directory = keys_directory
+      self.refresh_interval = refresh_interval
       os.makedirs(keys_directory, exist_ok=True)
 
-   def generate_key_pair(self, key_size=2048):
-      private_key = rsa.generate_private_key(
-         public_exponent=65537,
-         key_size=key_size
-      )
-      public_key = private_key.public_key()
-
-      private_pem = private_key.private_bytes(
-         encoding=serialization.Encoding.PEM,
-         format=serialization.PrivateFormat.PKCS8,
-         encryption_algorithm=serialization.NoEncryption()
-      ).decode('utf-8')
-
-      public_pem = public_key.public_bytes(
-         encoding=serialization.Encoding.PEM,
-         format=serialization.PublicFormat.SubjectPublicKeyInfo
-      ).decode('utf-8')
+      # In-memory keyring: {key_id: public_key_pem}, plus what it was loaded from.
+      self._keyring = {}
+      self._files = {}
+      self._directory_mtime = None
+      self._last_check = None
+      self._version = 0
+      self._json_entries = {}
+      self._exported = {}
 
+   def generate_key_pair(self, key_size=2048):
+      private_pem, public_pem = _generate_pem_pair(key_size)
       key_id = self.get_key_fingerprint(public_pem)
 
       return private_pem, public_pem, key_id
 
+   def _write_key_files(self, private_key_pem, public_key_pem):
+      """Write a key pair, creating the private key file with 0600 permissions from the start."""
+      key_id = self.get_key_fingerprint(public_key_pem)
+      private_path = os.path.join(self.keys_directory, f'{key_id}_private.pem')
+      public_path = os.path.join(self.keys_directory, f'{key_id}_public.pem')
+
+      fd = os.open(private_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+      with os.fdopen(fd, 'w') as f:
+         f.write(private_key_pem)
+      os.chmod(private_path, 0o600)
+
+      with open(public_path, 'w') as f:
+         f.write(public_key_pem)
+
+      self._keyring_add(f'{key_id}_public.pem', os.stat(public_path).st_mtime_ns, public_key_pem)
+      return key_id, private_path, public_path
+
+   def read_manifest(self, manifest_file='provisioning_manifest.jsonl'):
+      """
+      Read a provisioning manifest, keeping only entries whose key files still exist.
+
+      :param manifest_file: Manifest filename inside keys_directory
+      :return: List of manifest entries
+      """
+      manifest_path = os.path.join(self.keys_directory, manifest_file)
+      if not os.path.exists(manifest_path):
+         return []
+
+      entries = []
+      with open(manifest_path, 'r') as f:
+         for line in f:
+            try:
+               entry = json.loads(line)
+            except ValueError:
+               # A line cut short by an interruption; its batch is regenerated.
+               continue
+            if os.path.exists(entry['private_path']) and os.path.exists(entry['public_path']):
+               entries.append(entry)
+      return entries
+
+   def _drop_partial_line(self, manifest_path):
+      """Truncate a manifest after its last newline, so appended entries start on a line of their own."""
+      if not os.path.exists(manifest_path):
+         return
+      with open(manifest_path, 'rb+') as f:
+         content = f.read()
+         if content and not content.endswith(b'\n'):
+            f.truncate(content.rfind(b'\n') + 1)
+
+   def provision_keys(self, count, key_size=2048, workers=None, batch_size=32,
+                      manifest_file='provisioning_manifest.jsonl', progress=None):
+      """
+      Generate many key pairs in parallel and save them to keys_directory.
+      Keys are written batch by batch and recorded in a JSON-lines manifest,
+      so an interrupted run resumes where it stopped when called again.
+
+      :param count: Total number of key pairs the manifest should hold
+      :param key_size: RSA key size
+      :param workers: Number of worker processes (defaults to the CPU count)
+      :param batch_size: Number of key pairs written per batch
+      :param manifest_file: Manifest filename inside keys_directory
+      :param progress: Optional callable (done, count) called after each batch
+      :return: List of manifest entries {key_id, private_path, public_path, created}
+      """
+      manifest = self.read_manifest(manifest_file)
+      remaining = count - len(manifest)
+      if remaining <= 0:
+         return manifest[:count]
+
+      manifest_path = os.path.join(self.keys_directory, manifest_file)
+      self._drop_partial_line(manifest_path)
+      with ProcessPoolExecutor(max_workers=workers) as executor, open(manifest_path, 'a') as log:
+         while remaining > 0:
+            size = min(batch_size, remaining)
+            pairs = list(executor.map(_generate_pem_pair, [key_size] * size))
+
+            lines = []
+            for private_pem, public_pem in pairs:
+               key_id, private_path, public_path = self._write_key_files(private_pem, public_pem)
+               entry = {
+                  'key_id': key_id,
+                  'private_path': private_path,
+                  'public_path': public_path,
+                  'created': time.time()
+               }
+               manifest.append(entry)
+               lines.append(json.dumps(entry) + '\n')
+
+            log.write(''.join(lines))
+            log.flush()
+            os.fsync(log.fileno())
+
+            remaining -= size
+            if progress is not None:
+               progress(len(manifest), count)
+
+      return manifest
+
    def save_key_pair(self, private_key_pem, public_key_pem, key_id=None):
       if key_id is None:
          key_id = self.get_key_fingerprint(public_key_pem)
@@ -48,6 +169,8 @@ class KeyManager:
 
       os.chmod(private_path, 0o600)
 
+      self._keyring_add(f'{key_id}_public.pem', os.stat(public_path).st_mtime_ns, public_key_pem)
+
       return key_id, private_path, public_path
 
    def load_private_key(self, file_path):
@@ -62,20 +185,99 @@ class KeyManager:
       """Calculate a SHA256 fingerprint truncated to 16 hex characters."""
       return sha256(public_key_pem.encode('utf-8')).hexdigest()[:16]
 
+   def _keyring_add(self, filename, mtime_ns, public_key_pem):
+      kid = self.get_key_fingerprint(public_key_pem)
+      previous = self._files.get(filename)
+      if previous is not None and previous[1] != kid:
+         self._keyring_remove(filename)
+      self._files[filename] = (mtime_ns, kid)
+      if self._keyring.get(kid) != public_key_pem:
+         self._keyring[kid] = public_key_pem
+         self._json_entries[kid] = f'  {json.dumps(kid)}: {json.dumps(public_key_pem)}'
+         self._version += 1
+
+   def _keyring_remove(self, filename):
+      _, kid = self._files.pop(filename)
+      if not any(other == kid for _, other in self._files.values()):
+         self._keyring.pop(kid, None)
+         self._json_entries.pop(kid, None)
+         self._version += 1
+
+   def refresh(self, force=False):
+      """
+      Synchronize the keyring with keys_directory.
+      Files are only re-read when the directory (or, when forced, a file) has a new mtime.
+
+      :param force: Re-stat every key file even if the directory looks unchanged
+      :return: (list of added key_ids, list of removed key_ids)
+      """
+      self._last_check = time.monotonic()
+      directory_mtime = os.stat(self.keys_directory).st_mtime_ns
+      if not force and directory_mtime == self._directory_mtime:
+         return [], []
+
+      before = set(self._keyring)
+      seen = set()
+      with os.scandir(self.keys_directory) as entries:
+         for entry in entries:
+            if not entry.name.endswith('_public.pem'):
+               continue
+            seen.add(entry.name)
+            mtime_ns = entry.stat().st_mtime_ns
+            known = self._files.get(entry.name)
+            if known is None or known[0] != mtime_ns:
+               self._keyring_add(entry.name, mtime_ns, self.load_public_key(entry.path))
+
+      for filename in set(self._files) - seen:
+         self._keyring_remove(filename)
+
+      self._directory_mtime = directory_mtime
+      after = set(self._keyring)
+      return sorted(after - before), sorted(before - after)
+
+   def _maybe_refresh(self):
+      if self._last_check is None or time.monotonic() - self._last_check >= self.refresh_interval:
+         self.refresh()
+
+   def get_public_key(self, key_id):
+      """Look up a public key PEM by fingerprint, or None if unknown."""
+      self._maybe_refresh()
+      return self._keyring.get(key_id)
+
    def load_all_public_keys(self):
       """Load all public keys from keys_directory into a dict {key_id: public_key_pem}."""
-      public_keys = {}
-      for filename in os.listdir(self.keys_directory):
-         if filename.endswith('_public.pem'):
-            path = os.path.join(self.keys_directory, filename)
-            pub_key = self.load_public_key(path)
-            kid = self.get_key_fingerprint(pub_key)
-            public_keys[kid] = pub_key
-      return public_keys
+      self._maybe_refresh()
+      return dict(self._keyring)
 
    def export_public_keys(self, output_file='public_keys.json'):
-      public_keys = self.load_all_public_keys()
+      """
+      Write the keyring to a JSON file in keys_directory.
+      The file is only rewritten when the keyring changed since the last export,
+      and per-key JSON entries are cached so unchanged keys are not re-encoded.
+      """
+      self._maybe_refresh()
       output_path = os.path.join(self.keys_directory, output_file)
-      with open(output_path, 'w') as f:
-         json.dump(public_keys, f, indent=2)
+      if self._exported.get(output_path) == self._version and os.path.exists(output_path):
+         return output_path
+      scanned = os.stat(self.keys_directory).st_mtime_ns == self._directory_mtime
+
+      if self._json_entries:
+         content = '{\n' + ',\n'.join(self._json_entries[kid] for kid in self._keyring) + '\n}'
+      else:
+         content = '{}'
+      temp_path = output_path + '.tmp'
+      with open(temp_path, 'w') as f:
+         f.write(content)
+      os.replace(temp_path, output_path)
+
+      self._exported[output_path] = self._version
+      # Writing the export changes the directory mtime; don't rescan for that alone.
+      # Only when the last scan was current, and no key file appeared or vanished meanwhile
+      # (the mtime is read first, so a later change still shows up as a new mtime).
+      if scanned:
+         directory_mtime = os.stat(self.keys_directory).st_mtime_ns
+         with os.scandir(self.keys_directory) as entries:
+            names = {entry.name for entry in entries if entry.name.endswith('_public.pem')}
+         if names == set(self._files):
+            self._directory_mtime = directory_mtime
       return output_path
\ No newline at end of file
@@ -0,0 +1,49 @@
+"""
+Bulk key provisioning from the command line.
+
+Usage: python -m crypto.provision COUNT [--keys-dir keys] [--key-size 2048]
+                                        [--workers N] [--batch-size 32]
+                                        [--manifest provisioning_manifest.jsonl]
+
+Running the same command again after an interruption resumes from the manifest.
+"""
+
+import argparse
+import sys
+import time
+from .key_manager import KeyManager
+
+
+def main(argv=None):
+   parser = argparse.ArgumentParser(description="Generate RSA key pairs in bulk.")
+   parser.add_argument('count', type=int, help="Total number of key pairs to provision")
+   parser.add_argument('--keys-dir', default='keys', help="Directory to write keys to")
+   parser.add_argument('--key-size', type=int, default=2048, help="RSA key size in bits")
+   parser.add_argument('--workers', type=int, default=None, help="Worker processes (default: CPU count)")
+   parser.add_argument('--batch-size', type=int, default=32, help="Key pairs written per batch")
+   parser.add_argument('--manifest', default='provisioning_manifest.jsonl', help="Manifest filename")
+   args = parser.parse_args(argv)
+
+   key_manager = KeyManager(args.keys_dir)
+   already = len(key_manager.read_manifest(args.manifest))
+   if already:
+      print(f"Resuming: {already} key pairs already provisioned")
+
+   start = time.time()
+   manifest = key_manager.provision_keys(
+      args.count,
+      key_size=args.key_size,
+      workers=args.workers,
+      batch_size=args.batch_size,
+      manifest_file=args.manifest,
+      progress=lambda done, total: print(f"{done}/{total} key pairs", end='\r', flush=True)
+   )
+   elapsed = time.time() - start
+
+   print(f"\n{len(manifest)} key pairs in {args.keys_dir} ({elapsed:.1f}s)")
+   print(f"Manifest: {key_manager.keys_directory}/{args.manifest}")
+   return 0
+
+
+if __name__ == '__main__':
+   sys.exit(main())
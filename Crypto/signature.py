@@ -22,13 +22,19 @@ class SignatureManager:
       except Exception as e:
             raise ValueError(f"Error extracting public key: {e}")
 
-   def sign_data(self, data, private_key_pem):
+   def load_private_key(self, private_key_pem):
+      """Parses a private key PEM once, for repeated use with sign_data_with_key."""
       try:
-         private_key = serialization.load_pem_private_key(
+         return serialization.load_pem_private_key(
             private_key_pem.encode('utf-8'),
             password=None
          )
+      except Exception as e:
+         raise ValueError(f"Error loading private key: {e}")
 
+   def sign_data_with_key(self, data, private_key):
+      """Signs data with an already parsed private key (see load_private_key)."""
+      try:
          if isinstance(data, dict):
             data_bytes = json.dumps(data, sort_keys=True).encode('utf-8')
          else:
@@ -48,6 +54,13 @@ class SignatureManager:
       except Exception as e:
          raise ValueError(f"Error signing data: {e}")
 
+   def sign_data(self, data, private_key_pem):
+      try:
+         private_key = self.load_private_key(private_key_pem)
+      except ValueError as e:
+         raise ValueError(f"Error signing data: {e}")
+      return self.sign_data_with_key(data, private_key)
+
    def verify_signature(self, data, signature_b64, public_key_pem):
       try:
          public_key = serialization.load_pem_public_key(
@@ -0,0 +1,279 @@
+import json
+import math
+import time
+from collections import OrderedDict
+from starlette.requests import Request
+
+# Largest request body buffered to read the owner field; larger bodies are limited per client only.
+MAX_FORM_BYTES = 64 * 1024
+
+
+class TokenBucket:
+   """Refills `rate` tokens per second up to `capacity`; each admitted request takes one."""
+
+   __slots__ = ('rate', 'capacity', 'tokens', 'updated')
+
+   def __init__(self, rate, capacity, now=None):
+      self.rate = rate
+      self.capacity = capacity
+      self.tokens = capacity
+      self.updated = time.monotonic() if now is None else now
+
+   def _refill(self, now):
+      self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+      self.updated = now
+
+   def retry_after(self, now=None):
+      """Seconds until a token is available (0 if one is available now)."""
+      self._refill(time.monotonic() if now is None else now)
+      return 0.0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+
+   def take(self, now=None):
+      """Takes a token if available; returns True if the request is admitted."""
+      if self.retry_after(now) > 0:
+         return False
+      self.tokens -= 1
+      return True
+
+
+class BucketTable:
+   """Token buckets keyed by client or owner, evicting the least recently used keys."""
+
+   def __init__(self, rate, capacity, max_keys=10000):
+      self.rate = rate
+      self.capacity = capacity
+      self.max_keys = max_keys
+      self.buckets = OrderedDict()
+
+   def get(self, key, now):
+      bucket = self.buckets.get(key)
+      if bucket is None:
+         bucket = self.buckets[key] = TokenBucket(self.rate, self.capacity, now)
+         if len(self.buckets) > self.max_keys:
+            self.buckets.popitem(last=False)
+      else:
+         self.buckets.move_to_end(key)
+      return bucket
+
+
+class AdmissionRule:
+   """How one write endpoint is admitted."""
+
+   def __init__(self, owner_field=None, uses_mempool=False, authority=False):
+      """
+      :param owner_field: Form field identifying the owner/user, limited per value
+      :param uses_mempool: Reject with 429 while the mempool is full
+      :param authority: Authority traffic: requests with a valid authority or operator token get a
+         separate, larger budget and no mempool limit; others are limited per client
+      """
+      self.owner_field = owner_field
+      self.uses_mempool = uses_mempool
+      self.authority = authority
+
+
+DEFAULT_RULES = {
+   ('POST', '/blockchain/submit_property'): AdmissionRule(owner_field='owner', uses_mempool=True),
+   # Bulk uploads are also charged per line while streaming (see AdmissionController.admit_line).
+   ('POST', '/blockchain/submit_bulk'): AdmissionRule(uses_mempool=True),
+   ('POST', '/blockchain/mine'): AdmissionRule(authority=True),
+   ('POST', '/blockchain/validator/add'): AdmissionRule(authority=True),
+   ('POST', '/blockchain/segment'): AdmissionRule(authority=True),
+   ('POST', '/listings/book'): AdmissionRule(owner_field='user_email'),
+   ('POST', '/network/announce'): AdmissionRule(),
+   ('POST', '/network/peers'): AdmissionRule(authority=True),
+   ('POST', '/network/sync'): AdmissionRule(authority=True)
+}
+
+
+def bearer_token(headers):
+   """
+   Returns the bearer token of an ASGI request, if any.
+
+   :param headers: ASGI header list of (name, value) byte pairs
+   :return: Token string or None
+   """
+   for name, value in headers:
+      if name == b'authorization':
+         scheme, _, token = value.decode('latin-1').partition(' ')
+         return token.strip() if scheme.lower() == 'bearer' else None
+   return None
+
+
+class AdmissionController:
+   """
+   Admission decisions for write endpoints: a token bucket per client address,
+   one per owner, a global mempool limit, and a separate budget for authority
+   endpoints so owner/tenant floods cannot starve validation.
+   """
+
+   def __init__(self, rules=None, client_rate=5.0, client_burst=20, owner_rate=2.0, owner_burst=10,
+                authority_rate=50.0, authority_burst=200, line_rate=50.0, line_burst=500,
+                mempool_full=None, mempool_retry_after=5, authenticate=None):
+      """
+      :param rules: {(method, path): AdmissionRule}
+      :param client_rate: Requests per second per client address
+      :param client_burst: Bucket size per client address
+      :param owner_rate: Requests per second per owner
+      :param owner_burst: Bucket size per owner
+      :param authority_rate: Requests per second per authority on authority endpoints
+      :param authority_burst: Bucket size per authority on authority endpoints
+      :param line_rate: Bulk submission lines per second per client address
+      :param line_burst: Bucket size of bulk lines per client address
+      :param mempool_full: Callable returning True when the mempool is at capacity
+      :param mempool_retry_after: Retry-After (seconds) sent when the mempool is full
+      :param authenticate: Callable mapping a bearer token to an authority identity, or None
+      """
+      self.rules = DEFAULT_RULES if rules is None else rules
+      self.clients = BucketTable(client_rate, client_burst)
+      self.owners = BucketTable(owner_rate, owner_burst)
+      self.authorities = BucketTable(authority_rate, authority_burst)
+      self.lines = BucketTable(line_rate, line_burst)
+      self.mempool_full = mempool_full or (lambda: False)
+      self.authenticate = authenticate or (lambda token: None)
+      self.mempool_retry_after = mempool_retry_after
+      self.admitted = {}
+      self.rejected = {}
+
+   def scale(self, factor):
+      """Multiplies every rate and burst by factor (e.g. for load tests); resets buckets."""
+      for table in (self.clients, self.owners, self.authorities, self.lines):
+         table.rate *= factor
+         table.capacity *= factor
+         table.buckets.clear()
+
+   def rule_for(self, method, path):
+      return self.rules.get((method, path))
+
+   def admit(self, route, rule, client, owner=None, now=None, token=None):
+      """
+      Decides whether a request may proceed.
+
+      :param token: Bearer token of the request; only a valid authority token unlocks the authority budget
+      :return: (None, 0) if admitted, else (reason, retry_after_seconds)
+      """
+      now = time.monotonic() if now is None else now
+      authority = self.authenticate(token) if rule.authority and token else None
+      if authority is not None:
+         checks = [('authority_rate', self.authorities.get(authority, now))]
+      else:
+         checks = [('client_rate', self.clients.get(client, now))]
+         if owner:
+            checks.append(('owner_rate', self.owners.get(owner, now)))
+
+      # Check every bucket before taking, so a rejection does not consume tokens.
+      for reason, bucket in checks:
+         wait = bucket.retry_after(now)
+         if wait > 0:
+            return self._reject(route, reason, wait)
+      if rule.uses_mempool and authority is None and self.mempool_full():
+         return self._reject(route, 'mempool_full', self.mempool_retry_after)
+
+      for _, bucket in checks:
+         bucket.take(now)
+      self.admitted[route] = self.admitted.get(route, 0) + 1
+      return None, 0
+
+   def admit_line(self, route, client, now=None):
+      """
+      Charges one line of a bulk submission to the client's line budget.
+
+      :return: (None, 0) if admitted, else (reason, retry_after_seconds)
+      """
+      now = time.monotonic() if now is None else now
+      bucket = self.lines.get(client, now)
+      if not bucket.take(now):
+         return self._reject(route, 'line_rate', bucket.retry_after(now))
+      return None, 0
+
+   def _reject(self, route, reason, retry_after):
+      counts = self.rejected.setdefault(route, {})
+      counts[reason] = counts.get(reason, 0) + 1
+      return reason, retry_after
+
+   def stats(self):
+      """Admitted and rejected request counts per route (rejections per reason)."""
+      return {
+         'admitted': dict(self.admitted),
+         'rejected': {route: dict(counts) for route, counts in self.rejected.items()},
+         'tracked_clients': len(self.clients.buckets) + len(self.lines.buckets),
+         'tracked_authorities': len(self.authorities.buckets),
+         'tracked_owners': len(self.owners.buckets)
+      }
+
+
+class AdmissionControlMiddleware:
+   """ASGI middleware answering 429 with Retry-After for requests the controller rejects."""
+
+   def __init__(self, app, controller):
+      self.app = app
+      self.controller = controller
+
+   async def __call__(self, scope, receive, send):
+      if scope['type'] != 'http':
+         return await self.app(scope, receive, send)
+      rule = self.controller.rule_for(scope['method'], scope['path'])
+      if rule is None:
+         return await self.app(scope, receive, send)
+
+      owner = None
+      if rule.owner_field:
+         body, receive = await self._buffer_body(receive)
+         if body is not None:
+            owner = await self._read_field(scope, body, rule.owner_field)
+
+      client = scope['client'][0] if scope.get('client') else 'unknown'
+      token = bearer_token(scope.get('headers', ())) if rule.authority else None
+      reason, retry_after = self.controller.admit(scope['path'], rule, client, owner, token=token)
+      if reason is None:
+         return await self.app(scope, receive, send)
+
+      payload = json.dumps({'detail': f"Too many requests ({reason})"}).encode('utf-8')
+      await send({
+         'type': 'http.response.start',
+         'status': 429,
+         'headers': [
+            (b'content-type', b'application/json'),
+            (b'content-length', str(len(payload)).encode()),
+            (b'retry-after', str(max(1, math.ceil(retry_after))).encode())
+         ]
+      })
+      await send({'type': 'http.response.body', 'body': payload})
+
+   async def _buffer_body(self, receive):
+      """Reads a small request body and returns it with a receive() that replays it."""
+      messages = []
+      size = 0
+      complete = False
+      while size <= MAX_FORM_BYTES:
+         message = await receive()
+         messages.append(message)
+         if message['type'] != 'http.request':
+            break
+         size += len(message.get('body', b''))
+         if not message.get('more_body', False):
+            complete = True
+            break
+
+      async def replay_receive():
+         if messages:
+            return messages.pop(0)
+         return await receive()
+
+      body = b''.join(m.get('body', b'') for m in messages) if complete else None
+      return body, replay_receive
+
+   async def _read_field(self, scope, body, field):
+      async def body_receive():
+         return {'type': 'http.request', 'body': body, 'more_body': False}
+
+      try:
+         form = await Request(scope, body_receive).form()
+      except Exception:
+         # Malformed bodies are left for the endpoint to reject.
+         return None
+      value = form.get(field)
+      await form.close()
+      return value if isinstance(value, str) else None
+
+def setup_admission_control(app, controller):
+   app.add_middleware(AdmissionControlMiddleware, controller=controller)
@@ -1,7 +1,35 @@
-from fastapi import APIRouter, Form, HTTPException
+from fastapi import APIRouter, Form, Header, HTTPException
+from api.services.blockchain_service import blockchain_service
+from typing import Optional
 
 auth_router = APIRouter()
 
+def bearer_token(authorization: Optional[str]):
+   scheme, _, token = (authorization or "").partition(" ")
+   return token.strip() if scheme.lower() == "bearer" else None
+
+def require_authority(authorization: Optional[str] = Header(None)):
+   """Dependency for authority endpoints: returns the validator bound to the request's bearer token."""
+   validator = blockchain_service.authenticate_authority(bearer_token(authorization))
+   if validator is None:
+      raise HTTPException(
+         status_code=401,
+         detail="Authority token required",
+         headers={"WWW-Authenticate": "Bearer"}
+      )
+   return validator
+
+def require_operator(authorization: Optional[str] = Header(None)):
+   """Dependency for administration endpoints: accepts an authority or an operator token."""
+   identity = blockchain_service.authenticate_operator(bearer_token(authorization))
+   if identity is None:
+      raise HTTPException(
+         status_code=401,
+         detail="Authority or operator token required",
+         headers={"WWW-Authenticate": "Bearer"}
+      )
+   return identity
+
 @auth_router.post("/login")
 def login(username: str = Form(...), password: str = Form(...), role: str = Form(...)):
    if (username == "admin" and password == "admin" and role == "authority") or \
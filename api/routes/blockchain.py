@@ -1,10 +1,40 @@
-from fastapi import APIRouter, UploadFile, File, Form, HTTPException
+from fastapi import APIRouter, Depends, UploadFile, File, Form, HTTPException, Request
+from fastapi.responses import StreamingResponse
 from api.services.blockchain_service import blockchain_service
+from api.services.admission_service import admission_controller
+from api.routes.auth import require_authority, require_operator
+from blockchain.serialization import decode_blocks, is_binary_chain
+from typing import Optional
+import asyncio
+import json
 import time
 
 blockchain_router = APIRouter()
 
-@blockchain_router.post("/validator/add")
+# Bulk ingestion limits
+MAX_BULK_LINE_BYTES = 64 * 1024
+MEMPOOL_WAIT_SECONDS = 30
+MEMPOOL_POLL_SECONDS = 0.05
+# Longest /mine waits for its block to be signed and committed.
+SEAL_TIMEOUT_SECONDS = 30
+OPTIONAL_LISTING_FIELDS = ("type", "location", "maxGuests")
+# Segment upload limits: request body, and total size once decompressed.
+MAX_SEGMENT_BODY_BYTES = 8 * 1024 * 1024
+MAX_SEGMENT_DECODED_BYTES = 64 * 1024 * 1024
+# Most blocks streamed by one /blocks request; clients page with from_height.
+MAX_BLOCK_RANGE = 1000
+# Most headers returned by one /headers request (above the node sync batch of 500).
+MAX_HEADER_RANGE = 2000
+
+class _DuplexStreamingResponse(StreamingResponse):
+   # StreamingResponse listens for client disconnect by consuming receive(),
+   # which would swallow request body chunks still being read by the generator.
+   async def __call__(self, scope, receive, send):
+      await self.stream_response(send)
+      if self.background is not None:
+         await self.background()
+
+@blockchain_router.post("/validator/add", dependencies=[Depends(require_operator)])
 async def add_validator(file: UploadFile = File(...)):
    key_pem = (await file.read()).decode()
    try:
@@ -29,8 +59,147 @@ async def submit_property(
       "status": "pending",
       "timestamp": time.time()
    }
-   blockchain_service.add_new_transaction(tx)
-   return {"message": "Logement submitted for validation"}
+   try:
+      blockchain_service.add_new_transaction(tx)
+   except ValueError as e:
+      raise HTTPException(status_code=409, detail=str(e))
+   return {"message": "Logement submitted for validation", "tx_id": tx["tx_id"]}
+
+def _bulk_transaction(line):
+   try:
+      item = json.loads(line)
+   except ValueError:
+      raise ValueError("invalid JSON")
+   if not isinstance(item, dict):
+      raise ValueError("expected a JSON object")
+
+   for field in ("title", "description"):
+      if not isinstance(item.get(field), str) or not item[field]:
+         raise ValueError(f"missing or invalid '{field}'")
+   price = item.get("price")
+   if isinstance(price, bool) or not isinstance(price, (int, float)):
+      raise ValueError("missing or invalid 'price'")
+   # Optional fields are indexed as facet keys, so only the types the form accepts get through.
+   for field in ("type", "location"):
+      if field in item and not isinstance(item[field], str):
+         raise ValueError(f"invalid '{field}'")
+   guests = item.get("maxGuests", 0)
+   if isinstance(guests, bool) or not isinstance(guests, int) or guests < 0:
+      raise ValueError("invalid 'maxGuests'")
+
+   tx = {
+      "from": str(item.get("owner", "unknown_owner")),
+      "to": "authority",
+      "title": item["title"],
+      "description": item["description"],
+      "price": float(price),
+      "status": "pending",
+      "timestamp": time.time()
+   }
+   for field in OPTIONAL_LISTING_FIELDS:
+      if field in item:
+         tx[field] = item[field]
+   return tx
+
+async def _wait_for_mempool():
+   deadline = time.monotonic() + MEMPOOL_WAIT_SECONDS
+   while blockchain_service.mempool_full:
+      if time.monotonic() >= deadline:
+         return False
+      await asyncio.sleep(MEMPOOL_POLL_SECONDS)
+   return True
+
+async def _wait_for_line_budget(client):
+   deadline = time.monotonic() + MEMPOOL_WAIT_SECONDS
+   while True:
+      reason, retry_after = admission_controller.admit_line("/blockchain/submit_bulk", client)
+      if reason is None:
+         return True
+      if time.monotonic() + retry_after >= deadline:
+         return False
+      await asyncio.sleep(retry_after)
+
+async def _ingest_lines(request):
+   buffer = b""
+   line_number = 0
+   client = request.client.host if request.client else "unknown"
+
+   async def process(raw):
+      nonlocal line_number
+      line_number += 1
+      line = raw.strip()
+      if not line:
+         return None
+      # Every line is charged, so a single upload cannot bypass the per-client rate.
+      if not await _wait_for_line_budget(client):
+         return {"line": line_number, "status": "rejected", "error": "rate limited"}
+      if len(line) > MAX_BULK_LINE_BYTES:
+         return {"line": line_number, "status": "rejected", "error": "line too long"}
+      try:
+         tx = _bulk_transaction(line)
+      except ValueError as e:
+         return {"line": line_number, "status": "rejected", "error": str(e)}
+      # Not reading further while the mempool is full pushes back on the uploader.
+      if not await _wait_for_mempool():
+         return {"line": line_number, "status": "rejected", "error": "mempool full"}
+      try:
+         blockchain_service.add_new_transaction(tx)
+      except ValueError as e:
+         return {"line": line_number, "status": "rejected", "error": str(e)}
+      return {"line": line_number, "status": "accepted", "tx_id": tx["tx_id"]}
+
+   skipping = False
+   async for chunk in request.stream():
+      if skipping:
+         # Drop the rest of an oversized line without holding it in memory.
+         newline = chunk.find(b"\n")
+         if newline < 0:
+            continue
+         chunk = chunk[newline + 1:]
+         skipping = False
+
+      lines = (buffer + chunk).split(b"\n")
+      buffer = lines.pop()
+      for raw in lines:
+         result = await process(raw)
+         if result is not None:
+            yield json.dumps(result) + "\n"
+
+      if len(buffer) > MAX_BULK_LINE_BYTES:
+         line_number += 1
+         yield json.dumps({"line": line_number, "status": "rejected", "error": "line too long"}) + "\n"
+         buffer = b""
+         skipping = True
+
+   result = await process(buffer)
+   if result is not None:
+      yield json.dumps(result) + "\n"
+
+@blockchain_router.post("/submit_bulk")
+async def submit_bulk(request: Request):
+   return _DuplexStreamingResponse(_ingest_lines(request), media_type="application/x-ndjson")
+
+@blockchain_router.post("/segment", dependencies=[Depends(require_operator)])
+async def append_segment(request: Request):
+   content_length = request.headers.get("content-length")
+   if content_length and content_length.isdigit() and int(content_length) > MAX_SEGMENT_BODY_BYTES:
+      raise HTTPException(status_code=413, detail="Segment too large")
+   raw = bytearray()
+   async for chunk in request.stream():
+      raw += chunk
+      if len(raw) > MAX_SEGMENT_BODY_BYTES:
+         raise HTTPException(status_code=413, detail="Segment too large")
+   raw = bytes(raw)
+   try:
+      blocks = decode_blocks(raw, MAX_SEGMENT_DECODED_BYTES) if is_binary_chain(raw) else json.loads(raw)
+      if not isinstance(blocks, list):
+         raise ValueError("expected a list of blocks")
+      appended = blockchain_service.append_segment(blocks)
+   except PermissionError as e:
+      raise HTTPException(status_code=403, detail=str(e))
+   except (ValueError, KeyError, TypeError) as e:
+      raise HTTPException(status_code=400, detail=f"Invalid segment: {e}")
+   return {"appended": appended, "height": blockchain_service.height}
 
 @blockchain_router.get("/properties")
 def get_properties(owner: str):
@@ -43,17 +212,64 @@ def get_pending():
       if tx.get("status") == "pending"
    ]
 
+@blockchain_router.get("/headers")
+def get_headers(start: int = 0, end: Optional[int] = None):
+   # Heights [start, end), at most MAX_HEADER_RANGE of them.
+   if start < 0 or (end is not None and end < start):
+      raise HTTPException(status_code=400, detail="Invalid header range")
+   end = start + MAX_HEADER_RANGE if end is None else min(end, start + MAX_HEADER_RANGE)
+   return blockchain_service.get_headers(start, end)
+
+@blockchain_router.get("/blocks")
+def stream_blocks(from_height: int = 0, to_height: Optional[int] = None, headers_only: bool = False):
+   # Heights [from_height, to_height), at most MAX_BLOCK_RANGE of them.
+   if from_height < 0 or (to_height is not None and to_height < from_height):
+      raise HTTPException(status_code=400, detail="Invalid block range")
+   end = from_height + MAX_BLOCK_RANGE if to_height is None else min(to_height, from_height + MAX_BLOCK_RANGE)
+   blocks = blockchain_service.iter_blocks(from_height, end, headers_only)
+   return StreamingResponse(
+      (json.dumps(block) + "\n" for block in blocks),
+      media_type="application/x-ndjson"
+   )
+
+@blockchain_router.get("/block/{index}")
+def get_block(index: int):
+   block = blockchain_service.get_block(index)
+   if block is None:
+      raise HTTPException(status_code=404, detail="Block not found")
+   return block
+
+@blockchain_router.get("/proof/{tx_id}")
+def get_proof(tx_id: str):
+   proof = blockchain_service.get_transaction_proof(tx_id)
+   if proof is None:
+      raise HTTPException(status_code=404, detail="Transaction not found in chain")
+   return proof
+
 @blockchain_router.get("/stats")
 def get_stats():
    return blockchain_service.get_chain_stats()
 
+@blockchain_router.get("/admission")
+def get_admission_stats():
+   return admission_controller.stats()
+
 @blockchain_router.post("/mine")
-def mine(private_key: str = Form(...), title: str = Form(...)):
+async def mine(title: str = Form(...), validator: str = Depends(require_authority)):
+   # The block is signed with the key of the authenticated validator.
    for tx in blockchain_service.unconfirmed_transactions:
       if tx["title"] == title:
-         index = blockchain_service.mine_transaction(tx, private_key)
-         if index is not None:
-            return {"message": f"Transaction '{title}' validated in block {index}"}
-         else:
-            raise HTTPException(status_code=400, detail="Mining failed")
-   raise HTTPException(status_code=404, detail="Transaction not found")
\ No newline at end of file
+         try:
+            # Shielded: timing out stops waiting but does not withdraw the block.
+            index = await asyncio.wait_for(
+               asyncio.shield(asyncio.wrap_future(blockchain_service.seal_transaction(tx, validator))),
+               SEAL_TIMEOUT_SECONDS
+            )
+         except asyncio.TimeoutError:
+            raise HTTPException(status_code=504, detail="Timed out waiting for the block to be sealed")
+         except ValueError as e:
+            raise HTTPException(status_code=409, detail=str(e))
+         except PermissionError as e:
+            raise HTTPException(status_code=403, detail=str(e))
+         return {"message": f"Transaction '{title}' validated in block {index}"}
+   raise HTTPException(status_code=404, detail="Transaction not found")
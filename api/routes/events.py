@@ -0,0 +1,33 @@
+from fastapi import APIRouter, Request
+from fastapi.responses import StreamingResponse
+from api.services.event_service import event_broker
+from typing import Optional
+
+events_router = APIRouter()
+
+# Comment line sent on idle streams so proxies and browsers keep the connection open.
+KEEPALIVE_SECONDS = 15
+
+@events_router.get("/stream")
+async def event_stream(request: Request, cursor: Optional[str] = None):
+   # Browsers resend the last event id on reconnect; the query parameter serves other clients.
+   subscription = event_broker.subscribe(request.headers.get("last-event-id") or cursor)
+
+   async def frames():
+      try:
+         yield "retry: 3000\n\n"
+         while True:
+            batch = await subscription.next(KEEPALIVE_SECONDS)
+            yield "".join(batch) if batch else ": keepalive\n\n"
+      finally:
+         event_broker.unsubscribe(subscription)
+
+   return StreamingResponse(
+      frames(),
+      media_type="text/event-stream",
+      headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+   )
+
+@events_router.get("/stats")
+def event_stats():
+   return event_broker.stats()
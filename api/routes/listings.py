@@ -1,9 +1,42 @@
 from fastapi import APIRouter, Form, HTTPException
 from api.services.blockchain_service import blockchain_service
 from datetime import datetime
+from typing import Optional
 
 listings_router = APIRouter()
 
+def _listing_view(listing_id, entry, now):
+   tx = entry.get("transaction", {})
+   title = tx.get("title")
+   price = tx.get("price")
+
+   if not title or price is None:
+      return None
+
+   bookings = blockchain_service.get_bookings(listing_id)
+   booked_until = None
+   is_booked = False
+   if bookings:
+      try:
+         latest = max(bookings, key=lambda b: b["end_date"])
+         booked_until = latest["end_date"]
+         is_booked = datetime.strptime(booked_until, "%Y-%m-%d") > now
+      except Exception:
+         is_booked = False
+
+   return {
+      "id": listing_id,
+      "title": title,
+      "price": f"{price}DH/nuit",
+      "priceValue": price,
+      "emoji": "🏡",
+      "isBooked": is_booked,
+      "bookedUntil": booked_until,
+      "type": tx.get("type", "appartement"),
+      "location": tx.get("location", "Inconnu"),
+      "maxGuests": tx.get("maxGuests", 4)
+   }
+
 @listings_router.get("/public_listings")
 def public_listings():
    listings = blockchain_service.get_validated_logements()
@@ -11,38 +44,91 @@ def public_listings():
    result = []
 
    for idx, entry in enumerate(listings):
-      tx = entry.get("transaction", {})
-      title = tx.get("title")
-      price = tx.get("price")
+      view = _listing_view(idx + 1, entry, now)
+      if view is not None:
+         result.append(view)
 
-      if not title or price is None:
-         continue
+   return result
 
-      bookings = tx.get("bookings", [])
-      booked_until = None
-      is_booked = False
-      if bookings:
-         try:
-            latest = max(bookings, key=lambda b: b["end_date"])
-            booked_until = latest["end_date"]
-            is_booked = datetime.strptime(booked_until, "%Y-%m-%d") > now
-         except Exception:
-            is_booked = False
+@listings_router.get("/search")
+def search_listings(
+   q: Optional[str] = None,
+   type: Optional[str] = None,
+   location: Optional[str] = None,
+   min_price: Optional[float] = None,
+   max_price: Optional[float] = None,
+   min_guests: Optional[int] = None,
+   sort: Optional[str] = None,
+   offset: int = 0,
+   limit: int = 20
+):
+   if offset < 0 or not 1 <= limit <= 100:
+      raise HTTPException(status_code=400, detail="Invalid pagination parameters")
+   try:
+      total, page = blockchain_service.search_listings(
+         query=q, sort=sort, offset=offset, limit=limit,
+         type=type, location=location, min_price=min_price,
+         max_price=max_price, min_guests=min_guests
+      )
+   except ValueError as e:
+      raise HTTPException(status_code=400, detail=str(e))
 
-      result.append({
-         "id": idx + 1,
-         "title": title,
-         "price": f"{price}DH/nuit",
-         "priceValue": price,
-         "emoji": "🏡",
-         "isBooked": is_booked,
-         "bookedUntil": booked_until,
-         "type": tx.get("type", "appartement"),
-         "location": tx.get("location", "Inconnu"),
-         "maxGuests": tx.get("maxGuests", 4)
-      })
+   now = datetime.now()
+   results = [_listing_view(listing_id, entry, now) for listing_id, entry in page]
+   return {
+      "total": total,
+      "offset": offset,
+      "limit": limit,
+      "results": [view for view in results if view is not None]
+   }
 
-   return result
+@listings_router.get("/facets")
+def listing_facets(
+   type: Optional[str] = None,
+   location: Optional[str] = None,
+   guests: Optional[str] = None,
+   price: Optional[str] = None,
+   availability: Optional[str] = None,
+   offset: int = 0,
+   limit: int = 20
+):
+   if offset < 0 or not 1 <= limit <= 100:
+      raise HTTPException(status_code=400, detail="Invalid pagination parameters")
+   selection = {
+      "type": type,
+      "location": location,
+      "guests": guests,
+      "price": price,
+      "availability": availability
+   }
+   total, page, counts = blockchain_service.get_listing_facets(selection, offset, limit)
+
+   now = datetime.now()
+   results = [_listing_view(listing_id, entry, now) for listing_id, entry in page]
+   return {
+      "total": total,
+      "offset": offset,
+      "limit": limit,
+      "facets": counts,
+      "results": [view for view in results if view is not None]
+   }
+
+@listings_router.get("/stats")
+def listing_stats(
+   group_by: Optional[str] = None,
+   type: Optional[str] = None,
+   location: Optional[str] = None,
+   min_price: Optional[float] = None,
+   max_price: Optional[float] = None,
+   min_guests: Optional[int] = None
+):
+   try:
+      return blockchain_service.get_listing_stats(
+         group_by=group_by, type=type, location=location,
+         min_price=min_price, max_price=max_price, min_guests=min_guests
+      )
+   except ValueError as e:
+      raise HTTPException(status_code=400, detail=str(e))
 
 @listings_router.post("/book")
 def book_logement(
@@ -52,19 +138,16 @@ def book_logement(
    start_date: str = Form(...),
    end_date: str = Form(...)
 ):
-   validated = blockchain_service.get_validated_logements()
-   if listing_id < 1 or listing_id > len(validated):
+   try:
+      blockchain_service.add_booking(listing_id, {
+         "user": user_name,
+         "email": user_email,
+         "start_date": start_date,
+         "end_date": end_date
+      })
+   except KeyError:
       raise HTTPException(status_code=404, detail="Logement non trouvé")
+   except ValueError:
+      raise HTTPException(status_code=400, detail="Dates de réservation invalides")
 
-   tx = validated[listing_id - 1]
-   if "bookings" not in tx:
-      tx["bookings"] = []
-
-   tx["bookings"].append({
-      "user": user_name,
-      "email": user_email,
-      "start_date": start_date,
-      "end_date": end_date
-   })
-
-   return {"message": "Réservation enregistrée avec succès"}
\ No newline at end of file
+   return {"message": "Réservation enregistrée avec succès"}
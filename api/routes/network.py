@@ -0,0 +1,48 @@
+from fastapi import APIRouter, BackgroundTasks, Body, Depends, Form, HTTPException
+from typing import Optional
+from api.services.network_service import node
+from api.routes.auth import require_operator
+from network import HttpPeer, PEER_ERRORS
+
+network_router = APIRouter()
+
+def _background_sync():
+   try:
+      node.sync()
+   except Exception as e:
+      print(f"Sync failed: {e}")
+
+@network_router.get("/status")
+def get_status():
+   return node.status()
+
+@network_router.post("/announce")
+def announce(background_tasks: BackgroundTasks, block: dict = Body(...), origin: Optional[str] = Body(None)):
+   # The origin is not trusted: announcers are never added as peers (see POST /peers).
+   try:
+      result = node.handle_announcement(block, origin)
+   except (KeyError, TypeError, ValueError) as e:
+      raise HTTPException(status_code=400, detail=f"Invalid block: {e}")
+   if result == "sync":
+      background_tasks.add_task(_background_sync)
+   return {"result": result}
+
+@network_router.get("/peers")
+def get_peers():
+   return sorted(node.peers)
+
+@network_router.post("/peers", dependencies=[Depends(require_operator)])
+def add_peer(url: str = Form(...)):
+   try:
+      node.add_peer(HttpPeer(url))
+   except ValueError as e:
+      raise HTTPException(status_code=400, detail=str(e))
+   return {"message": "Peer added", "peers": sorted(node.peers)}
+
+@network_router.post("/sync", dependencies=[Depends(require_operator)])
+def sync():
+   try:
+      applied = node.sync()
+   except (ValueError, PermissionError) + PEER_ERRORS as e:
+      raise HTTPException(status_code=502, detail=f"Sync failed: {e}")
+   return {"applied": applied, "height": node.status()["height"]}
@@ -0,0 +1,8 @@
+from api.middleware.admission import AdmissionController
+from api.services.blockchain_service import blockchain_service
+
+# Shared by the middleware and the stats route.
+admission_controller = AdmissionController(
+   mempool_full=lambda: blockchain_service.mempool_full,
+   authenticate=blockchain_service.authenticate_operator
+)
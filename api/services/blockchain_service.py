@@ -1,8 +1,112 @@
+import hmac
+import os
+import secrets
 from blockchain.blockchain import LogementBlockchain
+from blockchain.signer import SignerWorker, BlockSealer
+
+# Upper bound on queued transactions, so bulk ingestion cannot grow the mempool without limit.
+MAX_PENDING_TRANSACTIONS = 10000
+# Identity of requests made with the operator token (administration without a signing key).
+OPERATOR = "operator"
 
 class BlockchainService:
    def __init__(self):
-      self.blockchain = LogementBlockchain(consensus_type="poa")
+      self.blockchain = LogementBlockchain(consensus_type="poa", max_pending_transactions=MAX_PENDING_TRANSACTIONS)
+      # Validator private keys live only in the signer worker, loaded from files at startup.
+      self.signer = SignerWorker()
+      self.sealer = BlockSealer(self.blockchain, self.signer)
+      # Bearer tokens for authority endpoints, each bound to a loaded validator key.
+      self.authority_tokens = {}
+      # Bearer tokens for administration only (validators, peers, sync), usable by nodes without a key.
+      self.operator_tokens = set()
+      for path in os.environ.get("LOGEMENTCERT_TRUSTED_VALIDATORS", "").split(","):
+         if path.strip():
+            self.load_trusted_validator(path.strip())
+      if os.environ.get("LOGEMENTCERT_OPERATOR_TOKEN"):
+         self.add_operator_token(os.environ["LOGEMENTCERT_OPERATOR_TOKEN"])
+      paths = [path.strip() for path in os.environ.get("LOGEMENTCERT_VALIDATOR_KEYS", "").split(",") if path.strip()]
+      tokens = [token.strip() for token in os.environ.get("LOGEMENTCERT_AUTHORITY_TOKENS", "").split(",")]
+      for position, path in enumerate(paths):
+         token = tokens[position] if position < len(tokens) and tokens[position] else None
+         issued = self.load_validator_key(path, token)
+         if token is None:
+            print(f"Authority token for {path}: {issued}")
+      archive_dir = os.environ.get("LOGEMENTCERT_ARCHIVE_DIR")
+      if archive_dir:
+         self.enable_archive(archive_dir, int(os.environ.get("LOGEMENTCERT_ARCHIVE_DEPTH", 1024)))
+
+   def enable_archive(self, directory: str, depth: int = 1024):
+      self.blockchain.enable_archive(directory, depth)
+
+   def load_validator_key(self, path: str, token: str = None):
+      with open(path, 'r') as f:
+         return self.load_validator_key_pem(f.read(), token)
+
+   def load_validator_key_pem(self, private_key_pem: str, token: str = None):
+      """
+      Loads a validator private key into the signer and binds an authority token to it.
+
+      :param private_key_pem: Private key in PEM format
+      :param token: Authority token to accept for this key (generated if omitted)
+      :return: The authority token
+      """
+      validator = self.signer.load_key(private_key_pem)
+      token = token or secrets.token_urlsafe(32)
+      self.authority_tokens[token] = validator
+      return token
+
+   def load_trusted_validator(self, path: str):
+      """
+      Authorizes a validator from its public key file, so a node without
+      signing keys can accept the blocks of its peers.
+
+      :param path: Public key PEM file
+      """
+      with open(path, 'r') as f:
+         self.add_validator(f.read())
+
+   def add_operator_token(self, token: str = None):
+      """
+      Registers an operator token, accepted on administration endpoints but not for signing.
+
+      :param token: Token to accept (generated if omitted)
+      :return: The operator token
+      """
+      token = token or secrets.token_urlsafe(32)
+      self.operator_tokens.add(token)
+      return token
+
+   def authenticate_operator(self, token: str):
+      """
+      Resolves a token accepted on administration endpoints: an authority token or an operator token.
+
+      :param token: Bearer token sent by the client
+      :return: Validator public key PEM, OPERATOR, or None if the token is not accepted
+      """
+      validator = self.authenticate_authority(token)
+      if validator is not None or not token:
+         return validator
+      for known in self.operator_tokens:
+         if hmac.compare_digest(known.encode(), token.encode()):
+            return OPERATOR
+      return None
+
+   def authenticate_authority(self, token: str):
+      """
+      Resolves an authority token to the validator it was issued for.
+
+      :param token: Bearer token sent by the client
+      :return: Public key PEM of the validator, or None if the token is unknown or its key is not loaded
+      """
+      if not token:
+         return None
+      for known, validator in self.authority_tokens.items():
+         if hmac.compare_digest(known.encode(), token.encode()):
+            return validator if validator in self.signer.validators else None
+      return None
+
+   def seal_transaction(self, transaction: dict, validator: str = None):
+      return self.sealer.submit([transaction], validator)
 
    def add_validator(self, key_pem: str):
       self.blockchain.add_validator(key_pem)
@@ -16,12 +120,53 @@ class BlockchainService:
    def get_validated_logements(self):
       return self.blockchain.get_validated_logements()
 
+   def get_listing(self, listing_id: int):
+      return self.blockchain.get_listing(listing_id)
+
+   def search_listings(self, query: str = None, sort: str = None, offset: int = 0, limit: int = 20, **filters):
+      return self.blockchain.search_listings(query=query, sort=sort, offset=offset, limit=limit, **filters)
+
+   def get_listing_facets(self, selection: dict = None, offset: int = 0, limit: int = 20):
+      return self.blockchain.get_listing_facets(selection, offset, limit)
+
+   def add_booking(self, listing_id: int, booking: dict):
+      self.blockchain.add_booking(listing_id, booking)
+
+   def get_bookings(self, listing_id: int):
+      return self.blockchain.get_bookings(listing_id)
+
+   def get_listing_stats(self, group_by: str = None, **filters):
+      return self.blockchain.get_listing_stats(group_by=group_by, **filters)
+
    def get_chain_stats(self):
       return self.blockchain.get_chain_stats()
 
+   def get_headers(self, start: int = 0, end: int = None):
+      return self.blockchain.get_headers(start, end)
+
+   def iter_blocks(self, start: int = 0, end: int = None, headers_only: bool = False):
+      return self.blockchain.iter_blocks(start, end, headers_only)
+
+   def append_segment(self, blocks):
+      return self.blockchain.append_segment(blocks)
+
+   def get_block(self, index: int):
+      return self.blockchain.get_block(index)
+
+   def get_transaction_proof(self, tx_id: str):
+      return self.blockchain.get_transaction_proof(tx_id)
+
    def mine_transaction(self, transaction: dict, private_key: str):
       return self.blockchain.mine_transaction(transaction, private_key)
 
+   @property
+   def height(self):
+      return self.blockchain.last_block.index
+
+   @property
+   def mempool_full(self):
+      return self.blockchain.mempool_full
+
    @property
    def unconfirmed_transactions(self):
       return self.blockchain.unconfirmed_transactions
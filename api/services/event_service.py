@@ -0,0 +1,220 @@
+import asyncio
+import json
+import os
+import threading
+from collections import deque
+from api.services.blockchain_service import blockchain_service
+
+# Events kept so reconnecting clients can resume from their cursor.
+HISTORY_SIZE = 1024
+# Events buffered per client; a client that falls further behind is sent a reset.
+CLIENT_BUFFER_SIZE = 256
+
+
+def _frame(cursor, event_type, payload):
+   return f"id: {cursor}\nevent: {event_type}\ndata: {payload}\n\n"
+
+
+class Subscription:
+   """A connected client: a bounded buffer of encoded events, filled on its event loop."""
+
+   def __init__(self, broker, loop, max_buffer):
+      self.broker = broker
+      self.loop = loop
+      self.max_buffer = max_buffer
+      self.buffer = deque()
+      self.sequence = 0
+      # Set when the client must reload full state: new client, unknown cursor or overflow.
+      self.needs_reset = False
+      self.ready = asyncio.Event()
+
+   def push(self, sequence, frame):
+      if sequence <= self.sequence:
+         return
+      self.sequence = sequence
+      if not self.needs_reset:
+         if len(self.buffer) < self.max_buffer:
+            self.buffer.append(frame)
+         else:
+            # Deltas were lost; drop the rest and let the client resynchronize.
+            self.buffer.clear()
+            self.needs_reset = True
+            self.broker.resets += 1
+      self.ready.set()
+
+   async def next(self, timeout):
+      """
+      Waits for events.
+
+      :param timeout: Seconds to wait before returning nothing
+      :return: Encoded SSE frames (empty on timeout)
+      """
+      if not self.buffer and not self.needs_reset:
+         self.ready.clear()
+         try:
+            await asyncio.wait_for(self.ready.wait(), timeout)
+         except asyncio.TimeoutError:
+            return []
+      if self.needs_reset:
+         self.needs_reset = False
+         self.buffer.clear()
+         cursor = self.broker.cursor(self.sequence)
+         return [_frame(cursor, 'reset', json.dumps({'cursor': cursor}))]
+      frames = list(self.buffer)
+      self.buffer.clear()
+      return frames
+
+
+class EventBroker:
+   """
+   Fans chain events out to streaming clients. Each event is encoded once and
+   numbered; the cursor sent with it ("<epoch>-<sequence>") lets a client resume
+   after a reconnect as long as the event is still in the history.
+   """
+
+   def __init__(self, history_size=HISTORY_SIZE, client_buffer=CLIENT_BUFFER_SIZE):
+      """
+      :param history_size: Events kept for resuming clients
+      :param client_buffer: Events buffered per client before it is reset
+      """
+      # Changes on restart, so cursors from an earlier process are not mistaken for ours.
+      self.epoch = os.urandom(4).hex()
+      self.sequence = 0
+      self.history = deque(maxlen=history_size)
+      self.client_buffer = client_buffer
+      self.subscriptions = set()
+      self.published = 0
+      self.resets = 0
+      self._lock = threading.Lock()
+
+   def cursor(self, sequence):
+      return f"{self.epoch}-{sequence}"
+
+   def _parse_cursor(self, cursor):
+      epoch, _, sequence = (cursor or '').partition('-')
+      if epoch != self.epoch or not sequence.isdigit():
+         return None
+      return int(sequence)
+
+   def publish(self, event_type, data):
+      """
+      Records an event and schedules its delivery to every subscriber.
+      Safe to call from any thread.
+
+      :param event_type: SSE event name
+      :param data: JSON-serializable payload
+      :return: Sequence number of the event
+      """
+      payload = json.dumps(data, separators=(',', ':'))
+      with self._lock:
+         self.sequence += 1
+         self.published += 1
+         frame = _frame(self.cursor(self.sequence), event_type, payload)
+         self.history.append((self.sequence, frame))
+         # Scheduled under the lock so each loop receives events in sequence order.
+         for loop in {subscription.loop for subscription in self.subscriptions}:
+            try:
+               loop.call_soon_threadsafe(self._deliver, loop, self.sequence, frame)
+            except RuntimeError:
+               # Loop already closed; its subscriptions are removed on unsubscribe.
+               pass
+         return self.sequence
+
+   def _deliver(self, loop, sequence, frame):
+      with self._lock:
+         subscriptions = [subscription for subscription in self.subscriptions if subscription.loop is loop]
+      for subscription in subscriptions:
+         subscription.push(sequence, frame)
+
+   def subscribe(self, cursor=None):
+      """
+      Registers a client on the running event loop.
+      Events after `cursor` are replayed from the history; without a usable
+      cursor the client first receives a reset telling it to load full state.
+
+      :param cursor: Last cursor the client received, if any
+      :return: Subscription
+      """
+      subscription = Subscription(self, asyncio.get_running_loop(), self.client_buffer)
+      last_seen = self._parse_cursor(cursor)
+      with self._lock:
+         subscription.sequence = self.sequence
+         backlog = [frame for sequence, frame in self.history if last_seen is not None and sequence > last_seen]
+         oldest = self.history[0][0] if self.history else self.sequence + 1
+         if last_seen is None or last_seen > self.sequence or last_seen + 1 < oldest \
+               or len(backlog) > self.client_buffer:
+            subscription.needs_reset = True
+         else:
+            subscription.buffer.extend(backlog)
+         self.subscriptions.add(subscription)
+      return subscription
+
+   def unsubscribe(self, subscription):
+      with self._lock:
+         self.subscriptions.discard(subscription)
+
+   def stats(self):
+      return {
+         'cursor': self.cursor(self.sequence),
+         'subscribers': len(self.subscriptions),
+         'published': self.published,
+         'resets': self.resets,
+         'history': len(self.history)
+      }
+
+
+def _on_block(block):
+   # Segments are indexed before listeners run, so counts come from this block, not the chain tip.
+   listing_ids = blockchain_service.blockchain.get_block_listing_ids(block.index)
+   validated = [tx for tx in block.transactions if tx.get('status') == 'validated']
+   event_broker.publish('block_added', {
+      'index': block.index,
+      'hash': block.hash,
+      'timestamp': block.timestamp,
+      'transactions': len(block.transactions),
+      'total_blocks': block.index + 1,
+      'validated_transactions': listing_ids.stop - 1
+   })
+   for listing_id, tx in zip(listing_ids, validated):
+      event_broker.publish('tx_validated', {
+         'tx_id': tx.get('tx_id'),
+         'listing_id': listing_id,
+         'block': block.index,
+         'title': tx.get('title'),
+         'price': tx.get('price'),
+         'type': tx.get('type'),
+         'location': tx.get('location'),
+         'maxGuests': tx.get('maxGuests')
+      })
+
+
+def _on_transaction(tx):
+   event_broker.publish('tx_queued', {
+      'tx_id': tx.get('tx_id'),
+      'title': tx.get('title'),
+      'description': tx.get('description'),
+      'price': tx.get('price'),
+      'owner': tx.get('from'),
+      'status': tx.get('status')
+   })
+
+
+def _on_booking(listing_id, booking):
+   # Only the dates are broadcast; the guest's name and email stay private.
+   event_broker.publish('booking_created', {
+      'listing_id': listing_id,
+      'start_date': booking['start_date'],
+      'end_date': booking['end_date']
+   })
+
+
+def _on_reorg(tip):
+   event_broker.publish('chain_replaced', {'index': tip.index, 'hash': tip.hash})
+
+
+# Singleton instance, fed by the shared blockchain
+event_broker = EventBroker()
+blockchain_service.blockchain.add_listener('block', _on_block)
+blockchain_service.blockchain.add_listener('transaction', _on_transaction)
+blockchain_service.blockchain.add_listener('booking', _on_booking)
+blockchain_service.blockchain.add_listener('reorg', _on_reorg)
@@ -0,0 +1,8 @@
+import os
+from api.services.blockchain_service import blockchain_service
+from network import Node, HttpPeer
+
+# Peers and public URL can be preset through the environment (comma-separated URLs).
+node = Node(blockchain_service.blockchain, url=os.environ.get("LOGEMENTCERT_NODE_URL"))
+for peer_url in filter(None, os.environ.get("LOGEMENTCERT_PEERS", "").split(",")):
+   node.add_peer(HttpPeer(peer_url.strip()))
@@ -1,10 +1,29 @@
 const API_BASE_URL = "http://localhost:8000";
 
 function logout() {
+   sessionStorage.removeItem("authorityToken");
    alert("Déconnexion réussie.");
    window.location.href = "login.html";
 }
 
+function authorityHeaders() {
+   // Token printed by the node at startup for its validator key; kept for this tab only.
+   let token = sessionStorage.getItem("authorityToken");
+   if (!token) {
+      token = prompt("Jeton d'autorité du nœud :") || "";
+      sessionStorage.setItem("authorityToken", token);
+   }
+   return { "Authorization": `Bearer ${token}` };
+}
+
+async function authorityFetch(url, options) {
+   const res = await fetch(url, { ...options, headers: authorityHeaders() });
+   if (res.status === 401) {
+      sessionStorage.removeItem("authorityToken");
+   }
+   return res;
+}
+
 document.getElementById('verificationForm').addEventListener('submit', async e => {
    e.preventDefault();
    const fileInput = document.getElementById('keyFile');
@@ -25,12 +44,13 @@ document.getElementById('verificationForm').addEventListener('submit', async e =
       `;
       const formData = new FormData();
       formData.append("file", file);
-      const res = await fetch(`${API_BASE_URL}/blockchain/validator/add`, {
+      const res = await authorityFetch(`${API_BASE_URL}/blockchain/validator/add`, {
          method: "POST",
          body: formData
       });
       const json = await res.json();
-      result.innerHTML += `<p style="color:green;"><strong>${json.message}</strong></p>`;
+      const color = res.ok ? "green" : "red";
+      result.innerHTML += `<p style="color:${color};"><strong>${json.message || json.detail}</strong></p>`;
    };
    reader.onerror = function() {
       result.innerHTML = "<p style='color:red;'>Erreur lors de la lecture du fichier.</p>";
@@ -38,21 +58,33 @@ document.getElementById('verificationForm').addEventListener('submit', async e =
    reader.readAsText(file);
 });
 
-async function loadStats() {
-   const res = await fetch(`${API_BASE_URL}/blockchain/stats`);
-   const stats = await res.json();
+// Pending transactions by tx_id, kept current by the event stream.
+const pendingTransactions = new Map();
+
+function renderStats(stats) {
    document.getElementById("blockchainStats").innerHTML = `
       <p><strong>Blocs totaux :</strong> ${stats.total_blocks}</p>
       <p><strong>Transactions validées :</strong> ${stats.validated_transactions}</p>
    `;
 }
 
+async function loadStats() {
+   const res = await fetch(`${API_BASE_URL}/blockchain/stats`);
+   renderStats(await res.json());
+}
+
 async function loadPendingValidations() {
    const res = await fetch(`${API_BASE_URL}/blockchain/pending`);
    const list = await res.json();
+   pendingTransactions.clear();
+   list.forEach(tx => pendingTransactions.set(tx.tx_id, tx));
+   renderPendingValidations();
+}
+
+function renderPendingValidations() {
    const container = document.getElementById("pendingValidations");
    container.innerHTML = "";
-   list.forEach(tx => {
+   pendingTransactions.forEach(tx => {
       const card = document.createElement("div");
       card.classList.add("card");
       card.innerHTML = `
@@ -69,21 +101,40 @@ async function loadPendingValidations() {
 }
 
 async function approveTransaction(title) {
-   const privateKey = prompt("Entrez la clé privée PEM pour signer le bloc :");
+   // Blocks are signed by the node's validator key; only the authority token is sent.
    const formData = new FormData();
-   formData.append("private_key", privateKey);
    formData.append("title", title);
-   const res = await fetch(`${API_BASE_URL}/blockchain/mine`, {
+   const res = await authorityFetch(`${API_BASE_URL}/blockchain/mine`, {
       method: "POST",
       body: formData
    });
    const result = await res.json();
-   alert(result.message);
-   loadStats();
-   loadPendingValidations();
+   alert(result.message || result.detail);
+}
+
+function connectEvents() {
+   // The server sends deltas; a reset (first connection, missed events or fork) means reload everything.
+   // EventSource reconnects by itself and resumes from the last event it received.
+   const events = new EventSource(`${API_BASE_URL}/events/stream`);
+   const reload = () => {
+      loadStats();
+      loadPendingValidations();
+   };
+   events.addEventListener('reset', reload);
+   events.addEventListener('chain_replaced', reload);
+   events.addEventListener('block_added', e => renderStats(JSON.parse(e.data)));
+   events.addEventListener('tx_queued', e => {
+      const tx = JSON.parse(e.data);
+      if (tx.status === 'pending') {
+         pendingTransactions.set(tx.tx_id, tx);
+         renderPendingValidations();
+      }
+   });
+   events.addEventListener('tx_validated', e => {
+      if (pendingTransactions.delete(JSON.parse(e.data).tx_id)) {
+         renderPendingValidations();
+      }
+   });
 }
 
-document.addEventListener('DOMContentLoaded', () => {
-   loadStats();
-   loadPendingValidations();
-});
\ No newline at end of file
+document.addEventListener('DOMContentLoaded', connectEvents);
\ No newline at end of file
@@ -15,6 +15,45 @@ async function fetchListings() {
    renderListings();
 }
 
+function listingFromEvent(tx) {
+   return {
+      id: tx.listing_id,
+      title: tx.title,
+      price: `${tx.price}DH/nuit`,
+      priceValue: tx.price,
+      emoji: "🏡",
+      isBooked: false,
+      bookedUntil: null,
+      type: tx.type || "appartement",
+      location: tx.location || "Inconnu",
+      maxGuests: tx.maxGuests || 4
+   };
+}
+
+function connectEvents() {
+   // The server sends deltas; a reset (first connection, missed events or fork) means reload the listings.
+   // EventSource reconnects by itself and resumes from the last event it received.
+   const events = new EventSource(`${API_BASE_URL}/events/stream`);
+   events.addEventListener('reset', fetchListings);
+   events.addEventListener('chain_replaced', fetchListings);
+   events.addEventListener('tx_validated', e => {
+      const tx = JSON.parse(e.data);
+      if (!tx.title || tx.price == null || listings.some(l => l.id === tx.listing_id)) return;
+      listings.push(listingFromEvent(tx));
+      performSearch();
+   });
+   events.addEventListener('booking_created', e => {
+      const booking = JSON.parse(e.data);
+      const listing = listings.find(l => l.id === booking.listing_id);
+      if (!listing) return;
+      if (!listing.bookedUntil || booking.end_date > listing.bookedUntil) {
+         listing.bookedUntil = booking.end_date;
+         listing.isBooked = new Date(booking.end_date) > new Date();
+      }
+      performSearch();
+   });
+}
+
 function showHome() {
    hideAllPages();
    document.getElementById('homePage').classList.add('active');
@@ -285,7 +324,7 @@ document.getElementById('startDate').addEventListener('change', function() {
 });
 
 document.addEventListener('DOMContentLoaded', function() {
-   fetchListings();
+   connectEvents();
    updateAuthUI();
    const today = new Date().toISOString().split('T')[0];
    document.getElementById('searchCheckin').min = today;
@@ -0,0 +1,112 @@
+"""
+Compare resident memory of a chain that keeps every block body in memory
+with one that archives bodies older than --depth blocks, and time lookups
+of archived listings.
+
+Usage: python -m benchmarks.archive_benchmark [block_count] [transactions_per_block] [depth]
+"""
+
+import gc
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from blockchain.block import Block
+from blockchain.blockchain import LogementBlockchain
+
+
+def resident_bytes():
+   """Current resident set size (Linux), else the peak reported by getrusage."""
+   try:
+      with open('/proc/self/status') as f:
+         for line in f:
+            if line.startswith('VmRSS:'):
+               return int(line.split()[1]) * 1024
+   except OSError:
+      pass
+   peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+   return peak if sys.platform == 'darwin' else peak * 1024
+
+
+PHRASES = [
+   "Bel appartement lumineux au coeur de la ville",
+   "à deux pas du stade et des transports",
+   "cuisine équipée, salon spacieux et balcon avec vue",
+   "climatisation, wifi haut débit et parking sécurisé",
+   "idéal pour les supporters en famille ou entre amis",
+   "quartier calme, commerces et restaurants à proximité",
+   "linge de maison fourni, ménage inclus en fin de séjour",
+   "terrasse ensoleillée, piscine partagée dans la résidence"
+]
+
+
+def make_description(rng):
+   # Realistic listing text (a few hundred characters) from a bounded vocabulary.
+   return ". ".join(rng.sample(PHRASES, 5)) + "."
+
+
+def build_chain(block_count, per_block, archive_dir, depth):
+   # PoW at difficulty 0 accepts any hash, so building is not dominated by mining.
+   rng = random.Random(2030)
+   blockchain = LogementBlockchain(difficulty=0, consensus_type='pow')
+   if archive_dir:
+      blockchain.enable_archive(archive_dir, depth=depth)
+   for index in range(1, block_count + 1):
+      transactions = [
+         {
+            "from": "owner_" + str((index * per_block + i) % 1000), "to": "authority",
+            "title": f"Appartement {index}-{i}",
+            "description": make_description(rng),
+            "price": 300.0 + (index + i) % 2000, "status": "validated", "timestamp": 1.7e9 + index,
+            "tx_id": f"{index:032x}{i:032x}", "location": "Casablanca", "maxGuests": i % 6 + 1
+         }
+         for i in range(per_block)
+      ]
+      block = Block(index, transactions, 1.7e9 + index, blockchain.last_block.hash)
+      blockchain.add_block(block, blockchain.proof_of_work(block))
+   return blockchain
+
+
+def run(mode, block_count, per_block, depth):
+   baseline = resident_bytes()
+   archive_dir = tempfile.mkdtemp() if mode == 'archived' else None
+   start = time.perf_counter()
+   blockchain = build_chain(block_count, per_block, archive_dir, depth)
+   build_seconds = time.perf_counter() - start
+   gc.collect()
+   used = resident_bytes() - baseline
+
+   rng = random.Random(1)
+   listing_ids = [rng.randrange(1, len(blockchain.listing_store) + 1) for _ in range(200)]
+   start = time.perf_counter()
+   for listing_id in listing_ids:
+      blockchain.get_listing(listing_id)
+   lookup_ms = (time.perf_counter() - start) / len(listing_ids) * 1000
+
+   print(f"{mode:9} {used / 2 ** 20:10.1f} MiB {build_seconds:8.1f} s {lookup_ms:10.3f} ms "
+         f"{blockchain.archived_height:9d}")
+
+
+def main():
+   block_count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+   per_block = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+   depth = int(sys.argv[3]) if len(sys.argv) > 3 else 1024
+
+   if len(sys.argv) > 4:
+      run(sys.argv[4], block_count, per_block, depth)
+      return
+
+   print(f"{block_count} blocks x {per_block} transactions, {depth} most recent bodies in memory")
+   print(f"{'mode':9} {'resident':>14} {'build':>10} {'lookup':>13} {'archived':>9}")
+   # Separate processes, so each measurement starts from a clean heap.
+   for mode in ('memory', 'archived'):
+      subprocess.run(
+         [sys.executable, '-m', 'benchmarks.archive_benchmark', str(block_count), str(per_block), str(depth), mode],
+         check=True
+      )
+
+
+if __name__ == '__main__':
+   main()
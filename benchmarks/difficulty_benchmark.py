@@ -0,0 +1,41 @@
+"""
+Mine PoW blocks with adaptive difficulty and show how block time converges
+to the target, window by window.
+
+Usage: python -m benchmarks.difficulty_benchmark [target_seconds] [block_count] [window]
+"""
+
+import sys
+import time
+from blockchain.blockchain import LogementBlockchain
+
+
+def main():
+   target = float(sys.argv[1]) if len(sys.argv) > 1 else 0.05
+   block_count = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+   window = int(sys.argv[3]) if len(sys.argv) > 3 else 10
+
+   blockchain = LogementBlockchain(difficulty=1, consensus_type='pow', target_block_time=target, retarget_window=window)
+   print(f"Target {target * 1000:.0f} ms/block, retarget every {window} blocks")
+   print(f"{'blocks':>9} {'difficulty':>12} {'mean ms':>9} {'max ms':>9}")
+
+   times = []
+   for i in range(block_count):
+      tx = {"from": "bench", "to": "authority", "title": f"Logement {i}", "description": "PoW",
+            "price": 100.0 + i, "status": "pending", "timestamp": time.time()}
+      blockchain.add_new_transaction(tx)
+      start = time.perf_counter()
+      blockchain.mine_transaction(blockchain.unconfirmed_transactions[-1], None)
+      times.append(time.perf_counter() - start)
+      if len(times) == window:
+         last = blockchain.last_block
+         print(f"{last.index - window + 1:4d}-{last.index:<4d} {last.difficulty:12.1f} "
+               f"{sum(times) / len(times) * 1000:9.1f} {max(times) * 1000:9.1f}")
+         times = []
+
+   if not blockchain.validate_chain(blockchain.get_chain_data()):
+      raise RuntimeError("Mined chain failed validation")
+
+
+if __name__ == '__main__':
+   main()
@@ -0,0 +1,98 @@
+"""
+Compare the server cost of clients polling /listings/public_listings with
+pushing delta events to the same clients through the EventBroker.
+
+Polling cost is the time to build one public_listings response, paid by every
+client on every poll. Push cost is the time to publish an event, paid once
+regardless of the number of clients, plus delivery to each subscriber.
+
+Usage: python -m benchmarks.event_stream_benchmark [listings] [clients] [events]
+"""
+
+import asyncio
+import sys
+import threading
+import time
+from api.services.event_service import EventBroker
+from blockchain.block import Block
+from blockchain.blockchain import LogementBlockchain
+
+
+def polling_cost(listing_count, per_block=10):
+   from datetime import datetime
+   from api.routes.listings import _listing_view
+
+   # PoW at difficulty 0 accepts any hash, so building is not dominated by mining.
+   blockchain = LogementBlockchain(difficulty=0, consensus_type='pow')
+   for index in range(1, listing_count // per_block + 1):
+      transactions = [
+         {
+            "from": f"owner_{i}", "to": "authority", "title": f"Logement {index}-{i}",
+            "description": f"Appartement {index}-{i}", "price": 300.0 + i, "status": "validated",
+            "timestamp": 1.7e9 + index
+         }
+         for i in range(per_block)
+      ]
+      block = Block(index, transactions, 1.7e9 + index, blockchain.last_block.hash)
+      blockchain.add_block(block, blockchain.proof_of_work(block))
+
+   # Same work as the public_listings route.
+   runs = 20
+   start = time.perf_counter()
+   for _ in range(runs):
+      now = datetime.now()
+      [_listing_view(i + 1, entry, now) for i, entry in enumerate(blockchain.get_validated_logements())]
+   return (time.perf_counter() - start) / runs
+
+
+async def push_cost(client_count, event_count):
+   broker = EventBroker(client_buffer=event_count + 1)
+   subscriptions = [broker.subscribe(broker.cursor(0)) for _ in range(client_count)]
+   published_at = {}
+   latencies = []
+
+   async def consume(subscription):
+      received = 0
+      while received < event_count:
+         frames = await subscription.next(5)
+         now = time.perf_counter()
+         for frame in frames:
+            sequence = int(frame.split('\n', 1)[0].rsplit('-', 1)[1])
+            latencies.append(now - published_at[sequence])
+         received += len(frames)
+
+   def produce():
+      for i in range(event_count):
+         published_at[i + 1] = time.perf_counter()
+         broker.publish('block_added', {'index': i, 'total_blocks': i + 1, 'validated_transactions': i})
+         time.sleep(0.001)
+
+   consumers = [asyncio.create_task(consume(subscription)) for subscription in subscriptions]
+   producer = threading.Thread(target=produce)
+   start = time.perf_counter()
+   producer.start()
+   await asyncio.gather(*consumers)
+   elapsed = time.perf_counter() - start
+   producer.join()
+   latencies.sort()
+   return elapsed, latencies[len(latencies) // 2], latencies[int(len(latencies) * 0.99)]
+
+
+def main():
+   listing_count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+   client_count = int(sys.argv[2]) if len(sys.argv) > 2 else 500
+   event_count = int(sys.argv[3]) if len(sys.argv) > 3 else 200
+
+   poll = polling_cost(listing_count)
+   print(f"polling: {poll * 1000:8.2f} ms per public_listings response ({listing_count} listings)")
+   print(f"         {poll * client_count:8.2f} s of server time per round of {client_count} clients")
+
+   elapsed, p50, p99 = asyncio.run(push_cost(client_count, event_count))
+   deliveries = client_count * event_count
+   print(f"push:    {event_count} events to {client_count} clients in {elapsed:.2f} s "
+         f"({deliveries / elapsed:,.0f} deliveries/s)")
+   print(f"         delivery latency p50 {p50 * 1000:.2f} ms, p99 {p99 * 1000:.2f} ms")
+
+
+if __name__ == '__main__':
+   main()
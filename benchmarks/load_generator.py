@@ -0,0 +1,272 @@
+"""
+Replay a mix of owner, authority and tenant traffic against the API and
+report throughput and p50/p95/p99 latency per route.
+
+Sessions arrive as a Poisson process (open loop) at --rate per second for
+--duration seconds; each session is one persona running a short scripted
+visit. Without --url the app is driven in-process through ASGI, otherwise
+requests go to a running node (e.g. python main.py --validator-key ...).
+
+Usage:
+   python -m benchmarks.load_generator [--url http://127.0.0.1:8000 --authority-token TOKEN]
+      [--mix owner=3,authority=1,tenant=6] [--rate 20] [--duration 30]
+      [--clients 200] [--seed-listings 50] [--rate-limit-scale 1] [--json FILE]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+import httpx
+
+DEFAULT_MIX = "owner=3,authority=1,tenant=6"
+
+
+class Recorder:
+   """Latency samples and status codes per route."""
+
+   def __init__(self):
+      self.samples = {}
+      self.statuses = {}
+      self.started = None
+      self.finished = None
+
+   async def request(self, client, method, route, url=None, **kwargs):
+      """Sends a request, recording its latency under route (e.g. 'GET /blockchain/stats')."""
+      start = time.perf_counter()
+      try:
+         response = await client.request(method, url or route.split(' ', 1)[1], **kwargs)
+         status = response.status_code
+      except httpx.HTTPError:
+         response, status = None, 'error'
+      elapsed = time.perf_counter() - start
+      self.samples.setdefault(route, []).append(elapsed)
+      statuses = self.statuses.setdefault(route, {})
+      statuses[status] = statuses.get(status, 0) + 1
+      return response
+
+   def report(self):
+      duration = (self.finished or time.perf_counter()) - self.started
+      routes = {}
+      for route, samples in sorted(self.samples.items()):
+         samples = sorted(samples)
+         routes[route] = {
+            'count': len(samples),
+            'throughput': len(samples) / duration,
+            'p50_ms': percentile(samples, 50) * 1000,
+            'p95_ms': percentile(samples, 95) * 1000,
+            'p99_ms': percentile(samples, 99) * 1000,
+            'statuses': {str(code): count for code, count in sorted(self.statuses[route].items(), key=str)}
+         }
+      total = sum(route['count'] for route in routes.values())
+      return {'duration': duration, 'requests': total, 'throughput': total / duration, 'routes': routes}
+
+
+def percentile(sorted_samples, p):
+   """Nearest-rank percentile of an already sorted list."""
+   if not sorted_samples:
+      return 0.0
+   rank = max(1, -(-len(sorted_samples) * p // 100))
+   return sorted_samples[int(rank) - 1]
+
+
+def parse_mix(text):
+   mix = {}
+   for part in filter(None, text.split(',')):
+      name, _, weight = part.partition('=')
+      if name not in PERSONAS:
+         raise ValueError(f"Unknown persona '{name}' (expected {', '.join(PERSONAS)})")
+      mix[name] = float(weight or 1)
+   return mix
+
+
+# Personas
+
+async def owner_session(client, recorder, rng, state):
+   owner = f"owner_{rng.randrange(state['owners'])}"
+   n = state['counter'] = state['counter'] + 1
+   await recorder.request(client, 'POST', 'POST /blockchain/submit_property', data={
+      'title': f"Logement {n} {owner}",
+      'description': f"Appartement {n}, {rng.choice(['Casablanca', 'Rabat', 'Marrakech', 'Tanger'])}",
+      'price': str(rng.randrange(200, 3000)),
+      'owner': owner
+   })
+   for _ in range(rng.randint(1, 3)):
+      await asyncio.sleep(rng.uniform(0.1, 0.5))
+      await recorder.request(client, 'GET', 'GET /blockchain/properties', params={'owner': owner})
+
+
+async def authority_session(client, recorder, rng, state):
+   response = await recorder.request(client, 'GET', 'GET /blockchain/pending')
+   await recorder.request(client, 'GET', 'GET /blockchain/stats')
+   pending = response.json() if response is not None and response.status_code == 200 else []
+   for tx in pending[:rng.randint(1, 3)]:
+      await recorder.request(client, 'POST', 'POST /blockchain/mine', data={'title': tx['title']},
+                             headers=state['authority_headers'])
+
+
+async def tenant_session(client, recorder, rng, state):
+   response = await recorder.request(client, 'GET', 'GET /listings/public_listings')
+   listings = response.json() if response is not None and response.status_code == 200 else []
+   free = [listing for listing in listings if not listing.get('isBooked')]
+   if free and rng.random() < 0.3:
+      listing = rng.choice(free)
+      tenant = f"tenant_{rng.randrange(state['tenants'])}"
+      day = rng.randint(1, 28)
+      await recorder.request(client, 'POST', 'POST /listings/book', data={
+         'listing_id': str(listing['id']),
+         'user_email': f"{tenant}@example.com",
+         'user_name': tenant,
+         'start_date': f"2030-06-{day:02d}",
+         'end_date': f"2030-07-{day:02d}"
+      })
+
+
+PERSONAS = {'owner': owner_session, 'authority': authority_session, 'tenant': tenant_session}
+
+
+# Targets
+
+class InProcessTarget:
+   """Runs the FastAPI app in this process, with a validator key loaded into its signer."""
+
+   def __init__(self, clients, rate_limit_scale):
+      sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+      from crypto import KeyManager
+      from main import app
+      from api.services.blockchain_service import blockchain_service
+      from api.services.admission_service import admission_controller
+
+      private_pem, public_pem, _ = KeyManager(tempfile.mkdtemp()).generate_key_pair()
+      blockchain_service.add_validator(public_pem)
+      token = blockchain_service.load_validator_key_pem(private_pem)
+      self.authority_headers = {'Authorization': f"Bearer {token}"}
+      admission_controller.scale(rate_limit_scale)
+      self.service = blockchain_service
+      # One transport per simulated client address, so per-client limits apply as in production.
+      self.clients = [
+         httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app, client=(f"10.0.{i // 250}.{i % 250 + 1}", 40000)),
+            base_url="http://loadgen"
+         )
+         for i in range(clients)
+      ]
+
+   async def seed(self, count):
+      futures = []
+      for i in range(count):
+         tx = {
+            "from": f"seed_owner_{i % 20}", "to": "authority", "title": f"Seed logement {i}",
+            "description": f"Logement de départ {i}", "price": 300.0 + i, "status": "pending",
+            "timestamp": time.time()
+         }
+         self.service.add_new_transaction(tx)
+         futures.append(self.service.seal_transaction(tx))
+      for future in futures:
+         await asyncio.wrap_future(future)
+
+   async def close(self):
+      for client in self.clients:
+         await client.aclose()
+
+
+class HttpTarget:
+   """Sends requests to a running node."""
+
+   def __init__(self, url, authority_token=None):
+      self.authority_headers = {'Authorization': f"Bearer {authority_token}"} if authority_token else {}
+      self.clients = [httpx.AsyncClient(base_url=url, timeout=30.0, limits=httpx.Limits(max_connections=200))]
+
+   async def seed(self, count):
+      client = self.clients[0]
+      for i in range(count):
+         for path, data in (
+            ('/blockchain/submit_property', {'title': f"Seed logement {i}", 'description': f"Logement de départ {i}",
+                                             'price': str(300 + i), 'owner': f"seed_owner_{i % 20}"}),
+            ('/blockchain/mine', {'title': f"Seed logement {i}"})
+         ):
+            headers = self.authority_headers if path == '/blockchain/mine' else None
+            while True:
+               response = await client.post(path, data=data, headers=headers)
+               if response.status_code != 429:
+                  break
+               await asyncio.sleep(float(response.headers.get('retry-after', 1)))
+
+   async def close(self):
+      await self.clients[0].aclose()
+
+
+async def run(args):
+   mix = parse_mix(args.mix)
+   rng = random.Random(args.random_seed)
+   if args.url:
+      target = HttpTarget(args.url, args.authority_token)
+   else:
+      target = InProcessTarget(args.clients, args.rate_limit_scale)
+   recorder = Recorder()
+   state = {'counter': 0, 'owners': max(1, args.clients // 2), 'tenants': args.clients * 5,
+            'authority_headers': target.authority_headers}
+   names, weights = list(mix), list(mix.values())
+   semaphore = asyncio.Semaphore(args.max_sessions)
+   tasks = []
+
+   async def session(persona, client, session_rng):
+      async with semaphore:
+         await PERSONAS[persona](client, recorder, session_rng, state)
+
+   try:
+      if args.seed_listings:
+         await target.seed(args.seed_listings)
+      recorder.started = time.perf_counter()
+      deadline = recorder.started + args.duration
+      while True:
+         await asyncio.sleep(rng.expovariate(args.rate))
+         if time.perf_counter() >= deadline:
+            break
+         persona = rng.choices(names, weights)[0]
+         client = rng.choice(target.clients)
+         tasks.append(asyncio.create_task(session(persona, client, random.Random(rng.random()))))
+      await asyncio.gather(*tasks)
+      recorder.finished = time.perf_counter()
+   finally:
+      await target.close()
+   return recorder.report()
+
+
+def print_report(report):
+   print(f"{report['requests']} requests in {report['duration']:.1f}s ({report['throughput']:.1f} req/s)")
+   print(f"{'route':36} {'count':>7} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}  statuses")
+   for route, stats in report['routes'].items():
+      statuses = ' '.join(f"{code}:{count}" for code, count in stats['statuses'].items())
+      print(f"{route:36} {stats['count']:7d} {stats['throughput']:8.1f} {stats['p50_ms']:8.1f} "
+            f"{stats['p95_ms']:8.1f} {stats['p99_ms']:8.1f}  {statuses}")
+
+
+def main():
+   parser = argparse.ArgumentParser(description="LogementCert load generator")
+   parser.add_argument("--url", help="Base URL of a running node (default: drive the app in-process)")
+   parser.add_argument("--authority-token", help="Authority token of the node's validator key (with --url)")
+   parser.add_argument("--mix", default=DEFAULT_MIX, help="Persona weights, e.g. owner=3,authority=1,tenant=6")
+   parser.add_argument("--rate", type=float, default=20.0, help="Session arrivals per second")
+   parser.add_argument("--duration", type=float, default=30.0, help="Seconds of arrivals")
+   parser.add_argument("--clients", type=int, default=200, help="Simulated client addresses (in-process)")
+   parser.add_argument("--max-sessions", type=int, default=1000, help="Concurrent sessions cap")
+   parser.add_argument("--seed-listings", type=int, default=50, help="Validated listings created before measuring")
+   parser.add_argument("--rate-limit-scale", type=float, default=1.0, help="Admission control multiplier (in-process)")
+   parser.add_argument("--random-seed", type=int, default=2030)
+   parser.add_argument("--json", help="Also write the report to this file")
+   args = parser.parse_args()
+
+   report = asyncio.run(run(args))
+   print_report(report)
+   if args.json:
+      with open(args.json, 'w') as f:
+         json.dump(report, f, indent=2)
+
+
+if __name__ == '__main__':
+   main()
@@ -0,0 +1,75 @@
+"""
+Measure resident bytes per block for the compact Block representation,
+compared with a plain dict-based block holding plain transaction dicts.
+
+Usage: python -m benchmarks.memory_benchmark [block_count ...]
+"""
+
+import sys
+import time
+import tracemalloc
+from blockchain.block import Block
+
+VALIDATOR_PEM = (
+   "-----BEGIN PUBLIC KEY-----\n"
+   + "\n".join("A" * 64 for _ in range(6))
+   + "\n-----END PUBLIC KEY-----\n"
+)
+
+
+class DictBlock:
+   """Block layout before slots and compact transaction records."""
+
+   def __init__(self, index, transactions, timestamp, previous_hash, validator, signature):
+      self.index = index
+      self.transactions = transactions
+      self.timestamp = timestamp
+      self.previous_hash = previous_hash
+      self.nonce = 0
+      self.hash = None
+      self.validator = validator
+      self.signature = signature
+
+
+def make_transaction(i):
+   # Strings are built at runtime, as they would be when parsed from requests or files.
+   return {
+      "from": "owner_" + str(i % 500),
+      "to": "".join(["author", "ity"]),
+      "title": f"Appartement {i}",
+      "description": f"Logement certifié {i}, 2 chambres, wifi.",
+      "price": 450.0 + i % 300,
+      "status": "".join(["valid", "ated"]),
+      "timestamp": 1.7e9 + i,
+      "tx_id": f"{i:064x}",
+      "type": "".join(["apparte", "ment"]),
+      "location": "".join(["Casa", "blanca"]),
+      "maxGuests": 4
+   }
+
+
+def measure(block_cls, block_count):
+   """Returns traced bytes per block after building block_count blocks."""
+   tracemalloc.start()
+   before = tracemalloc.get_traced_memory()[0]
+   blocks = []
+   for i in range(block_count):
+      validator = "".join([VALIDATOR_PEM])  # a fresh string per block, as after JSON parsing
+      blocks.append(block_cls(i, [make_transaction(i)], time.time(), f"{i:064x}", validator, "S" * 344))
+      blocks[-1].hash = f"{i + 1:064x}"
+   after = tracemalloc.get_traced_memory()[0]
+   tracemalloc.stop()
+   return (after - before) / block_count
+
+
+def main():
+   counts = [int(arg) for arg in sys.argv[1:]] or [100000, 1000000]
+   print(f"{'blocks':>10}{'dict block':>14}{'compact block':>16}{'saving':>9}")
+   for count in counts:
+      legacy = measure(DictBlock, count)
+      compact = measure(lambda i, txs, ts, prev, val, sig: Block(i, txs, ts, prev, 0, val, sig), count)
+      print(f"{count:>10,}{legacy:>12.0f} B{compact:>14.0f} B{1 - compact / legacy:>9.0%}")
+
+
+if __name__ == '__main__':
+   main()
@@ -0,0 +1,116 @@
+"""
+Start a small PoA network of local nodes, mine blocks on one of them,
+then start a fresh node and time how long it takes to reach the same tip.
+
+Usage: python -m benchmarks.network_convergence [block_count] [node_count]
+"""
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from urllib import request
+from urllib.parse import urlencode
+from crypto import KeyManager
+
+BASE_PORT = 8700
+
+
+def post_form(url, fields, token=None):
+   data = urlencode(fields).encode('utf-8')
+   headers = {'Authorization': f"Bearer {token}"} if token else {}
+   with request.urlopen(request.Request(url, data=data, headers=headers), timeout=30) as response:
+      return json.loads(response.read())
+
+
+def get_json(url):
+   with request.urlopen(url, timeout=30) as response:
+      return json.loads(response.read())
+
+
+def start_node(port, peers, trusted_file, key_file=None, token=None):
+   command = [
+      sys.executable, 'main.py', '--host', '127.0.0.1', '--port', str(port),
+      '--peers', ','.join(peers), '--sync-interval', '2', '--rate-limit-scale', '1000',
+      '--trusted-validator', trusted_file, '--operator-token', token
+   ]
+   if key_file:
+      command += ['--validator-key', key_file, '--authority-token', token]
+   process = subprocess.Popen(command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+   url = f"http://127.0.0.1:{port}"
+   deadline = time.monotonic() + 30
+   while time.monotonic() < deadline:
+      try:
+         get_json(f"{url}/network/status")
+         return process, url
+      except OSError:
+         time.sleep(0.2)
+   process.kill()
+   raise RuntimeError(f"Node on port {port} did not start")
+
+
+def wait_for_tip(url, tip_hash, timeout=300):
+   deadline = time.monotonic() + timeout
+   while time.monotonic() < deadline:
+      if get_json(f"{url}/network/status")['tip_hash'] == tip_hash:
+         return True
+      time.sleep(0.05)
+   return False
+
+
+def main():
+   block_count = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+   node_count = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+   key_dir = tempfile.mkdtemp()
+   private_pem, public_pem, _ = KeyManager(key_dir).generate_key_pair()
+   key_file = os.path.join(key_dir, 'validator_private.pem')
+   with open(key_file, 'w') as f:
+      f.write(private_pem)
+   trusted_file = os.path.join(key_dir, 'validator_public.pem')
+   with open(trusted_file, 'w') as f:
+      f.write(public_pem)
+   # Authority token of the signing node, and operator token of the others.
+   token = uuid.uuid4().hex
+
+   urls = [f"http://127.0.0.1:{BASE_PORT + i}" for i in range(node_count)]
+   processes = []
+   try:
+      for i in range(node_count):
+         # Only the first node signs blocks; the others trust its key and follow by gossip.
+         process, url = start_node(BASE_PORT + i, [u for u in urls if u != urls[i]], trusted_file,
+                                   key_file if i == 0 else None, token)
+         processes.append(process)
+
+      start = time.perf_counter()
+      for i in range(block_count):
+         post_form(f"{urls[0]}/blockchain/submit_property", {
+            'title': f"Logement {i}", 'description': f"Bench listing {i}", 'price': 300 + i, 'owner': 'bench'
+         })
+         post_form(f"{urls[0]}/blockchain/mine", {'title': f"Logement {i}"}, token)
+      tip_hash = get_json(f"{urls[0]}/network/status")['tip_hash']
+      for url in urls[1:]:
+         if not wait_for_tip(url, tip_hash):
+            raise RuntimeError(f"{url} did not converge")
+      print(f"{node_count} nodes converged on {block_count} blocks by gossip in {time.perf_counter() - start:.2f}s")
+
+      port = BASE_PORT + node_count
+      process, late_url = start_node(port, urls, trusted_file, token=token)
+      processes.append(process)
+      start = time.perf_counter()
+      applied = post_form(f"{late_url}/network/sync", {}, token)['applied']
+      if not wait_for_tip(late_url, tip_hash):
+         raise RuntimeError("Late node did not converge")
+      print(f"Late node caught up {applied} blocks in {time.perf_counter() - start:.2f}s")
+   finally:
+      for process in processes:
+         process.terminate()
+      for process in processes:
+         process.wait()
+
+
+if __name__ == '__main__':
+   os.chdir(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+   main()
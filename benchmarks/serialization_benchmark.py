@@ -0,0 +1,82 @@
+"""
+Compare the binary chain format against the JSON export.
+Reports encoded size and encode/decode speed for a synthetic PoA chain.
+
+Usage: python -m benchmarks.serialization_benchmark [block_count]
+"""
+
+import base64
+import json
+import os
+import sys
+import time
+from blockchain.block import Block
+from blockchain.serialization import encode_blocks, decode_blocks
+
+VALIDATOR_PEM = (
+   "-----BEGIN PUBLIC KEY-----\n"
+   + "\n".join("A" * 64 for _ in range(6))
+   + "\n-----END PUBLIC KEY-----\n"
+)
+
+
+def build_chain(block_count):
+   """Builds a linked chain of signed-looking blocks with one listing each."""
+   chain = [Block(0, [], time.time(), "0")]
+   chain[0].hash = chain[0].compute_hash()
+   for i in range(1, block_count):
+      tx = {
+         "from": f"owner_{i % 500}",
+         "to": "authority",
+         "title": f"Appartement {i} proche du stade",
+         "description": "Logement certifié pour la Coupe du Monde 2030, 2 chambres, wifi.",
+         "price": 450.0 + i % 300,
+         "status": "validated",
+         "timestamp": time.time(),
+         "type": "appartement",
+         "location": "Casablanca",
+         "maxGuests": 4
+      }
+      block = Block(i, [tx], time.time(), chain[-1].hash, validator=VALIDATOR_PEM)
+      block.hash = block.compute_hash()
+      block.signature = base64.b64encode(os.urandom(256)).decode()
+      chain.append(block)
+   return chain
+
+
+def timed(func, repeat=3):
+   best = float('inf')
+   result = None
+   for _ in range(repeat):
+      start = time.perf_counter()
+      result = func()
+      best = min(best, time.perf_counter() - start)
+   return result, best
+
+
+def main():
+   block_count = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+   chain = build_chain(block_count)
+   chain_data = [block.to_dict() for block in chain]
+
+   results = []
+
+   encoded, enc_time = timed(lambda: json.dumps(chain_data, indent=2).encode())
+   _, dec_time = timed(lambda: [Block.from_dict(d) for d in json.loads(encoded)])
+   results.append(("json (indent=2)", len(encoded), enc_time, dec_time))
+
+   for compression in (None, 'zlib'):
+      encoded, enc_time = timed(lambda: encode_blocks(chain, compression=compression))
+      decoded, dec_time = timed(lambda: decode_blocks(encoded))
+      assert [b.to_dict() for b in decoded] == chain_data, "round-trip mismatch"
+      assert all(b.compute_hash() == b.hash for b in decoded), "hash mismatch"
+      results.append((f"binary ({compression or 'raw'})", len(encoded), enc_time, dec_time))
+
+   print(f"{block_count} blocks")
+   print(f"{'format':<18}{'size':>14}{'bytes/block':>13}{'encode':>11}{'decode':>11}")
+   for name, size, enc_time, dec_time in results:
+      print(f"{name:<18}{size:>14,}{size / block_count:>13.1f}{enc_time * 1000:>9.1f}ms{dec_time * 1000:>9.1f}ms")
+
+
+if __name__ == '__main__':
+   main()
@@ -0,0 +1,56 @@
+"""
+Compare sealed-block throughput of mine_transaction (key parsed and block
+signed in the caller, one block at a time) with the pipelined BlockSealer.
+
+Usage: python -m benchmarks.signer_benchmark [block_count]
+"""
+
+import sys
+import tempfile
+import time
+from crypto import KeyManager
+from blockchain.blockchain import LogementBlockchain
+from blockchain.signer import SignerWorker, BlockSealer
+
+
+def make_transactions(blockchain, count, prefix):
+   for i in range(count):
+      blockchain.add_new_transaction({
+         "from": "bench", "to": "authority", "title": f"{prefix} {i}",
+         "description": f"Logement {i}", "price": 300.0 + i, "status": "pending", "timestamp": time.time()
+      })
+   return list(blockchain.unconfirmed_transactions)
+
+
+def main():
+   block_count = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+   private_pem, public_pem, _ = KeyManager(tempfile.mkdtemp()).generate_key_pair()
+
+   blockchain = LogementBlockchain(consensus_type='poa')
+   blockchain.add_validator(public_pem)
+   transactions = make_transactions(blockchain, block_count, "direct")
+   start = time.perf_counter()
+   for tx in transactions:
+      blockchain.mine_transaction(tx, private_pem)
+   direct = time.perf_counter() - start
+   print(f"mine_transaction: {block_count / direct:8.1f} blocks/s")
+
+   blockchain = LogementBlockchain(consensus_type='poa')
+   blockchain.add_validator(public_pem)
+   signer = SignerWorker()
+   signer.load_key(private_pem)
+   sealer = BlockSealer(blockchain, signer)
+   transactions = make_transactions(blockchain, block_count, "sealed")
+   start = time.perf_counter()
+   futures = [sealer.submit([tx]) for tx in transactions]
+   for future in futures:
+      future.result()
+   sealed = time.perf_counter() - start
+   sealer.close()
+   signer.close()
+   print(f"BlockSealer:      {block_count / sealed:8.1f} blocks/s ({direct / sealed:.1f}x)")
+   print(f"Chain height {blockchain.last_block.index}, pending {len(blockchain.unconfirmed_transactions)}")
+
+
+if __name__ == '__main__':
+   main()
@@ -1,5 +1,7 @@
 from .block import Block
 from .blockchain import LogementBlockchain
 from .consensus import ProofOfAuthority
+from .light_client import LightClient
+from .merkle import verify_inclusion_proof
 
-__all__ = ['Block', 'LogementBlockchain', 'ProofOfAuthority']
\ No newline at end of file
+__all__ = ['Block', 'LogementBlockchain', 'ProofOfAuthority', 'LightClient', 'verify_inclusion_proof']
\ No newline at end of file
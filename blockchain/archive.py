@@ -0,0 +1,137 @@
+import os
+import struct
+import threading
+import zlib
+from collections import OrderedDict
+from .merkle import merkle_root
+from .serialization import encode_blocks, decode_blocks, decode_segment, segment_offsets
+
+
+class BlockArchive:
+   """
+   Cold storage for old block bodies.
+   Consecutive blocks are grouped into files in the binary chain format, each
+   made of small zlib-compressed chunks, so a lookup only decodes the chunk
+   holding its block. Recently used chunks are kept in a small cache.
+   """
+
+   def __init__(self, directory, segment_size=256, chunk_size=16, cache_size=64):
+      """
+      :param directory: Directory holding the archive files
+      :param segment_size: Blocks per archive file (files start at multiples of it)
+      :param chunk_size: Blocks per independently decodable chunk within a file
+      :param cache_size: Decoded chunks kept in memory
+      """
+      os.makedirs(directory, exist_ok=True)
+      self.directory = directory
+      self.segment_size = segment_size
+      self.chunk_size = chunk_size
+      self.cache_size = cache_size
+      self._cache = OrderedDict()
+      self._lock = threading.Lock()
+      self.loads = 0
+
+   def segment_start(self, index):
+      """Height of the first block of the archive file holding a height."""
+      return index - index % self.segment_size
+
+   def path_for(self, start):
+      return os.path.join(self.directory, f"blocks_{start:010d}.lcb")
+
+   def write(self, blocks):
+      """
+      Writes one archive file and checks it reads back to the same blocks.
+
+      :param blocks: Consecutive Block instances, starting at a multiple of segment_size
+      :raises ValueError: If the blocks are not an aligned run or the file does not read back
+      """
+      start = blocks[0].index
+      if start % self.segment_size or len(blocks) > self.segment_size:
+         raise ValueError(f"Archive files hold {self.segment_size} blocks from a multiple of {self.segment_size}")
+
+      path = self.path_for(start)
+      temporary = path + '.tmp'
+      with open(temporary, 'wb') as f:
+         f.write(encode_blocks(blocks, compression='zlib', segment_size=self.chunk_size))
+      stored = self._read_file(temporary)
+      for block, copy in zip(blocks, stored):
+         if copy.index != block.index or copy.hash != block.hash or copy.merkle_root != block.merkle_root:
+            os.remove(temporary)
+            raise ValueError(f"Archived block {block.index} does not match the chain")
+      os.replace(temporary, path)
+
+      with self._lock:
+         for key in [key for key in self._cache if key[0] == start]:
+            del self._cache[key]
+
+   def _read_file(self, path):
+      with open(path, 'rb') as f:
+         data = f.read()
+      try:
+         blocks = decode_blocks(data)
+      except (zlib.error, struct.error, IndexError, UnicodeDecodeError) as e:
+         raise ValueError(f"Corrupt archive file {path}: {e}")
+      for offset, block in enumerate(blocks):
+         if block.index != blocks[0].index + offset:
+            raise ValueError(f"Archive file {path} is not a consecutive run of blocks")
+      return blocks
+
+   def read(self, start):
+      """Returns the Block instances stored in the file starting at a height."""
+      return self._read_file(self.path_for(start))
+
+   def load_transactions(self, index):
+      """
+      Returns the transactions of an archived block.
+
+      :param index: Block height
+      :return: List of transactions
+      """
+      start = self.segment_start(index)
+      chunk = (index - start) // self.chunk_size
+      key = (start, chunk)
+      with self._lock:
+         bodies = self._cache.get(key)
+         if bodies is not None:
+            self._cache.move_to_end(key)
+            return bodies[index - start - chunk * self.chunk_size]
+
+      path = self.path_for(start)
+      with open(path, 'rb') as f:
+         data = f.read()
+      try:
+         blocks, _ = decode_segment(data, segment_offsets(data)[chunk])
+      except (zlib.error, struct.error, IndexError, UnicodeDecodeError) as e:
+         raise ValueError(f"Corrupt archive file {path}: {e}")
+      bodies = [block.transactions for block in blocks]
+      with self._lock:
+         self.loads += 1
+         self._cache[key] = bodies
+         while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+      return bodies[index - start - chunk * self.chunk_size]
+
+   def verify(self, headers):
+      """
+      Checks archived bodies against in-memory headers.
+
+      :param headers: Block instances (or header dicts) of archived heights, in order
+      :return: True if every body matches its header's Merkle root and hash
+      """
+      stored, loaded_start = {}, None
+      for header in headers:
+         if not isinstance(header, dict):
+            header = header.get_header()
+         start = self.segment_start(header['index'])
+         if start != loaded_start:
+            try:
+               stored = {block.index: block for block in self.read(start)}
+            except (OSError, ValueError):
+               return False
+            loaded_start = start
+         block = stored.get(header['index'])
+         if block is None or block.hash != header['hash']:
+            return False
+         if merkle_root(block.transactions) != header['merkle_root']:
+            return False
+      return True
@@ -1,12 +1,20 @@
 import json
+import sys
 import time
 from hashlib import sha256
+from .merkle import merkle_root as compute_merkle_root
+from .transaction import TransactionRecord
 
 
 class Block:
    """A class representing a block in a blockchain."""
 
-   def __init__(self, index, transactions, timestamp, previous_hash, nonce=0, validator=None, signature=None):
+   # Slots instead of a per-instance __dict__: chains hold millions of blocks.
+   __slots__ = ('index', '_transactions', 'timestamp', 'previous_hash', 'nonce',
+                'hash', 'validator', 'signature', 'difficulty', '_merkle_root', '_archive')
+
+   def __init__(self, index, transactions, timestamp, previous_hash, nonce=0, validator=None, signature=None,
+                difficulty=None):
       """
       Initializes a new block.
       
@@ -17,39 +25,112 @@ class Block:
       :param nonce: Nonce for Proof of Work
       :param validator: Public key PEM string of the validator (for PoA)
       :param signature: Base64-encoded signature (for PoA)
+      :param difficulty: Numeric PoW difficulty the block was mined at (None for PoA blocks)
       """
       self.index = index
-      self.transactions = transactions
+      self._transactions = [TransactionRecord.from_dict(tx) for tx in transactions]
+      self._archive = None
       self.timestamp = timestamp
       self.previous_hash = previous_hash
       self.nonce = nonce
       self.hash = None
-      self.validator = validator 
+      # Validators sign many blocks; share one copy of each PEM string.
+      self.validator = sys.intern(validator) if isinstance(validator, str) else validator
       self.signature = signature  
+      self.difficulty = difficulty
+      self._merkle_root = None
 
-   def compute_hash(self):
+   @property
+   def transactions(self):
+      """
+      The block's transactions; read back from the archive if the body was moved there.
+      """
+      if self._transactions is None:
+         return self._archive.load_transactions(self.index)
+      return self._transactions
+
+   @property
+   def is_archived(self):
+      """True if the transaction bodies live in a BlockArchive rather than in memory."""
+      return self._transactions is None
+
+   def archive(self, archive):
+      """
+      Drops the in-memory transaction bodies once they are stored in an archive.
+      The header (including the Merkle root) stays in memory.
+      
+      :param archive: BlockArchive holding this block
+      """
+      if self._merkle_root is None:
+         self._merkle_root = compute_merkle_root(self._transactions)
+      self._archive = archive
+      self._transactions = None
+
+   @property
+   def merkle_root(self):
+      """
+      Merkle root committing to the block's transactions.
+      Computed once, since a block's transactions are fixed after creation.
+      """
+      if self._merkle_root is None:
+         self._merkle_root = compute_merkle_root(self.transactions)
+      return self._merkle_root
+
+   def get_header(self):
       """
-      Computes SHA-256 hash of the block's content (excluding the signature).
-      This ensures signature verification works correctly.
+      Returns the block header: every field except the transaction bodies,
+      which are represented by their Merkle root.
       """
-      block_data = {
+      return {
          'index': self.index,
-         'transactions': self.transactions,
+         'merkle_root': self.merkle_root,
          'timestamp': self.timestamp,
          'previous_hash': self.previous_hash,
          'nonce': self.nonce,
-         'validator': self.validator
+         'hash': self.hash,
+         'validator': self.validator,
+         'signature': self.signature,
+         'difficulty': self.difficulty
       }
-      block_string = json.dumps(block_data, sort_keys=True)
-      return sha256(block_string.encode()).hexdigest()
+
+   @staticmethod
+   def hash_header(header):
+      """
+      Computes SHA-256 hash of a block header (excluding hash and signature).
+      
+      :param header: dict with the header fields
+      :return: Hash as hex string
+      """
+      header_data = {
+         'index': header['index'],
+         'merkle_root': header['merkle_root'],
+         'timestamp': header['timestamp'],
+         'previous_hash': header['previous_hash'],
+         'nonce': header['nonce'],
+         'validator': header['validator']
+      }
+      # Only PoW blocks record a difficulty; leaving it out otherwise keeps PoA hashes unchanged.
+      if header.get('difficulty') is not None:
+         header_data['difficulty'] = header['difficulty']
+      header_string = json.dumps(header_data, sort_keys=True)
+      return sha256(header_string.encode()).hexdigest()
+
+   def compute_hash(self):
+      """
+      Computes SHA-256 hash of the block's header (excluding the signature).
+      Transactions are committed through the Merkle root, so the hash can be
+      checked from the header alone.
+      """
+      return self.hash_header(self.get_header())
 
    def to_dict(self):
       """
       Converts the block to a dictionary (used for storage or JSON serialization).
       """
-      return {
+      data = {
          'index': self.index,
-         'transactions': self.transactions,
+         'transactions': [tx.to_dict() for tx in self.transactions],
+         'merkle_root': self.merkle_root,
          'timestamp': self.timestamp,
          'previous_hash': self.previous_hash,
          'nonce': self.nonce,
@@ -57,6 +138,9 @@ class Block:
          'validator': self.validator,
          'signature': self.signature
       }
+      if self.difficulty is not None:
+         data['difficulty'] = self.difficulty
+      return data
 
    @classmethod
    def from_dict(cls, data):
@@ -73,7 +157,8 @@ class Block:
          data['previous_hash'],
          data.get('nonce', 0),
          data.get('validator'),
-         data.get('signature')
+         data.get('signature'),
+         data.get('difficulty')
       )
       block.hash = data.get('hash')
       return block
@@ -1,7 +1,20 @@
 import time
 import json
+import threading
+from datetime import datetime
 from .block import Block
 from .consensus import ProofOfAuthority
+from .merkle import transaction_id, merkle_proof
+from .listing_store import ListingStore
+from .search_index import TextIndex
+from .facets import FacetIndex
+from .bloom import BloomFilter, listing_fingerprint
+from .serialization import encode_blocks, decode_blocks, is_binary_chain
+from .difficulty import from_leading_zeros, meets_target, next_difficulty, target_for
+from .archive import BlockArchive
+
+# Fixed so that independently started nodes derive the same genesis block.
+GENESIS_TIMESTAMP = 0
 
 
 class LogementBlockchain:
@@ -10,17 +23,44 @@ class LogementBlockchain:
    Supports Proof of Authority (PoA) and Proof of Work (PoW) consensus.
    """
 
-   def __init__(self, difficulty=2, consensus_type='poa'):
+   def __init__(self, difficulty=2, consensus_type='poa', max_pending_transactions=None,
+                target_block_time=None, retarget_window=10, archive_dir=None, archive_depth=1024):
       """
       Initialize the blockchain.
       
-      :param difficulty: Mining difficulty for PoW
+      :param difficulty: Initial PoW difficulty, in leading hex zeros
       :param consensus_type: 'poa' for Proof of Authority, 'pow' for Proof of Work
+      :param max_pending_transactions: Mempool capacity (None for unlimited)
+      :param target_block_time: Seconds per block that PoW difficulty retargets towards (None keeps it fixed)
+      :param retarget_window: Blocks between PoW difficulty retargets
+      :param archive_dir: Directory for archived block bodies (None keeps every body in memory)
+      :param archive_depth: Number of most recent blocks whose bodies stay in memory
       """
       self.difficulty = difficulty
+      self.initial_difficulty = from_leading_zeros(difficulty)
+      self.target_block_time = target_block_time
+      self.retarget_window = retarget_window
       self.chain = []
       self.unconfirmed_transactions = []
+      self.max_pending_transactions = max_pending_transactions
+      # Off-chain bookings keyed by transaction (see _transaction_key), so they follow
+      # their listing when a reorg changes listing IDs.
+      self.bookings = {}
+      self._reset_indexes()
+      self.duplicate_filter = BloomFilter()
+      self._known_duplicates = set()
+      self.duplicate_stats = {'checked': 0, 'filter_positives': 0, 'false_positives': 0, 'rejected': 0}
+      # Callables notified of chain changes: 'block' (Block), 'transaction' (queued dict),
+      # 'booking' (listing_id, booking) and 'reorg' (new tip Block).
+      self.listeners = {'block': [], 'transaction': [], 'booking': [], 'reorg': []}
+      # Serializes chain mutations between request handlers, the block sealer and network sync.
+      self.lock = threading.RLock()
       self.consensus_type = consensus_type.lower()
+      self.archive = None
+      self.archive_depth = archive_depth
+      self.archived_height = 0
+      if archive_dir is not None:
+         self.enable_archive(archive_dir, archive_depth)
 
       if self.consensus_type == 'poa':
          self.consensus = ProofOfAuthority()
@@ -34,7 +74,7 @@ class LogementBlockchain:
       genesis_block = Block(
          index=0,
          transactions=[],
-         timestamp=time.time(),
+         timestamp=GENESIS_TIMESTAMP,
          previous_hash="0"
       )
       genesis_block.hash = genesis_block.compute_hash()
@@ -53,64 +93,507 @@ class LogementBlockchain:
       :param proof: Valid hash of the block
       :return: True if added, False otherwise
       """
-      if block.previous_hash != self.last_block.hash:
-         print(f"Previous hash mismatch: expected {self.last_block.hash}, got {block.previous_hash}")
+      signed = self.consensus_type == 'poa'
+      try:
+         self._check_block(block, self.last_block, block.hash if signed else proof)
+      except (ValueError, PermissionError) as e:
+         print(e)
+         return False
+
+      if not signed:
+         block.hash = proof
+      try:
+         self._append_blocks([block])
+      except ValueError as e:
+         print(e)
          return False
+      return True
+
+   def _check_block(self, block, previous, proof, pending=()):
+      """
+      Validates a block against its parent without modifying the chain.
+      
+      :param block: Block instance to check
+      :param previous: Block it must extend
+      :param proof: Claimed hash of the block (checked against the difficulty for unsigned blocks)
+      :param pending: Already checked blocks following our tip that are not appended yet
+      :raises ValueError: If the block does not link to previous, its hash/proof is invalid or a PoA block is unsigned
+      :raises PermissionError: If a PoA block is signed by an unauthorized validator
+      """
+      if block.previous_hash != previous.hash:
+         raise ValueError(f"Previous hash mismatch: expected {previous.hash}, got {block.previous_hash}")
 
-      if self.consensus_type == 'poa' and block.signature:
+      if block.index != previous.index + 1:
+         raise ValueError(f"Block index mismatch: expected {previous.index + 1}, got {block.index}")
+
+      if self.consensus_type == 'poa':
+         # Every PoA block must be signed; the proof-of-work check below never applies.
+         # The signature covers block.hash, so the hash must match the content.
+         if block.hash != block.compute_hash():
+            raise ValueError("PoA validation failed: block hash does not match its content")
          try:
             self.consensus.validate_block(block)
-            self.chain.append(block)
-            return True
-         except (ValueError, PermissionError) as e:
-            print(f"PoA validation failed: {e}")
-            return False
+         except ValueError as e:
+            raise ValueError(f"PoA validation failed: {e}")
+         except PermissionError as e:
+            raise PermissionError(f"PoA validation failed: {e}")
+         return
+
+      if not self._is_valid_proof(block, proof, pending):
+         raise ValueError(f"Invalid proof for block: {proof}")
+
+   def append_segment(self, blocks):
+      """
+      Appends a chain segment received from elsewhere (a peer, an export).
+      The segment may start at any height we hold: blocks we already have must
+      be identical and are skipped, and only the new blocks are validated, so
+      the cost is proportional to the segment, not the chain. New blocks are
+      appended and indexed only once all of them are valid.
       
-      if not self._is_valid_proof(block, proof):
-         print(f"Invalid proof for block: {proof}")
+      :param blocks: Block instances or block dicts, in height order
+      :return: Number of blocks appended
+      :raises ValueError: If the segment does not connect to our chain, conflicts with it, or holds an invalid block
+      :raises PermissionError: If a block is signed by an unauthorized validator
+      """
+      blocks = [block if isinstance(block, Block) else Block.from_dict(block) for block in blocks]
+      if not blocks:
+         return 0
+
+      with self.lock:
+         if not 0 < blocks[0].index <= len(self.chain):
+            raise ValueError(
+               f"Segment starting at height {blocks[0].index} does not connect to our chain "
+               f"(height {self.last_block.index})"
+            )
+
+         new_blocks = []
+         for block in blocks:
+            if block.index < len(self.chain) and not new_blocks:
+               if block.hash != self.chain[block.index].hash:
+                  raise ValueError(f"Segment conflicts with our chain at height {block.index}")
+            else:
+               new_blocks.append(block)
+
+         previous = self.last_block
+         for block in new_blocks:
+            self._check_block(block, previous, block.hash, new_blocks)
+            previous = block
+
+         self._append_blocks(new_blocks)
+         return len(new_blocks)
+
+   def import_segment(self, filename):
+      """
+      Appends the blocks of a JSON or binary chain file (see append_segment).
+      
+      :param filename: Input filename
+      :return: Number of blocks appended
+      """
+      with open(filename, 'rb') as f:
+         raw = f.read()
+      blocks = decode_blocks(raw) if is_binary_chain(raw) else json.loads(raw)
+      return self.append_segment(blocks)
+
+   def _append_blocks(self, blocks):
+      """
+      Appends validated blocks, updates indexes and notifies listeners.
+      Either every block is appended and indexed or the chain is left unchanged.
+      
+      :param blocks: Checked Block instances extending our tip, in height order
+      :raises ValueError: If a block cannot be indexed
+      """
+      height = len(self.chain)
+      self.chain.extend(blocks)
+      try:
+         for block in blocks:
+            self._index_block(block)
+      except Exception as e:
+         # Indexes may be half-updated: drop the blocks and rebuild them from the chain.
+         del self.chain[height:]
+         self._rebuild_indexes()
+         raise ValueError(f"Block {block.index} could not be indexed: {e}")
+
+      for block in blocks:
+         self._remove_confirmed_transactions(block)
+      if self.archive is not None:
+         self.archive_blocks()
+      for block in blocks:
+         self._notify('block', block)
+
+   def add_listener(self, event, listener):
+      """
+      Registers a callable invoked on a chain event.
+      
+      :param event: 'block', 'transaction', 'booking' or 'reorg'
+      :param listener: Callable taking the event's arguments
+      """
+      if event not in self.listeners:
+         raise ValueError(f"Unknown event: {event}")
+      self.listeners[event].append(listener)
+
+   def add_block_listener(self, listener):
+      """
+      Registers a callable invoked with each block appended to the chain.
+      
+      :param listener: Callable taking a Block
+      """
+      self.add_listener('block', listener)
+
+   def _notify(self, event, *args):
+      for listener in self.listeners[event]:
+         try:
+            listener(*args)
+         except Exception as e:
+            print(f"{event.capitalize()} listener failed: {e}")
+
+   def _remove_confirmed_transactions(self, block):
+      """Drops pending transactions that a new block has confirmed."""
+      confirmed = {tx['tx_id'] for tx in block.transactions if 'tx_id' in tx}
+      if confirmed:
+         self.unconfirmed_transactions = [
+            t for t in self.unconfirmed_transactions if t.get('tx_id') not in confirmed
+         ]
+
+   def _reset_indexes(self):
+      """Creates empty derived indexes (rebuilt from blocks by _index_block)."""
+      self.transaction_index = {}
+      self.address_index = {}
+      self.transaction_count = 0
+      self.listing_store = ListingStore()
+      self.text_index = TextIndex()
+      self.facet_index = FacetIndex()
+      # listing_id -> bookings list shared with self.bookings
+      self.booking_index = {}
+
+   def _rebuild_indexes(self):
+      """Rebuilds every derived index from the chain and the recorded bookings."""
+      self._reset_indexes()
+      for block in self.chain:
+         self._index_block(block)
+      self._rebuild_duplicate_filter()
+
+   @staticmethod
+   def _transaction_key(tx):
+      """Identifier of a transaction that does not depend on its position in the chain."""
+      return tx.get('tx_id') or transaction_id(dict(tx))
+
+   def replace_chain(self, blocks):
+      """
+      Switches to a competing chain that shares our genesis block.
+      Every block after genesis is validated before anything is replaced,
+      then the derived indexes are rebuilt. Transactions of abandoned blocks
+      that the new chain does not contain go back to the mempool as pending.
+      
+      :param blocks: List of Block instances, starting with genesis
+      :return: True if the chain was replaced, False if the candidate is invalid
+      """
+      if not blocks or blocks[0].hash != self.chain[0].hash:
+         print("Chain replacement rejected: different genesis block")
          return False
 
-      block.hash = proof
-      self.chain.append(block)
+      candidate = LogementBlockchain(
+         difficulty=self.difficulty,
+         consensus_type=self.consensus_type,
+         target_block_time=self.target_block_time,
+         retarget_window=self.retarget_window
+      )
+      candidate.chain = [self.chain[0]]
+      candidate.bookings = self.bookings
+      if self.consensus_type == 'poa':
+         candidate.consensus.authorized_validators = self.consensus.get_validators()
+      for block in blocks[1:]:
+         if not candidate.add_block(block, block.hash):
+            return False
+
+      fork = 1
+      while fork < min(len(self.chain), len(candidate.chain)) and self.chain[fork].hash == candidate.chain[fork].hash:
+         fork += 1
+      adopted = {self._transaction_key(tx) for block in candidate.chain[fork:] for tx in block.transactions}
+      orphaned = {}
+      for block in self.chain[fork:]:
+         for tx in block.transactions:
+            key = self._transaction_key(tx)
+            if key not in adopted:
+               orphaned[key] = dict(tx, tx_id=key, status='pending')
+
+      self.chain = candidate.chain
+      self.transaction_index = candidate.transaction_index
+      self.address_index = candidate.address_index
+      self.transaction_count = candidate.transaction_count
+      self.listing_store = candidate.listing_store
+      self.text_index = candidate.text_index
+      self.facet_index = candidate.facet_index
+      self.booking_index = candidate.booking_index
+      self.unconfirmed_transactions = list(orphaned.values()) + [
+         t for t in self.unconfirmed_transactions
+         if t.get('tx_id') not in self.transaction_index and t.get('tx_id') not in orphaned
+      ]
+      self._rebuild_duplicate_filter()
+      if self.archive is not None:
+         # Blocks above the fork point replaced archived ones: rewrite from there.
+         height = 0
+         while height < self.archived_height and self.chain[height].is_archived:
+            height += 1
+         self.archived_height = self.archive.segment_start(height)
+         self.archive_blocks()
+      self._notify('reorg', self.last_block)
       return True
 
-   def _is_valid_proof(self, block, block_hash):
+   def enable_archive(self, directory, depth=1024, segment_size=256, cache_size=64):
+      """
+      Turns on tiered storage: bodies of blocks more than `depth` below the tip
+      are moved to compressed archive files and loaded back on demand.
+      Headers and derived indexes stay in memory.
+      
+      :param directory: Directory for archive files
+      :param depth: Number of most recent blocks whose bodies stay in memory
+      :param segment_size: Blocks per archive file
+      :param cache_size: Archive chunks kept decoded in memory
+      """
+      self.archive = BlockArchive(directory, segment_size=segment_size, cache_size=cache_size)
+      self.archive_depth = depth
+      self.archived_height = 0
+      self.archive_blocks()
+
+   def archive_blocks(self, below_height=None):
+      """
+      Moves bodies of old blocks to the archive, one whole archive file at a time.
+      
+      :param below_height: Archive blocks below this height (defaults to tip height + 1 - archive_depth)
+      :return: Number of blocks archived
+      """
+      if self.archive is None:
+         raise ValueError("Archiving is not enabled")
+      if below_height is None:
+         below_height = len(self.chain) - self.archive_depth
+
+      archived = 0
+      with self.lock:
+         size = self.archive.segment_size
+         while self.archived_height + size <= min(below_height, len(self.chain)):
+            blocks = self.chain[self.archived_height:self.archived_height + size]
+            self.archive.write(blocks)
+            for block in blocks:
+               if not block.is_archived:
+                  block.archive(self.archive)
+            self.archived_height += size
+            archived += size
+      return archived
+
+   def verify_archive(self):
+      """
+      Checks every archived body against the in-memory block headers.
+      
+      :return: True if the archive matches the chain
+      """
+      if self.archive is None:
+         return True
+      return self.archive.verify(self.chain[:self.archived_height])
+
+   def _index_block(self, block):
+      """
+      Updates the derived indexes with the transactions of a new block.
+      
+      :param block: Block instance appended to the chain
+      """
+      self.transaction_count += len(block.transactions)
+      for position, tx in enumerate(block.transactions):
+         if 'tx_id' in tx:
+            self.transaction_index[tx['tx_id']] = (block.index, position)
+         for address in {tx.get('from'), tx.get('to')}:
+            if address is not None:
+               self.address_index.setdefault(address, []).append((block.index, position))
+         if tx.get('status') == 'validated':
+            row = self.listing_store.append(tx, block.index, position)
+            self.text_index.add(row + 1, tx.get('title'), tx.get('description'))
+            self.facet_index.add(row, tx)
+            bookings = self.bookings.get(self._transaction_key(tx)) if self.bookings else None
+            if bookings:
+               self.booking_index[row + 1] = bookings
+               for booking in bookings:
+                  self.facet_index.add_booking(row, booking['end_date'])
+            fingerprint = listing_fingerprint(tx)
+            if fingerprint is not None and fingerprint not in self.duplicate_filter:
+               self.duplicate_filter.add(fingerprint)
+
+   def _block_at(self, height, pending=()):
+      """Block at a height, looking past our tip into blocks not yet appended."""
+      if height < len(self.chain):
+         return self.chain[height]
+      return pending[height - len(self.chain)]
+
+   def next_difficulty(self, index=None, pending=()):
+      """
+      Numeric PoW difficulty required for the block at a height.
+      
+      :param index: Block height (defaults to the next block)
+      :param pending: Blocks following our tip that are not appended yet
+      :return: Difficulty (expected hashes per block)
+      """
+      if index is None:
+         index = len(self.chain)
+      return next_difficulty(
+         index,
+         lambda height: self._block_at(height, pending).timestamp,
+         lambda height: self._block_at(height, pending).difficulty,
+         self.initial_difficulty,
+         self.target_block_time,
+         self.retarget_window
+      )
+
+   def _is_valid_proof(self, block, block_hash, pending=()):
       """
-      Validates block hash against difficulty level.
+      Validates block hash against the difficulty required at its height.
       
       :param block: Block instance
       :param block_hash: Hash to validate
+      :param pending: Blocks following our tip that are not appended yet
       :return: True if valid, False otherwise
       """
+      required = self.next_difficulty(block.index, pending)
+      if block.difficulty is None:
+         # Blocks mined before difficulty was recorded: only valid at a fixed difficulty.
+         if self.target_block_time is not None:
+            return False
+      elif block.difficulty != required:
+         return False
+
       expected_hash = block.compute_hash()
-      return (block_hash.startswith('0' * self.difficulty) and block_hash == expected_hash)
+      return meets_target(block_hash, required) and block_hash == expected_hash
 
    def proof_of_work(self, block):
       """
-      Performs PoW to compute a valid block hash.
+      Performs PoW to compute a valid block hash, recording the difficulty used.
       
       :param block: Block to mine
       :return: Valid hash
       """
-      block.nonce = 0
-      computed_hash = block.compute_hash()
-      while not computed_hash.startswith('0' * self.difficulty):
-         block.nonce += 1
-         computed_hash = block.compute_hash()
+      block.difficulty = self.next_difficulty(block.index)
+      target = target_for(block.difficulty)
+      header = block.get_header()
+      header['nonce'] = 0
+      computed_hash = Block.hash_header(header)
+      while int(computed_hash, 16) > target:
+         header['nonce'] += 1
+         computed_hash = Block.hash_header(header)
+      block.nonce = header['nonce']
       return computed_hash
 
+   @property
+   def mempool_full(self):
+      """True when the unconfirmed transaction queue has reached its capacity."""
+      return (self.max_pending_transactions is not None
+              and len(self.unconfirmed_transactions) >= self.max_pending_transactions)
+
+   def _iter_listing_fingerprints(self):
+      """Yields the fingerprints of every pending and validated listing."""
+      for tx in self.unconfirmed_transactions:
+         yield listing_fingerprint(tx)
+      for block in self.chain[1:]:
+         for tx in block.transactions:
+            if tx.get('status') == 'validated':
+               yield listing_fingerprint(tx)
+
+   def _iter_owner_fingerprints(self, owner):
+      """
+      Yields the fingerprints of the pending and validated listings of one owner.
+      The fingerprint holds the exact owner, so listings of other owners cannot match.
+      """
+      for tx in self.unconfirmed_transactions:
+         if tx.get('from') == owner:
+            yield listing_fingerprint(tx)
+      for height, position in self.address_index.get(owner, ()):
+         tx = self.chain[height].transactions[position]
+         if tx.get('status') == 'validated' and tx.get('from') == owner:
+            yield listing_fingerprint(tx)
+
+   def _rebuild_duplicate_filter(self, capacity=None):
+      """
+      Rebuilds the duplicate filter from the chain and the mempool,
+      and forgets the listings previously confirmed as duplicates.
+      
+      :param capacity: Filter capacity (defaults to twice the current listing count)
+      """
+      self._known_duplicates = set()
+      fingerprints = [fp for fp in self._iter_listing_fingerprints() if fp is not None]
+      self.duplicate_filter = BloomFilter(
+         capacity=capacity or max(BloomFilter().capacity, 2 * len(fingerprints)),
+         error_rate=self.duplicate_filter.error_rate
+      )
+      for fingerprint in fingerprints:
+         self.duplicate_filter.add(fingerprint)
+
+   def is_duplicate_listing(self, transaction):
+      """
+      Checks whether a listing is already pending or validated.
+      The Bloom filter rules out new listings without touching the chain;
+      only filter positives fall back to an exact check over the owner's
+      listings (address index and mempool).
+      
+      :param transaction: dict representing the transaction
+      :return: True if an identical listing exists
+      """
+      fingerprint = listing_fingerprint(transaction)
+      if fingerprint is None:
+         return False
+
+      self.duplicate_stats['checked'] += 1
+      if fingerprint not in self.duplicate_filter:
+         return False
+
+      self.duplicate_stats['filter_positives'] += 1
+      # Listings are only removed by a reorg, which clears the confirmed duplicates.
+      owner = transaction.get('from')
+      listed = self._iter_listing_fingerprints() if owner is None else self._iter_owner_fingerprints(owner)
+      if fingerprint in self._known_duplicates or fingerprint in listed:
+         self._known_duplicates.add(fingerprint)
+         self.duplicate_stats['rejected'] += 1
+         return True
+
+      self.duplicate_stats['false_positives'] += 1
+      return False
+
+   def get_duplicate_filter_stats(self):
+      """Returns sizing and observed accuracy of the duplicate filter."""
+      stats = self.duplicate_stats
+      negatives = stats['checked'] - stats['rejected']
+      return {
+         'elements': self.duplicate_filter.count,
+         'capacity': self.duplicate_filter.capacity,
+         'bits': self.duplicate_filter.size,
+         'hash_functions': self.duplicate_filter.hash_count,
+         'estimated_false_positive_rate': self.duplicate_filter.false_positive_rate(),
+         'observed_false_positive_rate': stats['false_positives'] / negatives if negatives else 0.0,
+         **stats
+      }
+
    def add_new_transaction(self, transaction):
       """
       Queues a new transaction to be added to the next block.
       
       :param transaction: dict representing the transaction
       :return: Index of the transaction in the unconfirmed list
+      :raises: ValueError if the same listing is already pending or validated
       """
-      if 'timestamp' not in transaction:
-         transaction['timestamp'] = time.time()
-         
-      self.unconfirmed_transactions.append(transaction)
-      return len(self.unconfirmed_transactions) - 1
+      # Locked: the sealer and sync replace the mempool list when blocks are appended.
+      with self.lock:
+         if self.is_duplicate_listing(transaction):
+            raise ValueError("Duplicate listing")
+
+         fingerprint = listing_fingerprint(transaction)
+         if fingerprint is not None:
+            if self.duplicate_filter.count >= self.duplicate_filter.capacity:
+               self._rebuild_duplicate_filter(capacity=2 * self.duplicate_filter.capacity)
+            self.duplicate_filter.add(fingerprint)
+
+         if 'timestamp' not in transaction:
+            transaction['timestamp'] = time.time()
+         if 'tx_id' not in transaction:
+            transaction['tx_id'] = transaction_id(transaction)
+
+         self.unconfirmed_transactions.append(transaction)
+         self._notify('transaction', transaction)
+         return len(self.unconfirmed_transactions) - 1
 
    # def mine(self, private_key_pem=None):
    #    if not self.unconfirmed_transactions:
@@ -143,9 +626,12 @@ class LogementBlockchain:
    #    return None
 
    def mine_transaction(self, tx, private_key_pem):
+    # The block commits to the validated form of the transaction, so the
+    # status must be set before hashing rather than after.
+    validated_tx = dict(tx, status="validated")
     new_block = Block(
         index=self.last_block.index + 1,
-        transactions=[tx],
+        transactions=[validated_tx],
         timestamp=time.time(),
         previous_hash=self.last_block.hash
     )
@@ -153,13 +639,15 @@ class LogementBlockchain:
     if self.consensus_type == 'poa':
         if not private_key_pem:
             raise ValueError("Private key required for PoA mining")
-        signed_block = self.consensus.sign_block(new_block, private_key_pem)
-        added = self.add_block(signed_block, signed_block.hash)
+        new_block = self.consensus.sign_block(new_block, private_key_pem)
+        proof = new_block.hash
     else:
         proof = self.proof_of_work(new_block)
-        added = self.add_block(new_block, proof)
 
-    if added:
+    with self.lock:
+        if not self.add_block(new_block, proof):
+            return None
+
         # Mark the transaction as validated
         tx["status"] = "validated"
 
@@ -169,8 +657,6 @@ class LogementBlockchain:
         ]
         return new_block.index
 
-    return None
-
 
    def get_validated_logements(self):
       """
@@ -190,6 +676,107 @@ class LogementBlockchain:
                })
       return validated
 
+   def get_listing(self, listing_id):
+      """
+      Retrieves a validated logement by its listing ID (1-based, chain order).
+      
+      :param listing_id: Listing ID as used by the public listings API
+      :return: dict with the transaction and block metadata, or None
+      """
+      row = listing_id - 1
+      if row < 0 or row >= len(self.listing_store):
+         return None
+      block = self.chain[int(self.listing_store.columns['block_height'][row])]
+      return {
+         'transaction': block.transactions[int(self.listing_store.columns['position'][row])],
+         'block_index': block.index,
+         'block_timestamp': block.timestamp,
+         'block_hash': block.hash
+      }
+
+   def get_block_listing_ids(self, height):
+      """
+      Returns the listing IDs of the validated transactions of a block, in block order.
+      
+      :param height: Block index
+      :return: range of listing IDs (empty if the block holds no validated listing)
+      """
+      rows = self.listing_store.block_rows(height)
+      return range(rows.start + 1, rows.stop + 1)
+
+   def search_listings(self, query=None, sort=None, offset=0, limit=20, **filters):
+      """
+      Searches validated logements using the columnar listing store and,
+      when a query is given, the full-text index.
+      
+      :param query: Free-text query over titles and descriptions (ranked by relevance)
+      :param sort: None, 'price', '-price' or 'recent' (None means relevance when querying)
+      :param offset: Number of matches to skip
+      :param limit: Maximum number of matches to return
+      :param filters: type, location, min_price, max_price, min_guests, since, until
+      :return: (total matches, list of (listing_id, entry) for the page)
+      """
+      if not query:
+         total, rows = self.listing_store.search(sort=sort, offset=offset, limit=limit, **filters)
+         return total, [(int(row) + 1, self.get_listing(int(row) + 1)) for row in rows]
+
+      mask = self.listing_store.filter(**filters)
+      ids = [doc_id for doc_id, _ in self.text_index.search(query) if mask[doc_id - 1]]
+      if sort is not None:
+         ids = [int(row) + 1 for row in self.listing_store.order([doc_id - 1 for doc_id in ids], sort)]
+      return len(ids), [(listing_id, self.get_listing(listing_id)) for listing_id in ids[offset:offset + limit]]
+
+   def get_listing_facets(self, selection=None, offset=0, limit=20):
+      """
+      Resolves a facet selection over validated logements.
+      
+      :param selection: dict {facet: value} for type, location, guests, price, availability
+      :param offset: Number of matches to skip
+      :param limit: Maximum number of matches to return
+      :return: (total matches, list of (listing_id, entry) for the page, facet counts)
+      """
+      rows, counts = self.facet_index.query(selection)
+      page = [(int(row) + 1, self.get_listing(int(row) + 1)) for row in rows[offset:offset + limit]]
+      return len(rows), page, counts
+
+   def add_booking(self, listing_id, booking):
+      """
+      Records a booking for a validated logement.
+      Bookings are kept off-chain: sealed transactions cannot change.
+      
+      :param listing_id: Listing ID as used by the public listings API
+      :param booking: dict with user, email, start_date and end_date ('YYYY-MM-DD')
+      :raises: KeyError if the listing does not exist, ValueError on invalid dates
+      """
+      entry = self.get_listing(listing_id)
+      if entry is None:
+         raise KeyError(listing_id)
+      start = datetime.strptime(booking['start_date'], "%Y-%m-%d")
+      end = datetime.strptime(booking['end_date'], "%Y-%m-%d")
+      if end < start:
+         raise ValueError("Booking ends before it starts")
+
+      with self.lock:
+         bookings = self.bookings.setdefault(self._transaction_key(entry['transaction']), [])
+         self.booking_index[listing_id] = bookings
+         bookings.append(booking)
+         self.facet_index.add_booking(listing_id - 1, booking['end_date'])
+      self._notify('booking', listing_id, booking)
+
+   def get_bookings(self, listing_id):
+      """Returns the bookings recorded for a listing."""
+      return self.booking_index.get(listing_id, [])
+
+   def get_listing_stats(self, group_by=None, **filters):
+      """
+      Aggregates prices of validated logements using the columnar listing store.
+      
+      :param group_by: None, 'type' or 'location'
+      :param filters: type, location, min_price, max_price, min_guests, since, until
+      :return: dict with count, price summary and optional groups
+      """
+      return self.listing_store.stats(group_by=group_by, **filters)
+
    def get_transactions_by_address(self, address):
       """
       Get all transactions involving a specific address.
@@ -198,25 +785,82 @@ class LogementBlockchain:
       :return: List of transactions
       """
       transactions = []
-      for block in self.chain[1:]: 
-         for tx in block.transactions:
-            if tx.get('from') == address or tx.get('to') == address:
-               transactions.append({
-                  'transaction': tx,
-                  'block_index': block.index,
-                  'block_timestamp': block.timestamp,
-                  'block_hash': block.hash
-                  })
+      for block_index, position in self.address_index.get(address, []):
+         block = self.chain[block_index]
+         transactions.append({
+            'transaction': block.transactions[position],
+            'block_index': block.index,
+            'block_timestamp': block.timestamp,
+            'block_hash': block.hash
+            })
       return transactions
 
+   def get_transaction_proof(self, tx_id):
+      """
+      Builds a Merkle inclusion proof for a confirmed transaction.
+      
+      :param tx_id: Transaction ID assigned at submission
+      :return: dict with the transaction, its block header and Merkle path, or None if unknown
+      """
+      location = self.transaction_index.get(tx_id)
+      if location is None:
+         return None
+
+      block_index, position = location
+      block = self.chain[block_index]
+      return {
+         'tx_id': tx_id,
+         'transaction': block.transactions[position].to_dict(),
+         'position': position,
+         'header': block.get_header(),
+         'path': merkle_proof(block.transactions, position)
+      }
+
    def get_chain_data(self):
       """Returns full blockchain as a list of dicts."""
       return [block.to_dict() for block in self.chain]
 
+   def get_headers(self, start=0, end=None):
+      """
+      Returns block headers (no transaction bodies) for the heights [start, end),
+      like iter_blocks.
+      
+      :param start: First block index (inclusive)
+      :param end: Block index after the last one returned (exclusive), defaults to the chain length
+      :return: List of header dicts
+      """
+      return [block.get_header() for block in self.chain[start:end]]
+
+   def iter_blocks(self, start=0, end=None, headers_only=False):
+      """
+      Yields blocks one at a time for the heights [start, end), like get_headers,
+      without building a list.
+      
+      :param start: First block index (inclusive)
+      :param end: Block index after the last one yielded (exclusive), defaults to the chain length
+      :param headers_only: Yield headers instead of full blocks
+      :return: Generator of block (or header) dicts
+      """
+      stop = len(self.chain) if end is None else min(end, len(self.chain))
+      for index in range(max(start, 0), stop):
+         block = self.chain[index]
+         yield block.get_header() if headers_only else block.to_dict()
+
+   def get_block(self, index):
+      """
+      Returns a full block by index, or None if out of range.
+      
+      :param index: Block index
+      :return: Block dict including transactions
+      """
+      if index < 0 or index >= len(self.chain):
+         return None
+      return self.chain[index].to_dict()
+
    def get_chain_stats(self):
       """Returns statistics about the blockchain."""
-      total_transactions = sum(len(block.transactions) for block in self.chain[1:])
-      validated_transactions = len(self.get_validated_logements())
+      total_transactions = self.transaction_count
+      validated_transactions = len(self.listing_store)
       
       return {
          'total_blocks': len(self.chain),
@@ -225,8 +869,13 @@ class LogementBlockchain:
          'pending_transactions': len(self.unconfirmed_transactions),
          'consensus_type': self.consensus_type,
          'difficulty': self.difficulty,
+         'next_difficulty': self.next_difficulty() if self.consensus_type == 'pow' else None,
+         'target_block_time': self.target_block_time,
          'last_block_hash': self.last_block.hash,
-         'validators_count': len(self.consensus.get_validators()) if self.consensus_type == 'poa' else 0
+         'validators_count': len(self.consensus.get_validators()) if self.consensus_type == 'poa' else 0,
+         'duplicate_filter': self.get_duplicate_filter_stats(),
+         'archived_blocks': self.archived_height,
+         'archive_loads': self.archive.loads if self.archive is not None else 0
       }
 
    def add_validator(self, public_key_pem):
@@ -275,33 +924,70 @@ class LogementBlockchain:
 
       return True
 
-   def export_chain(self, filename):
+   def export_chain(self, filename, binary=False, compression=None):
       """
-      Export blockchain to JSON file.
+      Export blockchain to JSON file, or to the compact binary format.
       
       :param filename: Output filename
+      :param binary: Write the binary format instead of JSON
+      :param compression: None or 'zlib' (binary format only)
       """
+      if binary:
+         with open(filename, 'wb') as f:
+            f.write(encode_blocks(self.chain, compression=compression))
+         return
+
       chain_data = self.get_chain_data()
       with open(filename, 'w') as f:
          json.dump(chain_data, f, indent=2)
 
+   def export_headers(self, filename, start=0, end=None):
+      """
+      Export block headers only to JSON file.
+      
+      :param filename: Output filename
+      :param start: First block index (inclusive)
+      :param end: Last block index (exclusive), defaults to the tip
+      """
+      with open(filename, 'w') as f:
+         json.dump(self.get_headers(start, end), f, indent=2)
+
    @classmethod
-   def import_chain(cls, filename, difficulty=2, consensus_type='poa'):
+   def import_chain(cls, filename, difficulty=2, consensus_type='poa', target_block_time=None, retarget_window=10):
       """
-      Import blockchain from JSON file.
+      Import blockchain from a JSON or binary file (detected automatically).
       
       :param filename: Input filename
       :param difficulty: Mining difficulty
       :param consensus_type: Consensus type
+      :param target_block_time: PoW block time target (see __init__)
+      :param retarget_window: Blocks between PoW difficulty retargets
       :return: LogementBlockchain instance
       """
-      with open(filename, 'r') as f:
-         chain_data = json.load(f)
+      with open(filename, 'rb') as f:
+         raw = f.read()
+
+      if is_binary_chain(raw):
+         chain_data = [block.to_dict() for block in decode_blocks(raw)]
+      else:
+         chain_data = json.loads(raw)
       
       if not cls.validate_chain(chain_data):
          raise ValueError("Invalid chain data")
       
-      blockchain = cls(difficulty=difficulty, consensus_type=consensus_type)
+      blockchain = cls(
+         difficulty=difficulty,
+         consensus_type=consensus_type,
+         target_block_time=target_block_time,
+         retarget_window=retarget_window
+      )
       blockchain.chain = [Block.from_dict(block_data) for block_data in chain_data]
+      if blockchain.consensus_type == 'pow':
+         for block in blockchain.chain[1:]:
+            if not blockchain._is_valid_proof(block, block.hash):
+               raise ValueError(f"Block {block.index} does not meet its required difficulty")
+      for block in blockchain.chain:
+         blockchain._index_block(block)
+      blockchain._rebuild_duplicate_filter()
       
       return blockchain
\ No newline at end of file
@@ -0,0 +1,74 @@
+import math
+import re
+import unicodedata
+from hashlib import sha256
+
+# Fields identifying a listing for duplicate detection. The owner ('from') is an
+# account identifier, compared exactly like the address index; the others are normalized.
+OWNER_FIELD = 'from'
+FINGERPRINT_FIELDS = ('title', 'location', 'description')
+
+_WHITESPACE = re.compile(r'\s+')
+
+
+def _normalize(value):
+   if value is None:
+      return ''
+   text = unicodedata.normalize('NFKD', str(value).lower())
+   text = ''.join(c for c in text if not unicodedata.combining(c))
+   return _WHITESPACE.sub(' ', text).strip()
+
+
+def listing_fingerprint(transaction):
+   """
+   Computes a fingerprint of a listing: its exact owner plus its title, location
+   and description, insensitive to case, accents and whitespace.
+
+   :param transaction: dict or TransactionRecord
+   :return: 32-byte SHA-256 digest, or None if the transaction is not a listing
+   """
+   if not transaction.get('title'):
+      return None
+   owner = transaction.get(OWNER_FIELD)
+   parts = ['' if owner is None else str(owner)] + [_normalize(transaction.get(field)) for field in FINGERPRINT_FIELDS]
+   return sha256('\x1f'.join(parts).encode('utf-8')).digest()
+
+
+class BloomFilter:
+   """
+   Bloom filter over 32-byte fingerprints.
+   Answers "definitely new" or "possibly seen"; positives need an exact check.
+   """
+
+   def __init__(self, capacity=100000, error_rate=0.01):
+      """
+      Initialize an empty filter sized for a capacity and target error rate.
+
+      :param capacity: Expected number of elements
+      :param error_rate: Target false-positive probability at capacity
+      """
+      self.capacity = max(1, capacity)
+      self.error_rate = error_rate
+      self.size = max(8, int(-self.capacity * math.log(error_rate) / math.log(2) ** 2))
+      self.hash_count = max(1, round(self.size / self.capacity * math.log(2)))
+      self.bits = bytearray((self.size + 7) // 8)
+      self.count = 0
+
+   def _positions(self, fingerprint):
+      # Double hashing (Kirsch-Mitzenmacher) from two 64-bit halves of the digest.
+      h1 = int.from_bytes(fingerprint[:8], 'big')
+      h2 = int.from_bytes(fingerprint[8:16], 'big') | 1
+      return [(h1 + i * h2) % self.size for i in range(self.hash_count)]
+
+   def add(self, fingerprint):
+      """Adds a fingerprint to the filter."""
+      for position in self._positions(fingerprint):
+         self.bits[position >> 3] |= 1 << (position & 7)
+      self.count += 1
+
+   def __contains__(self, fingerprint):
+      return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(fingerprint))
+
+   def false_positive_rate(self):
+      """Estimated false-positive probability at the current fill level."""
+      return (1 - math.exp(-self.hash_count * self.count / self.size)) ** self.hash_count
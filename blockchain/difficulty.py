@@ -0,0 +1,72 @@
+from fractions import Fraction
+
+# Numeric PoW difficulty: a difficulty D is the expected number of hashes per
+# block, and a hash is valid when, read as a 256-bit integer, it is at most
+# MAX_TARGET / D. The old "n leading hex zeros" rule is exactly D = 16 ** n,
+# but D can take any value >= 1, so retargeting moves in small steps.
+
+MAX_TARGET = (1 << 256) - 1
+MIN_DIFFICULTY = 1.0
+
+# Largest change applied at a single retarget, in either direction.
+MAX_ADJUSTMENT = 4.0
+
+
+def from_leading_zeros(zeros):
+   """Numeric difficulty equivalent to requiring `zeros` leading hex zeros."""
+   return float(16 ** zeros)
+
+
+def target_for(difficulty):
+   """Largest valid hash value (as an int) for a difficulty."""
+   # Exact rational arithmetic, so 16 ** n gives exactly the leading-zeros target.
+   ratio = Fraction(max(MIN_DIFFICULTY, difficulty))
+   return MAX_TARGET * ratio.denominator // ratio.numerator
+
+
+def meets_target(block_hash, difficulty):
+   """
+   Checks a hex hash against a difficulty.
+
+   :param block_hash: 64-character hex digest
+   :param difficulty: Numeric difficulty (>= 1)
+   :return: True if the hash is at or below the target
+   """
+   try:
+      return int(block_hash, 16) <= target_for(difficulty)
+   except (TypeError, ValueError):
+      return False
+
+
+def next_difficulty(index, timestamp_at, difficulty_at, initial, target_block_time=None, window=10):
+   """
+   Difficulty required for the block at a height.
+
+   Difficulty only changes every `window` blocks, from the time the previous
+   `window` blocks took (genesis excluded, its timestamp is fixed): too slow
+   lowers it, too fast raises it, by at most MAX_ADJUSTMENT per retarget.
+   Everything comes from the chain, so every node computes the same value.
+
+   :param index: Height of the block being mined or validated
+   :param timestamp_at: Callable (height) -> timestamp of an earlier block
+   :param difficulty_at: Callable (height) -> recorded difficulty of an earlier block, or None
+   :param initial: Difficulty of the first block, and of every block when not adaptive
+   :param target_block_time: Desired seconds between blocks, or None for a fixed difficulty
+   :param window: Blocks between retargets
+   :return: Numeric difficulty
+   """
+   if index <= 1 or target_block_time is None:
+      return initial
+
+   previous = difficulty_at(index - 1)
+   if previous is None:
+      previous = initial
+   if index % window != 0 or index - window < 1:
+      return previous
+
+   elapsed = timestamp_at(index - 1) - timestamp_at(index - window)
+   expected = target_block_time * (window - 1)
+   ratio = expected / elapsed if elapsed > 0 else MAX_ADJUSTMENT
+   ratio = min(MAX_ADJUSTMENT, max(1 / MAX_ADJUSTMENT, ratio))
+   # Rounded so the value survives JSON and every node agrees on it.
+   return max(MIN_DIFFICULTY, round(previous * ratio, 4))
@@ -0,0 +1,179 @@
+from datetime import date, datetime
+import numpy as np
+from .listing_store import DEFAULT_TYPE, DEFAULT_LOCATION, DEFAULT_MAX_GUESTS, category_value
+
+# Bucket upper bounds (exclusive) and labels; the last bucket is open-ended.
+PRICE_BUCKETS = [(200, '0-200'), (500, '200-500'), (1000, '500-1000'), (2000, '1000-2000'), (None, '2000+')]
+GUEST_BUCKETS = [(3, '1-2'), (5, '3-4'), (7, '5-6'), (None, '7+')]
+
+FACETS = ('type', 'location', 'guests', 'price', 'availability')
+AVAILABLE = 'available'
+BOOKED = 'booked'
+
+_POPCOUNT = np.array([bin(i).count('1') for i in range(256)], dtype=np.uint8)
+
+
+def _bucket(value, buckets):
+   for upper, label in buckets:
+      if upper is None or value < upper:
+         return label
+
+
+def price_bucket(price):
+   """Returns the price bucket label of a price, or None if not numeric."""
+   try:
+      return _bucket(float(price), PRICE_BUCKETS)
+   except (TypeError, ValueError, OverflowError):
+      return None
+
+
+def guest_bucket(max_guests):
+   """Returns the guest-capacity bucket label of a capacity."""
+   try:
+      return _bucket(int(max_guests), GUEST_BUCKETS)
+   except (TypeError, ValueError, OverflowError):
+      return _bucket(DEFAULT_MAX_GUESTS, GUEST_BUCKETS)
+
+
+class Bitmap:
+   """Growable bitset over listing rows, packed eight rows per byte."""
+
+   __slots__ = ('bits',)
+
+   def __init__(self, capacity=128):
+      self.bits = np.zeros(capacity, dtype=np.uint8)
+
+   def add(self, row):
+      byte = row >> 3
+      if byte >= len(self.bits):
+         grown = np.zeros(max(byte + 1, len(self.bits) * 2), dtype=np.uint8)
+         grown[:len(self.bits)] = self.bits
+         self.bits = grown
+      self.bits[byte] |= np.uint8(1 << (row & 7))
+
+   def view(self, nbytes):
+      """Returns the bitmap as exactly nbytes bytes (zero-padded)."""
+      if len(self.bits) >= nbytes:
+         return self.bits[:nbytes]
+      padded = np.zeros(nbytes, dtype=np.uint8)
+      padded[:len(self.bits)] = self.bits
+      return padded
+
+
+class FacetIndex:
+   """
+   Precomputed facet counts and per-value bitmaps over validated listings.
+   Filter combinations are answered by AND-ing bitmaps, never by scanning the chain.
+   """
+
+   def __init__(self):
+      self.size = 0
+      self.bitmaps = {facet: {} for facet in FACETS if facet != 'availability'}
+      self.counts = {facet: {} for facet in FACETS if facet != 'availability'}
+      self.booked_until = np.zeros(1024, dtype=np.int32)
+      self._availability = None
+
+   def __len__(self):
+      return self.size
+
+   def add(self, row, transaction):
+      """
+      Adds a validated listing to every facet.
+
+      :param row: Listing row (listing id - 1)
+      :param transaction: Validated transaction (dict or TransactionRecord)
+      """
+      values = {
+         'type': category_value(transaction.get('type'), DEFAULT_TYPE),
+         'location': category_value(transaction.get('location'), DEFAULT_LOCATION),
+         'guests': guest_bucket(transaction.get('maxGuests', DEFAULT_MAX_GUESTS)),
+         'price': price_bucket(transaction.get('price'))
+      }
+      for facet, value in values.items():
+         if value is None:
+            continue
+         bitmap = self.bitmaps[facet].get(value)
+         if bitmap is None:
+            bitmap = self.bitmaps[facet][value] = Bitmap()
+         bitmap.add(row)
+         self.counts[facet][value] = self.counts[facet].get(value, 0) + 1
+
+      if row >= len(self.booked_until):
+         grown = np.zeros(max(row + 1, len(self.booked_until) * 2), dtype=np.int32)
+         grown[:len(self.booked_until)] = self.booked_until
+         self.booked_until = grown
+      self.size = max(self.size, row + 1)
+      self._availability = None
+
+   def add_booking(self, row, end_date):
+      """
+      Records a booking so the availability facet reflects it.
+
+      :param row: Listing row (listing id - 1)
+      :param end_date: Booking end date as 'YYYY-MM-DD'
+      """
+      day = datetime.strptime(end_date, "%Y-%m-%d").date().toordinal()
+      if day > self.booked_until[row]:
+         self.booked_until[row] = day
+         self._availability = None
+
+   def _availability_bitmaps(self, today=None):
+      """Returns {'available': bits, 'booked': bits}, recomputed only after changes or at day change."""
+      today = (today or date.today()).toordinal()
+      if self._availability is None or self._availability[0] != today:
+         booked = self.booked_until[:self.size] > today
+         self._availability = (today, {
+            AVAILABLE: np.packbits(~booked, bitorder='little'),
+            BOOKED: np.packbits(booked, bitorder='little')
+         })
+      return self._availability[1]
+
+   def _facet_bitmaps(self, facet, nbytes, today=None):
+      if facet == 'availability':
+         return self._availability_bitmaps(today)
+      return {value: bitmap.view(nbytes) for value, bitmap in self.bitmaps[facet].items()}
+
+   def _select(self, selection, nbytes, today=None, exclude=None):
+      """ANDs the bitmaps of the selected facet values, optionally ignoring one facet."""
+      bits = np.full(nbytes, 0xff, dtype=np.uint8)
+      if self.size % 8:
+         bits[-1] = (1 << (self.size % 8)) - 1
+      for facet, value in selection.items():
+         if facet == exclude:
+            continue
+         bitmap = self._facet_bitmaps(facet, nbytes, today).get(value)
+         if bitmap is None:
+            return np.zeros(nbytes, dtype=np.uint8)
+         bits = bits & bitmap
+      return bits
+
+   def query(self, selection=None, today=None):
+      """
+      Resolves a facet selection and computes facet counts for it.
+      Counts for each facet ignore that facet's own selection, so the
+      client can still show the alternatives.
+
+      :param selection: dict {facet: value} of selected values
+      :param today: Reference date for availability (defaults to today)
+      :return: (NumPy array of matching rows, {facet: {value: count}})
+      """
+      selection = {facet: value for facet, value in (selection or {}).items() if value is not None}
+      unknown = set(selection) - set(FACETS)
+      if unknown:
+         raise ValueError(f"Unknown facets: {', '.join(sorted(unknown))}")
+
+      nbytes = (self.size + 7) // 8
+      counts = {}
+      for facet in FACETS:
+         if facet != 'availability' and not any(f != facet for f in selection):
+            counts[facet] = dict(self.counts[facet])
+            continue
+         base = self._select(selection, nbytes, today, exclude=facet)
+         counts[facet] = {
+            value: int(_POPCOUNT[base & bitmap].sum(dtype=np.int64))
+            for value, bitmap in self._facet_bitmaps(facet, nbytes, today).items()
+         }
+
+      matched = self._select(selection, nbytes, today)
+      rows = np.flatnonzero(np.unpackbits(matched, bitorder='little')[:self.size])
+      return rows, counts
@@ -0,0 +1,165 @@
+from crypto import SignatureManager
+from .block import Block
+from .merkle import merkle_root, verify_merkle_proof
+from .difficulty import from_leading_zeros, meets_target, next_difficulty
+
+
+class LightClient:
+   """
+   Follows a LogementBlockchain from its headers only.
+   Headers are validated incrementally as they arrive; transaction bodies
+   are fetched on demand and checked against the header's Merkle root.
+   """
+
+   def __init__(self, fetch_headers, fetch_block=None, trusted_validators=None,
+                consensus_type='poa', difficulty=2, batch_size=500, target_block_time=None, retarget_window=10):
+      """
+      Initialize the light client.
+
+      :param fetch_headers: Callable (start, end) -> list of header dicts
+      :param fetch_block: Callable (index) -> block dict with transactions, or None
+      :param trusted_validators: Collection of validator public key PEMs (PoA)
+      :param consensus_type: 'poa' or 'pow'
+      :param difficulty: Initial PoW difficulty, in leading hex zeros
+      :param batch_size: Number of headers requested per call during sync
+      :param target_block_time: PoW block time target of the chain (None for a fixed difficulty)
+      :param retarget_window: Blocks between PoW difficulty retargets
+      """
+      self.fetch_headers = fetch_headers
+      self.fetch_block = fetch_block
+      self.trusted_validators = set(trusted_validators or [])
+      self.consensus_type = consensus_type.lower()
+      self.difficulty = difficulty
+      self.batch_size = batch_size
+      self.target_block_time = target_block_time
+      self.retarget_window = retarget_window
+      self.headers = []
+      self.signature_manager = SignatureManager()
+
+   @property
+   def height(self):
+      """Index of the last validated header, or -1 before the first sync."""
+      return len(self.headers) - 1
+
+   @property
+   def tip(self):
+      """Last validated header, or None."""
+      return self.headers[-1] if self.headers else None
+
+   def validate_header(self, header, previous):
+      """
+      Validates a header against its predecessor.
+
+      :param header: Header dict to validate
+      :param previous: Previously validated header dict, or None for genesis
+      :raises: ValueError or PermissionError if validation fails
+      """
+      if Block.hash_header(header) != header['hash']:
+         raise ValueError(f"Header {header['index']} hash mismatch")
+
+      if previous is None:
+         if header['index'] != 0 or header['previous_hash'] != '0':
+            raise ValueError("First header is not a genesis header")
+         return
+
+      if header['index'] != previous['index'] + 1:
+         raise ValueError(f"Header {header['index']} does not follow {previous['index']}")
+      if header['previous_hash'] != previous['hash']:
+         raise ValueError(f"Header {header['index']} does not link to previous hash")
+
+      if self.consensus_type == 'poa':
+         if not header.get('validator') or not header.get('signature'):
+            raise ValueError(f"Header {header['index']} missing validator identity or signature")
+         if header['validator'] not in self.trusted_validators:
+            raise PermissionError(f"Header {header['index']} signed by an untrusted validator")
+         if not self.signature_manager.verify_signature(header['hash'], header['signature'], header['validator']):
+            raise ValueError(f"Header {header['index']} has an invalid signature")
+      else:
+         self._validate_difficulty(header, previous)
+
+   def _validate_difficulty(self, header, previous):
+      recorded = header.get('difficulty')
+      if recorded is None:
+         if self.target_block_time is not None:
+            raise ValueError(f"Header {header['index']} does not record its difficulty")
+         recorded = from_leading_zeros(self.difficulty)
+      elif self.tip is previous and len(self.headers) == header['index']:
+         # The retarget schedule can be checked when we hold every earlier header.
+         required = next_difficulty(
+            header['index'],
+            lambda height: self.headers[height]['timestamp'],
+            lambda height: self.headers[height].get('difficulty'),
+            from_leading_zeros(self.difficulty),
+            self.target_block_time,
+            self.retarget_window
+         )
+         if recorded != required:
+            raise ValueError(f"Header {header['index']} has difficulty {recorded}, expected {required}")
+      if not meets_target(header['hash'], recorded):
+         raise ValueError(f"Header {header['index']} does not meet difficulty")
+
+   def sync(self):
+      """
+      Fetches and validates headers past the current tip until the source has no more.
+      Headers are only kept once validated, so a failed sync can be resumed.
+
+      :return: Number of new headers accepted
+      :raises: ValueError or PermissionError on the first invalid header
+      """
+      accepted = 0
+      while True:
+         start = len(self.headers)
+         batch = self.fetch_headers(start, start + self.batch_size)
+         if not batch:
+            return accepted
+
+         for header in batch:
+            self.validate_header(header, self.tip)
+            self.headers.append(header)
+            accepted += 1
+
+         if len(batch) < self.batch_size:
+            return accepted
+
+   def get_transactions(self, index):
+      """
+      Fetches the transaction bodies of a block and checks them against its header.
+
+      :param index: Block index (must already be synced)
+      :return: List of transaction dicts
+      :raises: ValueError if the block is unknown or does not match the header
+      """
+      if self.fetch_block is None:
+         raise ValueError("No block source configured")
+      if index < 0 or index > self.height:
+         raise ValueError(f"Block {index} not synced")
+
+      block = self.fetch_block(index)
+      if block is None:
+         raise ValueError(f"Block {index} not available from source")
+
+      transactions = block['transactions']
+      if merkle_root(transactions) != self.headers[index]['merkle_root']:
+         raise ValueError(f"Transactions of block {index} do not match header")
+      return transactions
+
+   def verify_proof(self, proof):
+      """
+      Checks an inclusion proof against the locally validated headers.
+      The header in the proof is only used to locate the block; the Merkle
+      path is checked against the root of our own validated header.
+
+      :param proof: dict as returned by LogementBlockchain.get_transaction_proof
+      :return: True if the transaction is included in a synced block
+      """
+      header = proof.get('header', {})
+      index = header.get('index')
+      if not isinstance(index, int) or index < 0 or index > self.height:
+         return False
+      local = self.headers[index]
+      if local['hash'] != header.get('hash'):
+         return False
+      try:
+         return verify_merkle_proof(proof['transaction'], proof['path'], local['merkle_root'])
+      except (KeyError, TypeError, ValueError):
+         return False
@@ -0,0 +1,258 @@
+import numpy as np
+
+# Defaults shown by the public listings page when a transaction omits a field.
+DEFAULT_TYPE = 'appartement'
+DEFAULT_LOCATION = 'Inconnu'
+DEFAULT_MAX_GUESTS = 4
+
+GROUP_BY_FIELDS = ('type', 'location')
+
+_INT32_MAX = np.iinfo(np.int32).max
+
+
+def category_value(value, default):
+   """
+   Returns a type/location value usable as a code table or facet key.
+   Blocks from other nodes may hold any JSON value; non-strings fall back to the default.
+
+   :param value: Field value from a transaction
+   :param default: Value used when the field is missing or not a string
+   :return: str
+   """
+   return value if isinstance(value, str) else default
+
+
+class _CodeTable:
+   """Maps repeated string values to small integer codes."""
+
+   def __init__(self):
+      self.codes = {}
+      self.values = []
+
+   def encode(self, value):
+      code = self.codes.get(value)
+      if code is None:
+         code = len(self.values)
+         self.codes[value] = code
+         self.values.append(value)
+      return code
+
+   def lookup(self, value):
+      return self.codes.get(value)
+
+
+class ListingStore:
+   """
+   Columnar store of validated listing fields, held in NumPy arrays.
+   Row i is the i-th validated transaction in chain order, i.e. listing id i + 1.
+   """
+
+   COLUMNS = {
+      'price': np.float64,
+      'timestamp': np.float64,
+      'type_code': np.int32,
+      'location_code': np.int32,
+      'max_guests': np.int32,
+      'block_height': np.int64,
+      'position': np.int32
+   }
+
+   def __init__(self, capacity=1024):
+      """
+      Initialize an empty store.
+
+      :param capacity: Initial number of rows allocated per column
+      """
+      self.size = 0
+      self.columns = {name: np.zeros(capacity, dtype=dtype) for name, dtype in self.COLUMNS.items()}
+      self.types = _CodeTable()
+      self.locations = _CodeTable()
+
+   def __len__(self):
+      return self.size
+
+   def _grow(self):
+      capacity = max(1024, len(self.columns['price']) * 2)
+      for name, column in self.columns.items():
+         grown = np.zeros(capacity, dtype=column.dtype)
+         grown[:self.size] = column[:self.size]
+         self.columns[name] = grown
+
+   def append(self, transaction, block_height, position):
+      """
+      Appends a validated transaction as a new row.
+
+      :param transaction: Validated transaction (dict or TransactionRecord)
+      :param block_height: Index of the block holding it
+      :param position: Position of the transaction in the block
+      :return: Row number of the new listing
+      """
+      if self.size == len(self.columns['price']):
+         self._grow()
+
+      try:
+         price = float(transaction.get('price'))
+      except (TypeError, ValueError, OverflowError):
+         price = np.nan
+      try:
+         max_guests = int(transaction.get('maxGuests', DEFAULT_MAX_GUESTS))
+      except (TypeError, ValueError, OverflowError):
+         max_guests = DEFAULT_MAX_GUESTS
+      if not 0 <= max_guests <= _INT32_MAX:
+         max_guests = DEFAULT_MAX_GUESTS
+      try:
+         timestamp = float(transaction.get('timestamp') or 0.0)
+      except (TypeError, ValueError, OverflowError):
+         timestamp = 0.0
+
+      row = self.size
+      columns = self.columns
+      columns['price'][row] = price
+      columns['timestamp'][row] = timestamp
+      columns['type_code'][row] = self.types.encode(category_value(transaction.get('type'), DEFAULT_TYPE))
+      columns['location_code'][row] = self.locations.encode(category_value(transaction.get('location'), DEFAULT_LOCATION))
+      columns['max_guests'][row] = max_guests
+      columns['block_height'][row] = block_height
+      columns['position'][row] = position
+      self.size += 1
+      return row
+
+   def column(self, name):
+      """Returns a read-only view of the filled part of a column."""
+      view = self.columns[name][:self.size]
+      view.flags.writeable = False
+      return view
+
+   def block_rows(self, block_height):
+      """
+      Returns the rows of the listings sealed in one block.
+      Rows follow chain order, so the block_height column is sorted.
+
+      :param block_height: Index of the block
+      :return: range of row numbers
+      """
+      heights = self.column('block_height')
+      start = int(np.searchsorted(heights, block_height, side='left'))
+      stop = int(np.searchsorted(heights, block_height, side='right'))
+      return range(start, stop)
+
+   def filter(self, type=None, location=None, min_price=None, max_price=None,
+              min_guests=None, since=None, until=None):
+      """
+      Computes a boolean mask of listings matching all given filters.
+
+      :param type: Listing type
+      :param location: Listing location
+      :param min_price: Minimum price (inclusive)
+      :param max_price: Maximum price (inclusive)
+      :param min_guests: Minimum guest capacity
+      :param since: Minimum submission timestamp
+      :param until: Maximum submission timestamp
+      :return: NumPy boolean array of length len(self)
+      """
+      mask = np.ones(self.size, dtype=bool)
+      for value, table, name in ((type, self.types, 'type_code'),
+                                 (location, self.locations, 'location_code')):
+         if value is None:
+            continue
+         code = table.lookup(value)
+         if code is None:
+            return np.zeros(self.size, dtype=bool)
+         mask &= self.column(name) == code
+
+      price = self.column('price')
+      if min_price is not None:
+         mask &= price >= min_price
+      if max_price is not None:
+         mask &= price <= max_price
+      if min_guests is not None:
+         mask &= self.column('max_guests') >= min_guests
+      timestamp = self.column('timestamp')
+      if since is not None:
+         mask &= timestamp >= since
+      if until is not None:
+         mask &= timestamp <= until
+      return mask
+
+   def search(self, sort=None, offset=0, limit=20, **filters):
+      """
+      Finds matching listing rows.
+
+      :param sort: None (chain order), 'price', '-price', 'recent'
+      :param offset: Number of matching rows to skip
+      :param limit: Maximum number of rows to return
+      :param filters: Keyword filters accepted by filter()
+      :return: (total number of matches, NumPy array of row numbers for the page)
+      """
+      rows = self.order(np.flatnonzero(self.filter(**filters)), sort)
+      return len(rows), rows[offset:offset + limit]
+
+   def order(self, rows, sort):
+      """
+      Sorts row numbers by a column.
+
+      :param rows: Sequence of row numbers
+      :param sort: None (keep order), 'price', '-price', 'recent'
+      :return: NumPy array of row numbers
+      """
+      rows = np.asarray(rows, dtype=np.int64)
+      if sort == 'price':
+         return rows[np.argsort(self.column('price')[rows], kind='stable')]
+      if sort == '-price':
+         return rows[np.argsort(-self.column('price')[rows], kind='stable')]
+      if sort == 'recent':
+         return rows[np.argsort(-self.column('timestamp')[rows], kind='stable')]
+      if sort is not None:
+         raise ValueError(f"Unsupported sort: {sort}")
+      return rows
+
+   def stats(self, group_by=None, **filters):
+      """
+      Aggregates prices of matching listings.
+
+      :param group_by: None, 'type' or 'location'
+      :param filters: Keyword filters accepted by filter()
+      :return: dict with count, price summary and optional per-group counts and averages
+      """
+      mask = self.filter(**filters)
+      price = self.column('price')[mask]
+      priced = price[~np.isnan(price)]
+
+      result = {
+         'count': int(mask.sum()),
+         'price': _summarize(priced)
+      }
+
+      if group_by is not None:
+         if group_by not in GROUP_BY_FIELDS:
+            raise ValueError(f"Unsupported group_by: {group_by}")
+         table = self.types if group_by == 'type' else self.locations
+         codes = self.column(f'{group_by}_code')[mask]
+         has_price = ~np.isnan(price)
+         counts = np.bincount(codes, minlength=len(table.values))
+         priced_counts = np.bincount(codes[has_price], minlength=len(table.values))
+         sums = np.bincount(codes[has_price], weights=price[has_price], minlength=len(table.values))
+         result['groups'] = [
+            {
+               group_by: table.values[code],
+               'count': int(counts[code]),
+               'avg_price': float(sums[code] / priced_counts[code]) if priced_counts[code] else None
+            }
+            for code in np.flatnonzero(counts)
+         ]
+      return result
+
+
+def _summarize(prices):
+   """Summary statistics of a price array (None values when empty)."""
+   if len(prices) == 0:
+      return {'mean': None, 'min': None, 'max': None, 'p25': None, 'p50': None, 'p75': None}
+   p25, p50, p75 = np.percentile(prices, [25, 50, 75])
+   return {
+      'mean': float(prices.mean()),
+      'min': float(prices.min()),
+      'max': float(prices.max()),
+      'p25': float(p25),
+      'p50': float(p50),
+      'p75': float(p75)
+   }
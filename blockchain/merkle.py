@@ -0,0 +1,140 @@
+import json
+from hashlib import sha256
+from crypto import SignatureManager
+
+# Domain separation prefixes (RFC 6962) so a leaf can never be replayed as an inner node.
+LEAF_PREFIX = b'\x00'
+NODE_PREFIX = b'\x01'
+
+
+def transaction_id(transaction):
+   """
+   Computes a stable identifier for a transaction at submission time.
+
+   :param transaction: dict representing the transaction
+   :return: SHA-256 hex digest of the canonical JSON encoding
+   """
+   tx_string = json.dumps(transaction, sort_keys=True)
+   return sha256(tx_string.encode()).hexdigest()
+
+
+def hash_leaf(transaction):
+   """
+   Hashes a transaction into a Merkle leaf.
+
+   :param transaction: dict or TransactionRecord representing the transaction
+   :return: Leaf hash as hex string
+   """
+   if not isinstance(transaction, dict):
+      transaction = dict(transaction)
+   tx_string = json.dumps(transaction, sort_keys=True)
+   return sha256(LEAF_PREFIX + tx_string.encode()).hexdigest()
+
+
+def hash_node(left, right):
+   """
+   Hashes two child hashes into their parent node.
+
+   :param left: Left child hash (hex)
+   :param right: Right child hash (hex)
+   :return: Parent hash as hex string
+   """
+   return sha256(NODE_PREFIX + bytes.fromhex(left) + bytes.fromhex(right)).hexdigest()
+
+
+def _next_level(level):
+   """Builds the parent level; an unpaired last node is promoted unchanged."""
+   parents = [hash_node(level[i], level[i + 1]) for i in range(0, len(level) - 1, 2)]
+   if len(level) % 2:
+      parents.append(level[-1])
+   return parents
+
+
+def merkle_root(transactions):
+   """
+   Computes the Merkle root of a list of transactions.
+
+   :param transactions: List of transaction dicts
+   :return: Root hash as hex string (hash of empty input for an empty list)
+   """
+   if not transactions:
+      return sha256(b'').hexdigest()
+
+   level = [hash_leaf(tx) for tx in transactions]
+   while len(level) > 1:
+      level = _next_level(level)
+   return level[0]
+
+
+def merkle_proof(transactions, position):
+   """
+   Builds the inclusion path for the transaction at a given position.
+
+   :param transactions: List of transaction dicts of the block
+   :param position: Index of the transaction in the list
+   :return: List of {'side': 'left'|'right', 'hash': sibling_hash} from leaf to root
+   """
+   if position < 0 or position >= len(transactions):
+      raise IndexError("Transaction position out of range")
+
+   path = []
+   level = [hash_leaf(tx) for tx in transactions]
+   while len(level) > 1:
+      sibling = position ^ 1
+      if sibling < len(level):
+         path.append({
+            'side': 'left' if sibling < position else 'right',
+            'hash': level[sibling]
+         })
+      level = _next_level(level)
+      position //= 2
+   return path
+
+
+def verify_merkle_proof(transaction, path, root):
+   """
+   Checks that a transaction is included under a Merkle root.
+
+   :param transaction: dict representing the transaction
+   :param path: Inclusion path as returned by merkle_proof
+   :param root: Expected Merkle root (hex)
+   :return: True if the path leads to the root, False otherwise
+   """
+   current = hash_leaf(transaction)
+   for step in path:
+      if step['side'] == 'left':
+         current = hash_node(step['hash'], current)
+      else:
+         current = hash_node(current, step['hash'])
+   return current == root
+
+
+def verify_inclusion_proof(proof, trusted_validators=None):
+   """
+   Verifies an inclusion proof offline, without access to the chain.
+
+   Checks the Merkle path against the header's tx root, the header hash,
+   and the validator signature over that hash.
+
+   :param proof: dict as returned by LogementBlockchain.get_transaction_proof
+   :param trusted_validators: Optional collection of validator public key PEMs to accept
+   :return: True if valid, False otherwise
+   """
+   from .block import Block
+
+   try:
+      header = proof['header']
+      if not verify_merkle_proof(proof['transaction'], proof['path'], header['merkle_root']):
+         return False
+      if Block.hash_header(header) != header['hash']:
+         return False
+
+      validator = header.get('validator')
+      signature = header.get('signature')
+      if not validator or not signature:
+         return False
+      if trusted_validators is not None and validator not in trusted_validators:
+         return False
+      return SignatureManager().verify_signature(header['hash'], signature, validator)
+   except (KeyError, TypeError, ValueError):
+      return False
@@ -0,0 +1,127 @@
+import math
+import re
+import unicodedata
+from collections import defaultdict
+
+# Words too common in French listings to help ranking.
+STOPWORDS = {
+   'a', 'au', 'aux', 'avec', 'ce', 'ces', 'dans', 'de', 'des', 'du', 'en', 'et',
+   'il', 'la', 'le', 'les', 'l', 'd', 'un', 'une', 'pour', 'par', 'sur', 'ou',
+   'the', 'and', 'of', 'in', 'to', 'with'
+}
+
+# Spelling variants of Arabic place names and words in Latin script
+# (e.g. Marrakech/Marrakesh, souk/souq, Fès/Fez, Oujda/Ujda), applied in order.
+TRANSLITERATION_RULES = [
+   (re.compile(r'sh'), 'ch'),
+   (re.compile(r'dj'), 'j'),
+   (re.compile(r'q'), 'k'),
+   (re.compile(r'ou'), 'u'),
+   (re.compile(r'z$'), 's'),
+   (re.compile(r'(.)\1+'), r'\1')
+]
+
+_TOKEN_PATTERN = re.compile(r'\w+')
+# Apostrophes and transliteration marks for ayn/hamza are dropped inside words.
+_APOSTROPHES = re.compile(r"['’ʼʿʾ`]")
+
+FIELD_WEIGHTS = {'title': 2.0, 'description': 1.0}
+
+# BM25 parameters
+K1 = 1.2
+B = 0.75
+
+
+def normalize_token(token):
+   """
+   Folds a token to its search form: lowercase, accents removed, and
+   transliteration variants collapsed.
+
+   :param token: Raw word
+   :return: Normalized token
+   """
+   token = unicodedata.normalize('NFKD', token.lower())
+   token = ''.join(c for c in token if not unicodedata.combining(c))
+   for pattern, replacement in TRANSLITERATION_RULES:
+      token = pattern.sub(replacement, token)
+   return token
+
+
+def tokenize(text):
+   """
+   Splits text into normalized search tokens.
+
+   :param text: Input text
+   :return: List of tokens (stopwords removed)
+   """
+   if not text:
+      return []
+   text = _APOSTROPHES.sub('', str(text))
+   tokens = []
+   for word in _TOKEN_PATTERN.findall(text):
+      if word.lower() in STOPWORDS:
+         continue
+      tokens.append(normalize_token(word))
+   return tokens
+
+
+class TextIndex:
+   """
+   Incrementally updated inverted index over listing titles and descriptions.
+   Documents are ranked with BM25, title terms weighted above description terms.
+   """
+
+   def __init__(self):
+      self.postings = defaultdict(dict)
+      self.doc_lengths = {}
+      self.total_length = 0.0
+
+   def __len__(self):
+      return len(self.doc_lengths)
+
+   def add(self, doc_id, title, description):
+      """
+      Indexes a document.
+
+      :param doc_id: Document identifier (listing ID)
+      :param title: Listing title
+      :param description: Listing description
+      """
+      if doc_id in self.doc_lengths:
+         return
+
+      frequencies = defaultdict(float)
+      for field, text in (('title', title), ('description', description)):
+         for token in tokenize(text):
+            frequencies[token] += FIELD_WEIGHTS[field]
+
+      for token, frequency in frequencies.items():
+         self.postings[token][doc_id] = frequency
+      length = sum(frequencies.values())
+      self.doc_lengths[doc_id] = length
+      self.total_length += length
+
+   def search(self, query):
+      """
+      Ranks documents matching any query term.
+
+      :param query: Free-text query
+      :return: List of (doc_id, score) sorted by descending score
+      """
+      terms = set(tokenize(query))
+      if not terms or not self.doc_lengths:
+         return []
+
+      doc_count = len(self.doc_lengths)
+      average_length = self.total_length / doc_count or 1.0
+      scores = defaultdict(float)
+      for term in terms:
+         postings = self.postings.get(term)
+         if not postings:
+            continue
+         idf = math.log(1 + (doc_count - len(postings) + 0.5) / (len(postings) + 0.5))
+         for doc_id, frequency in postings.items():
+            norm = K1 * (1 - B + B * self.doc_lengths[doc_id] / average_length)
+            scores[doc_id] += idf * frequency * (K1 + 1) / (frequency + norm)
+
+      return sorted(scores.items(), key=lambda item: (-item[1], item[0]))
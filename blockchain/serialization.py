@@ -0,0 +1,417 @@
+import base64
+import binascii
+import struct
+import zlib
+from collections.abc import Mapping
+from .block import Block
+
+# Binary chain format:
+#   MAGIC | segment*
+#   segment := flags(1) | varint(payload length) | payload (zlib-compressed if flags & SEGMENT_ZLIB)
+#   payload := varint(block count) | block*
+# Each segment has its own string table, so segments can be decoded independently.
+MAGIC = b'LCB\x01'
+SEGMENT_ZLIB = 0x01
+
+COMPRESSION_FLAGS = {None: 0, 'none': 0, 'zlib': SEGMENT_ZLIB}
+
+# Largest decoded segment payload accepted, so a small compressed segment cannot expand without bound.
+MAX_SEGMENT_SIZE = 64 * 1024 * 1024
+
+# Errors raised by malformed or truncated input, reported as ValueError.
+_DECODE_ERRORS = (IndexError, struct.error, zlib.error, UnicodeDecodeError, OverflowError, RecursionError)
+
+# Block field presence/encoding flags
+_PREV_RAW = 0x01
+_HASH_RAW = 0x02
+_HAS_HASH = 0x04
+_HAS_VALIDATOR = 0x08
+_SIG_RAW = 0x10
+_SIG_STR = 0x20
+_TIMESTAMP_INT = 0x40
+_HAS_DIFFICULTY = 0x80
+
+_BLOCK_STRUCT = struct.Struct('>BQdQ')  # flags, index, timestamp, nonce
+_DOUBLE = struct.Struct('>d')
+
+# Value tags
+_NONE, _FALSE, _TRUE, _INT, _FLOAT, _STR, _STR_NEW, _STR_REF, _LIST, _DICT, _BIGINT = range(11)
+
+
+def _write_varint(out, value):
+   while value > 0x7f:
+      out.append((value & 0x7f) | 0x80)
+      value >>= 7
+   out.append(value)
+
+
+def _read_varint(data, pos):
+   result = 0
+   shift = 0
+   while True:
+      byte = data[pos]
+      pos += 1
+      result |= (byte & 0x7f) << shift
+      if byte < 0x80:
+         return result, pos
+      shift += 7
+
+
+def _raw_hex(value):
+   """Returns the 32 raw bytes of a lowercase SHA-256 hex string, or None if not round-trippable."""
+   if isinstance(value, str) and len(value) == 64:
+      try:
+         raw = bytes.fromhex(value)
+      except ValueError:
+         return None
+      if raw.hex() == value:
+         return raw
+   return None
+
+
+def _raw_b64(value):
+   """Returns the decoded bytes of a canonical base64 string, or None if not round-trippable."""
+   try:
+      raw = base64.b64decode(value.encode('ascii'), validate=True)
+   except (binascii.Error, UnicodeEncodeError, ValueError):
+      return None
+   if base64.b64encode(raw).decode('ascii') == value:
+      return raw
+   return None
+
+
+class _Encoder:
+   """Encodes one segment, interning dict keys and validator PEMs in a string table."""
+
+   def __init__(self):
+      self.out = bytearray()
+      self.strings = {}
+
+   def write_str(self, value):
+      data = value.encode('utf-8')
+      _write_varint(self.out, len(data))
+      self.out += data
+
+   def write_interned(self, value):
+      ref = self.strings.get(value)
+      if ref is None:
+         self.strings[value] = len(self.strings)
+         self.out.append(_STR_NEW)
+         self.write_str(value)
+      else:
+         self.out.append(_STR_REF)
+         _write_varint(self.out, ref)
+
+   def write_value(self, value):
+      out = self.out
+      if value is None:
+         out.append(_NONE)
+      elif value is True:
+         out.append(_TRUE)
+      elif value is False:
+         out.append(_FALSE)
+      elif isinstance(value, int):
+         if -(1 << 62) <= value < (1 << 62):
+            out.append(_INT)
+            _write_varint(out, (value << 1) ^ (value >> 63))
+         else:
+            out.append(_BIGINT)
+            self.write_str(str(value))
+      elif isinstance(value, float):
+         out.append(_FLOAT)
+         out += _DOUBLE.pack(value)
+      elif isinstance(value, str):
+         out.append(_STR)
+         self.write_str(value)
+      elif isinstance(value, (list, tuple)):
+         out.append(_LIST)
+         _write_varint(out, len(value))
+         for item in value:
+            self.write_value(item)
+      elif isinstance(value, (dict, Mapping)):
+         out.append(_DICT)
+         _write_varint(out, len(value))
+         for key, item in value.items():
+            if not isinstance(key, str):
+               raise ValueError(f"Unsupported dict key type: {type(key).__name__}")
+            self.write_interned(key)
+            self.write_value(item)
+      else:
+         raise ValueError(f"Unsupported value type: {type(value).__name__}")
+
+   def write_block(self, block):
+      prev_raw = _raw_hex(block.previous_hash)
+      hash_raw = _raw_hex(block.hash)
+      sig_raw = _raw_b64(block.signature) if isinstance(block.signature, str) else None
+
+      flags = 0
+      if prev_raw is not None:
+         flags |= _PREV_RAW
+      if block.hash is not None:
+         flags |= _HAS_HASH
+         if hash_raw is not None:
+            flags |= _HASH_RAW
+      if block.validator is not None:
+         flags |= _HAS_VALIDATOR
+      if block.signature is not None:
+         flags |= _SIG_RAW if sig_raw is not None else _SIG_STR
+      if isinstance(block.timestamp, int):
+         flags |= _TIMESTAMP_INT
+      if block.difficulty is not None:
+         flags |= _HAS_DIFFICULTY
+
+      self.out += _BLOCK_STRUCT.pack(flags, block.index, float(block.timestamp), block.nonce)
+      if flags & _HAS_DIFFICULTY:
+         self.out += _DOUBLE.pack(float(block.difficulty))
+      if prev_raw is not None:
+         self.out += prev_raw
+      else:
+         self.write_str(block.previous_hash)
+      if flags & _HAS_HASH:
+         if hash_raw is not None:
+            self.out += hash_raw
+         else:
+            self.write_str(block.hash)
+      if flags & _HAS_VALIDATOR:
+         self.write_interned(block.validator)
+      if flags & _SIG_RAW:
+         _write_varint(self.out, len(sig_raw))
+         self.out += sig_raw
+      elif flags & _SIG_STR:
+         self.write_str(block.signature)
+      self.write_value(block.transactions)
+
+
+class _Decoder:
+   """Decodes one segment payload produced by _Encoder."""
+
+   def __init__(self, data):
+      self.data = data
+      self.pos = 0
+      self.strings = []
+
+   def read_bytes(self, length):
+      start = self.pos
+      self.pos += length
+      if self.pos > len(self.data):
+         raise ValueError("Truncated binary chain data")
+      return bytes(self.data[start:self.pos])
+
+   def read_varint(self):
+      value, self.pos = _read_varint(self.data, self.pos)
+      return value
+
+   def read_str(self):
+      return self.read_bytes(self.read_varint()).decode('utf-8')
+
+   def read_interned(self):
+      tag = self.data[self.pos]
+      self.pos += 1
+      if tag == _STR_NEW:
+         value = self.read_str()
+         self.strings.append(value)
+         return value
+      if tag == _STR_REF:
+         return self.strings[self.read_varint()]
+      raise ValueError(f"Expected interned string, got tag {tag}")
+
+   def read_value(self):
+      tag = self.data[self.pos]
+      self.pos += 1
+      if tag == _NONE:
+         return None
+      if tag == _TRUE:
+         return True
+      if tag == _FALSE:
+         return False
+      if tag == _INT:
+         value = self.read_varint()
+         return (value >> 1) ^ -(value & 1)
+      if tag == _BIGINT:
+         return int(self.read_str())
+      if tag == _FLOAT:
+         return _DOUBLE.unpack(self.read_bytes(8))[0]
+      if tag == _STR:
+         return self.read_str()
+      if tag in (_STR_NEW, _STR_REF):
+         self.pos -= 1
+         return self.read_interned()
+      if tag == _LIST:
+         return [self.read_value() for _ in range(self.read_varint())]
+      if tag == _DICT:
+         result = {}
+         for _ in range(self.read_varint()):
+            key = self.read_interned()
+            result[key] = self.read_value()
+         return result
+      raise ValueError(f"Unknown value tag {tag}")
+
+   def read_block(self):
+      flags, index, timestamp, nonce = _BLOCK_STRUCT.unpack(self.read_bytes(_BLOCK_STRUCT.size))
+      if flags & _TIMESTAMP_INT:
+         timestamp = int(timestamp)
+      difficulty = _DOUBLE.unpack(self.read_bytes(8))[0] if flags & _HAS_DIFFICULTY else None
+      previous_hash = self.read_bytes(32).hex() if flags & _PREV_RAW else self.read_str()
+      block_hash = None
+      if flags & _HAS_HASH:
+         block_hash = self.read_bytes(32).hex() if flags & _HASH_RAW else self.read_str()
+      validator = self.read_interned() if flags & _HAS_VALIDATOR else None
+      signature = None
+      if flags & _SIG_RAW:
+         signature = base64.b64encode(self.read_bytes(self.read_varint())).decode('ascii')
+      elif flags & _SIG_STR:
+         signature = self.read_str()
+      transactions = self.read_value()
+
+      block = Block(index, transactions, timestamp, previous_hash, nonce, validator, signature, difficulty)
+      block.hash = block_hash
+      return block
+
+
+def encode_segment(blocks, compression=None):
+   """
+   Encodes a group of blocks as one self-contained segment.
+
+   :param blocks: List of Block instances
+   :param compression: None or 'zlib'
+   :return: Segment bytes
+   """
+   if compression not in COMPRESSION_FLAGS:
+      raise ValueError(f"Unsupported compression: {compression}")
+
+   encoder = _Encoder()
+   _write_varint(encoder.out, len(blocks))
+   for block in blocks:
+      encoder.write_block(block)
+
+   flags = COMPRESSION_FLAGS[compression]
+   payload = zlib.compress(bytes(encoder.out)) if flags & SEGMENT_ZLIB else bytes(encoder.out)
+   header = bytearray([flags])
+   _write_varint(header, len(payload))
+   return bytes(header) + payload
+
+
+def _read_payload(data, pos, max_size):
+   """Returns (decompressed payload, offset after the segment) of the segment at pos."""
+   flags = data[pos]
+   length, start = _read_varint(data, pos + 1)
+   end = start + length
+   if end > len(data):
+      raise ValueError("Truncated binary chain data")
+
+   payload = data[start:end]
+   if flags & SEGMENT_ZLIB:
+      decompressor = zlib.decompressobj()
+      payload = decompressor.decompress(payload, max_size)
+      if decompressor.unconsumed_tail or not decompressor.eof:
+         raise ValueError(f"Segment is truncated or exceeds {max_size} bytes once decompressed")
+   elif len(payload) > max_size:
+      raise ValueError(f"Segment exceeds {max_size} bytes")
+   return payload, end
+
+
+def _decode_payload(payload):
+   decoder = _Decoder(payload)
+   count = decoder.read_varint()
+   return [decoder.read_block() for _ in range(count)]
+
+
+def decode_segment(data, pos=0, max_size=MAX_SEGMENT_SIZE):
+   """
+   Decodes one segment starting at a given offset.
+
+   :param data: Bytes containing the segment
+   :param pos: Offset of the segment
+   :param max_size: Largest decoded payload accepted, in bytes
+   :return: (list of Block instances, offset after the segment)
+   :raises ValueError: If the segment is malformed, truncated or too large
+   """
+   try:
+      payload, end = _read_payload(data, pos, max_size)
+      return _decode_payload(payload), end
+   except _DECODE_ERRORS as e:
+      raise ValueError(f"Invalid binary chain data: {e}")
+
+
+def encode_blocks(blocks, compression=None, segment_size=256):
+   """
+   Encodes a sequence of blocks in the binary chain format.
+
+   :param blocks: Iterable of Block instances
+   :param compression: None or 'zlib' (applied per segment)
+   :param segment_size: Number of blocks per segment
+   :return: Encoded bytes
+   """
+   blocks = list(blocks)
+   out = bytearray(MAGIC)
+   for start in range(0, len(blocks), segment_size):
+      out += encode_segment(blocks[start:start + segment_size], compression)
+   return bytes(out)
+
+
+def iter_decode_blocks(data, max_size=None):
+   """
+   Decodes blocks from binary chain data, one segment at a time.
+
+   :param data: Bytes produced by encode_blocks
+   :param max_size: Largest total decoded size accepted, in bytes (None for no limit beyond MAX_SEGMENT_SIZE per segment)
+   :return: Generator of Block instances
+   :raises ValueError: If the data is malformed, truncated or too large
+   """
+   if not is_binary_chain(data):
+      raise ValueError("Not a binary chain file")
+
+   remaining = max_size
+   pos = len(MAGIC)
+   while pos < len(data):
+      limit = MAX_SEGMENT_SIZE if remaining is None else min(MAX_SEGMENT_SIZE, remaining)
+      try:
+         payload, pos = _read_payload(data, pos, limit)
+         blocks = _decode_payload(payload)
+      except _DECODE_ERRORS as e:
+         raise ValueError(f"Invalid binary chain data: {e}")
+      if remaining is not None:
+         remaining -= len(payload)
+      yield from blocks
+
+
+def segment_offsets(data):
+   """
+   Lists the offsets of the segments in binary chain data without decoding them,
+   so a single segment can then be read with decode_segment.
+
+   :param data: Bytes produced by encode_blocks
+   :return: List of segment offsets
+   """
+   if not is_binary_chain(data):
+      raise ValueError("Not a binary chain file")
+
+   offsets = []
+   pos = len(MAGIC)
+   while pos < len(data):
+      offsets.append(pos)
+      try:
+         length, start = _read_varint(data, pos + 1)
+      except IndexError:
+         raise ValueError("Truncated binary chain data")
+      pos = start + length
+   if pos > len(data):
+      raise ValueError("Truncated binary chain data")
+   return offsets
+
+
+def decode_blocks(data, max_size=None):
+   """
+   Decodes all blocks from binary chain data.
+
+   :param data: Bytes produced by encode_blocks
+   :param max_size: Largest total decoded size accepted, in bytes (see iter_decode_blocks)
+   :return: List of Block instances
+   :raises ValueError: If the data is malformed, truncated or too large
+   """
+   return list(iter_decode_blocks(data, max_size))
+
+
+def is_binary_chain(data):
+   """Checks whether the data starts with the binary chain magic bytes."""
+   return data[:len(MAGIC)] == MAGIC
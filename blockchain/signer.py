@@ -0,0 +1,224 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from cryptography.hazmat.primitives import serialization
+from crypto import SignatureManager
+from .block import Block
+
+
+class SignerWorker:
+   """
+   Long-lived signing thread holding parsed validator keys.
+   Keys are loaded once; callers only exchange block hashes and signatures
+   with the worker over a local queue and never handle key material.
+   """
+
+   def __init__(self):
+      self.signature_manager = SignatureManager()
+      self._keys = {}
+      self._queue = queue.Queue()
+      self._thread = threading.Thread(target=self._run, name="block-signer", daemon=True)
+      self._thread.start()
+
+   def load_key(self, private_key_pem):
+      """
+      Parses a validator private key and keeps it in the worker.
+
+      :param private_key_pem: Private key in PEM format
+      :return: The matching public key PEM (the validator identity)
+      """
+      private_key = self.signature_manager.load_private_key(private_key_pem)
+      public_key_pem = private_key.public_key().public_bytes(
+         encoding=serialization.Encoding.PEM,
+         format=serialization.PublicFormat.SubjectPublicKeyInfo
+      ).decode('utf-8')
+      self._keys[public_key_pem] = private_key
+      return public_key_pem
+
+   def load_key_file(self, path):
+      """Loads a validator private key from a PEM file; returns its public key PEM."""
+      with open(path, 'r') as f:
+         return self.load_key(f.read())
+
+   @property
+   def validators(self):
+      """Public key PEMs of the loaded keys, in load order."""
+      return list(self._keys)
+
+   def submit(self, block_hash, validator=None):
+      """
+      Queues a block hash for signing.
+
+      :param block_hash: Hash to sign
+      :param validator: Public key PEM of the key to use (defaults to the first loaded key)
+      :return: Future resolving to the base64 signature
+      """
+      future = Future()
+      self._queue.put((block_hash, validator, future))
+      return future
+
+   def sign(self, block_hash, validator=None):
+      """Signs a block hash, waiting for the worker."""
+      return self.submit(block_hash, validator).result()
+
+   def close(self):
+      """Stops the worker once queued hashes are signed."""
+      self._queue.put(None)
+      self._thread.join()
+
+   def _run(self):
+      while True:
+         job = self._queue.get()
+         if job is None:
+            return
+         block_hash, validator, future = job
+         if not future.set_running_or_notify_cancel():
+            continue
+         try:
+            if validator is None:
+               if not self._keys:
+                  raise ValueError("No validator key loaded")
+               validator = next(iter(self._keys))
+            private_key = self._keys.get(validator)
+            if private_key is None:
+               raise PermissionError("No key loaded for this validator")
+            future.set_result(self.signature_manager.sign_data_with_key(block_hash, private_key))
+         except Exception as e:
+            future.set_exception(e)
+
+
+class BlockSealer:
+   """
+   Pipelined PoA block production.
+   An assembler thread builds and hashes block N+1 (chained on block N's hash,
+   which does not depend on its signature) while the signer signs block N;
+   a committer thread appends signed blocks to the chain in order.
+   """
+
+   def __init__(self, blockchain, signer, validator=None, max_in_flight=8):
+      """
+      :param blockchain: LogementBlockchain to extend
+      :param signer: SignerWorker holding the validator key
+      :param validator: Public key PEM to sign with (defaults to the signer's first key)
+      :param max_in_flight: Blocks assembled but not yet committed before assembly waits
+      """
+      self.blockchain = blockchain
+      self.signer = signer
+      self.validator = validator
+      self._requests = queue.Queue()
+      self._sealed = queue.Queue(maxsize=max_in_flight)
+      self._state_lock = threading.Lock()
+      self._tip = None
+      self._generation = 0
+      self._in_flight = 0
+      self._pending_ids = set()
+      self._assembler = threading.Thread(target=self._assemble, name="block-assembler", daemon=True)
+      self._committer = threading.Thread(target=self._commit, name="block-committer", daemon=True)
+      self._assembler.start()
+      self._committer.start()
+
+   def is_sealing(self, tx_id):
+      """True if a transaction is already queued for a block."""
+      with self._state_lock:
+         return tx_id in self._pending_ids
+
+   def submit(self, transactions, validator=None):
+      """
+      Queues transactions to be sealed into one block.
+
+      :param transactions: List of pending transaction dicts
+      :param validator: Public key PEM to sign this block with (defaults to the sealer's validator)
+      :return: Future resolving to the new block index
+      :raises ValueError: If a transaction is already being sealed
+      """
+      tx_ids = [tx.get('tx_id') for tx in transactions if tx.get('tx_id')]
+      with self._state_lock:
+         if any(tx_id in self._pending_ids for tx_id in tx_ids):
+            raise ValueError("Transaction is already being sealed")
+         self._pending_ids.update(tx_ids)
+      future = Future()
+      self._requests.put((transactions, tx_ids, validator, future))
+      return future
+
+   def seal(self, transactions, validator=None):
+      """Seals transactions into a block, waiting for it to be committed."""
+      return self.submit(transactions, validator).result()
+
+   def close(self):
+      """Stops the pipeline once queued blocks are committed."""
+      self._requests.put(None)
+      self._assembler.join()
+      self._committer.join()
+
+   def _assemble(self):
+      while True:
+         job = self._requests.get()
+         if job is None:
+            self._sealed.put(None)
+            return
+         transactions, tx_ids, validator, future = job
+         if not future.set_running_or_notify_cancel():
+            with self._state_lock:
+               self._pending_ids.difference_update(tx_ids)
+            continue
+         try:
+            self._assemble_block(transactions, tx_ids, validator, future)
+         except Exception as e:
+            # A block that cannot be built fails its own request; the pipeline keeps running.
+            with self._state_lock:
+               self._pending_ids.difference_update(tx_ids)
+            future.set_exception(e)
+
+   def _assemble_block(self, transactions, tx_ids, validator, future):
+      with self._state_lock:
+         if self._in_flight == 0 or self._tip is None:
+            # Nothing in flight: build on the chain itself, which may have
+            # moved (sync, other miners) since the last block we sealed.
+            last = self.blockchain.last_block
+            self._tip = (last.index, last.hash)
+         index, previous_hash = self._tip
+         generation = self._generation
+
+      block = Block(
+         index=index + 1,
+         transactions=[dict(tx, status="validated") for tx in transactions],
+         timestamp=time.time(),
+         previous_hash=previous_hash
+      )
+      block.validator = validator or self.validator or (self.signer.validators or [None])[0]
+      block.hash = block.compute_hash()
+      signature = self.signer.submit(block.hash, block.validator)
+
+      with self._state_lock:
+         self._tip = (block.index, block.hash)
+         self._in_flight += 1
+      self._sealed.put((block, generation, signature, transactions, tx_ids, future))
+
+   def _commit(self):
+      while True:
+         item = self._sealed.get()
+         if item is None:
+            return
+         block, generation, signature, transactions, tx_ids, future = item
+         try:
+            block.signature = signature.result()
+            with self.blockchain.lock:
+               added = self.blockchain.add_block(block, block.hash)
+            if not added:
+               raise ValueError(f"Block {block.index} was rejected by the chain")
+            for tx in transactions:
+               tx["status"] = "validated"
+            future.set_result(block.index)
+         except Exception as e:
+            # Any failure fails this request only. Blocks already built on this
+            # one will fail too; later blocks are rebased on the chain instead.
+            with self._state_lock:
+               if generation == self._generation:
+                  self._generation += 1
+                  self._tip = None
+            future.set_exception(e)
+         finally:
+            with self._state_lock:
+               self._in_flight -= 1
+               self._pending_ids.difference_update(tx_ids)
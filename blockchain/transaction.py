@@ -0,0 +1,105 @@
+import sys
+from collections.abc import MutableMapping
+
+# Core listing fields stored in fixed slots, in canonical order (key -> slot name).
+CORE_FIELDS = {
+   'tx_id': 'tx_id',
+   'from': 'sender',
+   'to': 'recipient',
+   'title': 'title',
+   'description': 'description',
+   'price': 'price',
+   'status': 'status',
+   'timestamp': 'timestamp',
+   'type': 'type',
+   'location': 'location',
+   'maxGuests': 'max_guests'
+}
+
+# Fields whose values repeat across many listings and are worth interning.
+INTERNED_FIELDS = {'from', 'to', 'status', 'type', 'location'}
+
+
+class TransactionRecord(MutableMapping):
+   """
+   Memory-compact transaction stored inside a block.
+   Core listing fields live in slots instead of a per-record dict; any other
+   field goes into an `extra` dict. Behaves like the original transaction dict.
+   """
+
+   __slots__ = tuple(CORE_FIELDS.values()) + ('extra',)
+
+   def __init__(self, data=None):
+      """
+      Initializes a record from a transaction dict.
+
+      :param data: dict (or mapping) representing the transaction
+      """
+      self.extra = None
+      if data:
+         for key, value in data.items():
+            self[key] = value
+
+   @classmethod
+   def from_dict(cls, data):
+      """
+      Builds a record from a transaction dict, returning records unchanged.
+
+      :param data: dict representing the transaction
+      :return: TransactionRecord instance
+      """
+      if isinstance(data, cls):
+         return data
+      return cls(data)
+
+   def to_dict(self):
+      """Converts the record back to a plain dict."""
+      return dict(self.items())
+
+   def __getitem__(self, key):
+      slot = CORE_FIELDS.get(key)
+      if slot is not None:
+         try:
+            return getattr(self, slot)
+         except AttributeError:
+            raise KeyError(key) from None
+      if self.extra is None:
+         raise KeyError(key)
+      return self.extra[key]
+
+   def __setitem__(self, key, value):
+      if key in INTERNED_FIELDS and isinstance(value, str):
+         value = sys.intern(value)
+      slot = CORE_FIELDS.get(key)
+      if slot is not None:
+         setattr(self, slot, value)
+         return
+      if self.extra is None:
+         self.extra = {}
+      self.extra[sys.intern(key)] = value
+
+   def __delitem__(self, key):
+      slot = CORE_FIELDS.get(key)
+      if slot is not None:
+         try:
+            delattr(self, slot)
+         except AttributeError:
+            raise KeyError(key) from None
+         return
+      if self.extra is None:
+         raise KeyError(key)
+      del self.extra[key]
+
+   def __iter__(self):
+      for key, slot in CORE_FIELDS.items():
+         if hasattr(self, slot):
+            yield key
+      if self.extra:
+         yield from self.extra
+
+   def __len__(self):
+      count = sum(1 for slot in CORE_FIELDS.values() if hasattr(self, slot))
+      return count + (len(self.extra) if self.extra else 0)
+
+   def __repr__(self):
+      return f"TransactionRecord({self.to_dict()!r})"
@@ -1,17 +1,66 @@
 from fastapi import FastAPI
 from api.middleware.cors import setup_cors
+from api.middleware.admission import setup_admission_control
+from api.services.admission_service import admission_controller
 from api.routes.auth import auth_router
 from api.routes.blockchain import blockchain_router
 from api.routes.listings import listings_router
+from api.routes.network import network_router
+from api.routes.events import events_router
 
 app = FastAPI(title="LogementCert API")
 
+# Registered before CORS so that 429 responses still carry CORS headers.
+setup_admission_control(app, admission_controller)
 setup_cors(app)
 
 app.include_router(auth_router, prefix="/auth")
 app.include_router(blockchain_router, prefix="/blockchain")
 app.include_router(listings_router, prefix="/listings")
+app.include_router(network_router, prefix="/network")
+app.include_router(events_router, prefix="/events")
 
 if __name__ == "__main__":
+   import argparse
    import uvicorn
-   uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
+   from api.services.blockchain_service import blockchain_service
+   from api.services.network_service import node
+   from network import HttpPeer
+
+   parser = argparse.ArgumentParser(description="Run a LogementCert node")
+   parser.add_argument("--host", default="0.0.0.0")
+   parser.add_argument("--port", type=int, default=8000)
+   parser.add_argument("--url", help="Public URL announced to peers (default http://127.0.0.1:PORT)")
+   parser.add_argument("--peers", default="", help="Comma-separated peer URLs")
+   parser.add_argument("--validator-key", action="append", default=[], help="Validator private key PEM file (repeatable)")
+   parser.add_argument("--authority-token", action="append", default=[],
+                       help="Authority token for the validator key at the same position (generated if omitted)")
+   parser.add_argument("--trusted-validator", action="append", default=[],
+                       help="Validator public key PEM file whose blocks are accepted (repeatable)")
+   parser.add_argument("--operator-token", help="Token accepted on administration endpoints (validators, peers, sync)")
+   parser.add_argument("--rate-limit-scale", type=float, default=1.0, help="Multiplier for admission control rates and bursts")
+   parser.add_argument("--archive-dir", help="Directory for archived block bodies (default: keep all in memory)")
+   parser.add_argument("--archive-depth", type=int, default=1024, help="Most recent blocks kept in memory when archiving")
+   parser.add_argument("--sync-interval", type=float, default=10.0, help="Seconds between background syncs (0 disables)")
+   args = parser.parse_args()
+
+   admission_controller.scale(args.rate_limit_scale)
+   for position, key_file in enumerate(args.validator_key):
+      token = args.authority_token[position] if position < len(args.authority_token) else None
+      issued = blockchain_service.load_validator_key(key_file, token)
+      if token is None:
+         print(f"Authority token for {key_file}: {issued}")
+   for key_file in args.trusted_validator:
+      blockchain_service.load_trusted_validator(key_file)
+   if args.operator_token:
+      blockchain_service.add_operator_token(args.operator_token)
+   if args.archive_dir:
+      blockchain_service.enable_archive(args.archive_dir, args.archive_depth)
+
+   node.url = args.url or node.url or f"http://127.0.0.1:{args.port}"
+   for peer_url in filter(None, args.peers.split(",")):
+      node.add_peer(HttpPeer(peer_url.strip()))
+   if args.sync_interval > 0:
+      node.start(args.sync_interval)
+
+   uvicorn.run(app, host=args.host, port=args.port)
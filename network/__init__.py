@@ -0,0 +1,2 @@
+from .node import Node, prefers
+from .peer import HttpPeer, PEER_ERRORS
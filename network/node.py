@@ -0,0 +1,287 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from blockchain.block import Block
+from blockchain.light_client import LightClient
+
+
+def prefers(candidate, current):
+   """
+   PoA fork choice: the longer chain wins; at equal height the tip with the
+   lower hash wins, so every node picks the same branch.
+
+   :param candidate: Tip header (or status) dict with 'index'/'height' and hash
+   :param current: Tip header (or status) dict of the chain we follow
+   :return: True if candidate should replace current
+   """
+   def key(tip):
+      height = tip['height'] if 'height' in tip else tip['index']
+      tip_hash = tip['tip_hash'] if 'tip_hash' in tip else tip['hash']
+      return height, tip_hash
+
+   candidate_height, candidate_hash = key(candidate)
+   current_height, current_hash = key(current)
+   if candidate_height != current_height:
+      return candidate_height > current_height
+   return candidate_hash < current_hash
+
+
+class Node:
+   """
+   Replicates a LogementBlockchain with a set of peers.
+   New local blocks are announced to every peer; a node that falls behind
+   (or sees a better fork) catches up headers-first, then downloads block
+   bodies in parallel from all peers on the best tip.
+   """
+
+   def __init__(self, blockchain, url=None, header_batch_size=500, body_workers=8):
+      """
+      :param blockchain: LogementBlockchain to replicate
+      :param url: Public URL of this node, sent as origin with announcements
+      :param header_batch_size: Headers requested per call (also the apply window)
+      :param body_workers: Parallel block body downloads
+      """
+      self.blockchain = blockchain
+      self.url = url
+      self.peers = {}
+      self.header_batch_size = header_batch_size
+      self.body_workers = body_workers
+      self.lock = blockchain.lock
+      self._sync_lock = threading.Lock()
+      self._local = threading.local()
+      self._announcer = ThreadPoolExecutor(max_workers=4)
+      self._stop = threading.Event()
+      self._sync_thread = None
+      blockchain.add_block_listener(self._on_block_added)
+
+   def add_peer(self, peer):
+      """Adds a peer (HttpPeer or any object with the same methods and a url)."""
+      if peer.url != self.url:
+         self.peers[peer.url] = peer
+
+   def remove_peer(self, url):
+      self.peers.pop(url, None)
+
+   def status(self):
+      """Returns this node's height, tip and peers."""
+      tip = self.blockchain.last_block
+      return {
+         'url': self.url,
+         'height': tip.index,
+         'tip_hash': tip.hash,
+         'genesis_hash': self.blockchain.chain[0].hash,
+         'peers': sorted(self.peers)
+      }
+
+   # Gossip
+
+   def _on_block_added(self, block):
+      if getattr(self._local, 'quiet', False):
+         return
+      self.announce(block)
+
+   def announce(self, block):
+      """Sends a block to every peer in the background."""
+      data = block.to_dict()
+      for peer in list(self.peers.values()):
+         self._announcer.submit(self._announce_to, peer, data)
+
+   def _announce_to(self, peer, data):
+      try:
+         peer.announce(data, origin=self.url)
+      except Exception as e:
+         print(f"Announcement to {peer.url} failed: {e}")
+
+   def handle_announcement(self, block_data, origin=None):
+      """
+      Processes a block announced by a peer.
+
+      :param block_data: Block dict
+      :param origin: URL of the announcing node, if known
+      :return: 'added', 'known', 'rejected', or 'sync' when a catch-up is needed
+      """
+      block = Block.from_dict(block_data)
+      if not isinstance(block.index, int) or block.index < 1:
+         return 'rejected'
+      with self.lock:
+         tip = self.blockchain.last_block
+         if block.index <= tip.index:
+            if self.blockchain.chain[block.index].hash == block.hash:
+               return 'known'
+            if block.index == tip.index and prefers(block.get_header(), tip.get_header()):
+               return 'sync'
+            return 'rejected'
+
+         if block.index == tip.index + 1 and block.previous_hash == tip.hash:
+            return 'added' if self.blockchain.add_block(block, block.hash) else 'rejected'
+      return 'sync'
+
+   # Catch-up sync
+
+   def _header_validator(self):
+      return LightClient(
+         fetch_headers=None,
+         trusted_validators=self.blockchain.get_validators(),
+         consensus_type=self.blockchain.consensus_type,
+         difficulty=self.blockchain.difficulty,
+         target_block_time=self.blockchain.target_block_time,
+         retarget_window=self.blockchain.retarget_window
+      )
+
+   def _find_fork_point(self, peer, peer_height):
+      """Highest height where our chain and the peer's agree (exponential then binary search)."""
+      chain = self.blockchain.chain
+
+      def matches(height):
+         headers = peer.get_headers(height, height + 1)
+         return bool(headers) and headers[0]['hash'] == chain[height].hash
+
+      high = min(len(chain) - 1, peer_height)
+      if matches(high):
+         return high
+
+      step = 1
+      while True:
+         low = max(0, high - step)
+         if matches(low):
+            break
+         if low == 0:
+            raise ValueError("Peer does not share our genesis block")
+         high = low
+         step *= 2
+
+      while high - low > 1:
+         middle = (low + high) // 2
+         if matches(middle):
+            low = middle
+         else:
+            high = middle
+      return low
+
+   def _download_headers(self, peer, previous, end):
+      """Downloads and validates headers after `previous` up to height end (exclusive)."""
+      validator = self._header_validator()
+      headers = peer.get_headers(previous['index'] + 1, end)
+      for header in headers:
+         validator.validate_header(header, previous)
+         previous = header
+      return headers
+
+   def _download_bodies(self, headers, sources):
+      """Fetches block bodies in parallel, spreading heights across peers."""
+      def fetch(position, header):
+         for attempt in range(len(sources)):
+            peer = sources[(position + attempt) % len(sources)]
+            try:
+               block = Block.from_dict(peer.get_block(header['index']))
+            except Exception:
+               continue
+            if (block.hash == header['hash'] and block.signature == header['signature']
+                  and block.compute_hash() == header['hash']):
+               return block
+         raise ValueError(f"No peer served a valid body for block {header['index']}")
+
+      with ThreadPoolExecutor(max_workers=min(self.body_workers, max(1, len(headers)))) as executor:
+         return list(executor.map(fetch, range(len(headers)), headers))
+
+   def _peer_statuses(self):
+      genesis_hash = self.blockchain.chain[0].hash
+      statuses = []
+      for peer in list(self.peers.values()):
+         # A misbehaving peer (bad JSON shape, unexpected error) is skipped, not fatal.
+         try:
+            status = peer.get_status()
+            if status.get('genesis_hash') == genesis_hash:
+               statuses.append((peer, {'height': int(status['height']), 'tip_hash': str(status['tip_hash'])}))
+         except Exception as e:
+            print(f"Status from {peer.url} failed: {e}")
+      return statuses
+
+   def sync(self):
+      """
+      Catches up with the best chain among the peers.
+
+      :return: Number of blocks applied (0 if already on the best chain or a sync is running)
+      """
+      if not self._sync_lock.acquire(blocking=False):
+         return 0
+      self._local.quiet = True
+      try:
+         return self._sync()
+      finally:
+         self._local.quiet = False
+         self._sync_lock.release()
+
+   def _sync(self):
+      statuses = self._peer_statuses()
+      if not statuses:
+         return 0
+
+      best_peer, best = statuses[0]
+      for peer, status in statuses[1:]:
+         if prefers(status, best):
+            best_peer, best = peer, status
+      if not prefers(best, self.status()):
+         return 0
+
+      sources = [peer for peer, status in statuses if status['tip_hash'] == best['tip_hash']]
+      fork = self._find_fork_point(best_peer, best['height'])
+      applied = 0
+
+      if fork == self.blockchain.last_block.index:
+         # Extension of our chain: apply window by window.
+         previous = self.blockchain.last_block.get_header()
+         while previous['index'] < best['height']:
+            end = min(previous['index'] + 1 + self.header_batch_size, best['height'] + 1)
+            headers = self._download_headers(best_peer, previous, end)
+            if not headers:
+               break
+            blocks = self._download_bodies(headers, sources)
+            try:
+               applied += self.blockchain.append_segment(blocks)
+            except (ValueError, PermissionError) as e:
+               # Our tip moved while downloading (e.g. a locally sealed block).
+               print(f"Sync segment rejected: {e}")
+               break
+            previous = headers[-1]
+      else:
+         # Competing fork: gather the whole branch, then switch atomically.
+         previous = self.blockchain.chain[fork].get_header()
+         blocks = []
+         while previous['index'] < best['height']:
+            end = min(previous['index'] + 1 + self.header_batch_size, best['height'] + 1)
+            headers = self._download_headers(best_peer, previous, end)
+            if not headers:
+               break
+            blocks.extend(self._download_bodies(headers, sources))
+            previous = headers[-1]
+         with self.lock:
+            if self.blockchain.replace_chain(self.blockchain.chain[:fork + 1] + blocks):
+               applied = len(blocks)
+
+      if applied:
+         self.announce(self.blockchain.last_block)
+      return applied
+
+   def start(self, sync_interval=10.0):
+      """Runs sync() periodically in a background thread, as a fallback to announcements."""
+      if self._sync_thread is not None:
+         return
+      self._stop.clear()
+
+      def run():
+         while not self._stop.wait(sync_interval):
+            # Any error ends this round only; the thread keeps syncing.
+            try:
+               self.sync()
+            except Exception as e:
+               print(f"Background sync failed: {e}")
+
+      self._sync_thread = threading.Thread(target=run, daemon=True)
+      self._sync_thread.start()
+
+   def stop(self):
+      """Stops the background sync thread."""
+      self._stop.set()
+      if self._sync_thread is not None:
+         self._sync_thread.join()
+         self._sync_thread = None
@@ -0,0 +1,55 @@
+import json
+from urllib import request
+from urllib.error import URLError
+from urllib.parse import urlencode, urlsplit
+
+# Errors raised by a peer that is down, slow or returns garbage.
+PEER_ERRORS = (URLError, OSError, ValueError)
+
+
+class HttpPeer:
+   """A remote node reached through the LogementCert HTTP API."""
+
+   def __init__(self, url, timeout=5.0):
+      """
+      :param url: Base URL of the peer's API, e.g. http://127.0.0.1:8001
+      :param timeout: Request timeout in seconds
+      :raises ValueError: If the URL is not an http(s) URL
+      """
+      parts = urlsplit(url)
+      if parts.scheme not in ('http', 'https') or not parts.netloc:
+         raise ValueError(f"Peer URL must be an http(s) URL: {url}")
+      self.url = url.rstrip('/')
+      self.timeout = timeout
+
+   def __repr__(self):
+      return f"HttpPeer({self.url})"
+
+   def _get(self, path, params=None):
+      url = f"{self.url}{path}"
+      if params:
+         url += '?' + urlencode(params)
+      with request.urlopen(url, timeout=self.timeout) as response:
+         return json.loads(response.read())
+
+   def _post(self, path, payload):
+      data = json.dumps(payload).encode('utf-8')
+      req = request.Request(f"{self.url}{path}", data=data, headers={'Content-Type': 'application/json'})
+      with request.urlopen(req, timeout=self.timeout) as response:
+         return json.loads(response.read())
+
+   def get_status(self):
+      """Returns {'height', 'tip_hash', 'genesis_hash', ...}."""
+      return self._get('/network/status')
+
+   def get_headers(self, start, end):
+      """Returns headers for heights [start, end)."""
+      return self._get('/blockchain/headers', {'start': start, 'end': end})
+
+   def get_block(self, index):
+      """Returns the full block dict at a height."""
+      return self._get(f'/blockchain/block/{index}')
+
+   def announce(self, block_data, origin=None):
+      """Sends a new block to the peer."""
+      return self._post('/network/announce', {'block': block_data, 'origin': origin})
@@ -0,0 +1,62 @@
+import time
+import pytest
+from crypto import KeyManager
+from blockchain.block import Block
+from blockchain.blockchain import LogementBlockchain
+
+
+@pytest.fixture(scope="session")
+def validator_keys(tmp_path_factory):
+   """(private PEM, public PEM) of a validator key pair, generated once per run."""
+   private_pem, public_pem, _ = KeyManager(str(tmp_path_factory.mktemp("keys"))).generate_key_pair()
+   return private_pem, public_pem
+
+
+@pytest.fixture
+def poa_chain(validator_keys):
+   """PoA chain with the test validator authorized."""
+   blockchain = LogementBlockchain(consensus_type='poa')
+   blockchain.add_validator(validator_keys[1])
+   return blockchain
+
+
+def make_listing(title, owner="owner_1", **fields):
+   """Pending listing transaction as submitted through the API."""
+   return {
+      "from": owner, "to": "authority", "title": title, "description": f"Description de {title}",
+      "price": 500.0, "status": "pending", **fields
+   }
+
+
+def sign(blockchain, private_pem, previous, transactions):
+   """Block sealing `transactions` on top of `previous`, signed but not appended."""
+   block = Block(previous.index + 1, [dict(tx, status="validated") for tx in transactions], time.time(), previous.hash)
+   return blockchain.consensus.sign_block(block, private_pem)
+
+
+def signed_blocks(blockchain, private_pem, count, start=None):
+   """Signed one-listing blocks extending `start` (defaults to the chain tip), not appended."""
+   previous = start or blockchain.last_block
+   blocks = []
+   for _ in range(count):
+      previous = sign(blockchain, private_pem, previous, [make_listing(f"Logement {previous.index + 1}")])
+      blocks.append(previous)
+   return blocks
+
+
+class ChainPeer:
+   """In-process peer serving a local chain through the calls Node makes over HTTP."""
+
+   def __init__(self, blockchain, url="http://peer.example"):
+      self.blockchain = blockchain
+      self.url = url
+
+   def get_status(self):
+      tip = self.blockchain.last_block
+      return {'height': tip.index, 'tip_hash': tip.hash, 'genesis_hash': self.blockchain.chain[0].hash}
+
+   def get_headers(self, start, end):
+      return self.blockchain.get_headers(start, end)
+
+   def get_block(self, index):
+      return self.blockchain.get_block(index)
@@ -0,0 +1,46 @@
+from api.middleware.admission import AdmissionController, AdmissionRule, bearer_token
+
+
+def controller(**options):
+   return AdmissionController(
+      client_burst=2, authority_burst=5, line_burst=3,
+      authenticate=lambda token: "validator_1" if token == "secret" else None, **options
+   )
+
+
+def test_authority_budget_requires_a_valid_token():
+   admission = controller()
+   rule = AdmissionRule(authority=True)
+
+   # Unauthenticated requests to authority endpoints share the client budget.
+   results = [admission.admit("/blockchain/mine", rule, "10.0.0.1", now=0, token="guess")[0] for _ in range(3)]
+   assert results == [None, None, "client_rate"]
+
+   results = [admission.admit("/blockchain/mine", rule, "10.0.0.1", now=0, token="secret")[0] for _ in range(6)]
+   assert results == [None] * 5 + ["authority_rate"]
+   assert list(admission.authorities.buckets) == ["validator_1"]
+
+
+def test_bulk_lines_are_charged_per_client():
+   admission = controller()
+
+   results = [admission.admit_line("/blockchain/submit_bulk", "10.0.0.1", now=0)[0] for _ in range(4)]
+   assert results == [None, None, None, "line_rate"]
+   assert admission.admit_line("/blockchain/submit_bulk", "10.0.0.2", now=0)[0] is None
+   assert admission.admit_line("/blockchain/submit_bulk", "10.0.0.1", now=1)[0] is None
+
+
+def test_write_endpoints_have_rules():
+   admission = controller()
+
+   for path in ("/blockchain/submit_bulk", "/blockchain/segment", "/network/announce", "/network/peers",
+                "/network/sync"):
+      assert admission.rule_for("POST", path) is not None
+   assert admission.rule_for("POST", "/blockchain/segment").authority
+   assert admission.rule_for("POST", "/network/sync").authority
+
+
+def test_bearer_token():
+   assert bearer_token([(b"authorization", b"Bearer abc ")]) == "abc"
+   assert bearer_token([(b"authorization", b"Basic abc")]) is None
+   assert bearer_token([]) is None
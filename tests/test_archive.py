@@ -0,0 +1,67 @@
+import pytest
+from blockchain.archive import BlockArchive
+from blockchain.blockchain import LogementBlockchain
+from conftest import make_listing, sign, signed_blocks
+
+
+@pytest.fixture
+def archived_chain(poa_chain, validator_keys, tmp_path):
+   """PoA chain of 10 blocks whose first 8 bodies are archived in files of 4 blocks."""
+   poa_chain.enable_archive(str(tmp_path / "archive"), depth=2, segment_size=4)
+   poa_chain.append_segment(signed_blocks(poa_chain, validator_keys[0], 9))
+   return poa_chain
+
+
+def test_archive_round_trip(poa_chain, validator_keys, tmp_path):
+   blocks = [poa_chain.chain[0]] + signed_blocks(poa_chain, validator_keys[0], 7)
+   archive = BlockArchive(str(tmp_path), segment_size=8, chunk_size=3, cache_size=1)
+   archive.write(blocks)
+
+   assert [block.hash for block in archive.read(0)] == [block.hash for block in blocks]
+   for block in reversed(blocks):
+      assert archive.load_transactions(block.index) == block.transactions
+   assert archive.verify(blocks)
+   with pytest.raises(ValueError):
+      archive.write(blocks[1:])
+
+
+def test_archived_bodies_load_on_demand(archived_chain):
+   assert archived_chain.archived_height == 8
+   assert [block.is_archived for block in archived_chain.chain] == [True] * 8 + [False] * 2
+   assert archived_chain.get_block(5)['transactions'][0]['title'] == "Logement 5"
+   assert archived_chain.get_listing(5)['transaction']['title'] == "Logement 5"
+   assert archived_chain.verify_archive()
+   assert LogementBlockchain.validate_chain(archived_chain.get_chain_data())
+
+
+def test_verify_archive_detects_tampered_files(archived_chain, validator_keys, tmp_path):
+   other = LogementBlockchain(consensus_type='poa')
+   other.add_validator(validator_keys[1])
+   other.append_segment(signed_blocks(other, validator_keys[0], 7))
+   # Same heights, different blocks.
+   archived_chain.archive.write(other.chain[4:8])
+   assert not archived_chain.verify_archive()
+
+   with open(archived_chain.archive.path_for(0), 'r+b') as f:
+      f.truncate(20)
+   assert not archived_chain.verify_archive()
+
+
+def test_reorg_rewrites_archived_heights_above_the_fork(archived_chain, validator_keys):
+   theirs = archived_chain.chain[:6]
+   for height in range(6, 12):
+      theirs.append(sign(archived_chain, validator_keys[0], theirs[-1], [make_listing(f"Fork {height}")]))
+   # Loads the old chunk holding heights 4-7 into the cache.
+   assert archived_chain.chain[6].transactions[0]['title'] == "Logement 6"
+
+   assert archived_chain.replace_chain(theirs)
+
+   assert len(archived_chain.chain) == 12
+   assert archived_chain.archived_height == 8
+   assert archived_chain.verify_archive()
+   for height in range(4, 8):
+      block = archived_chain.chain[height]
+      assert block.is_archived and block.hash == theirs[height].hash
+   assert [archived_chain.chain[height].transactions[0]['title'] for height in range(5, 8)] == \
+      ["Logement 5", "Fork 6", "Fork 7"]
+   assert LogementBlockchain.validate_chain(archived_chain.get_chain_data())
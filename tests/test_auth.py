@@ -0,0 +1,42 @@
+from api.services.blockchain_service import OPERATOR, BlockchainService
+
+
+def test_operator_token_administers_but_cannot_sign(validator_keys):
+   service = BlockchainService()
+   token = service.add_operator_token()
+
+   assert service.authenticate_operator(token) == OPERATOR
+   assert service.authenticate_authority(token) is None
+   assert service.authenticate_operator("wrong") is None
+   assert service.authenticate_operator(None) is None
+
+
+def test_authority_token_is_bound_to_a_loaded_key(validator_keys):
+   service = BlockchainService()
+   token = service.load_validator_key_pem(validator_keys[0])
+
+   assert service.authenticate_authority(token) == validator_keys[1]
+   assert service.authenticate_operator(token) == validator_keys[1]
+
+
+def test_trusted_validator_is_authorized_without_its_key(validator_keys, tmp_path):
+   service = BlockchainService()
+   key_file = tmp_path / "validator_public.pem"
+   key_file.write_text(validator_keys[1])
+
+   service.load_trusted_validator(str(key_file))
+   assert validator_keys[1] in service.blockchain.get_validators()
+   assert service.signer.validators == []
+
+
+def test_network_writes_require_a_token():
+   from fastapi import FastAPI
+   from fastapi.testclient import TestClient
+   from api.routes.network import network_router
+
+   app = FastAPI()
+   app.include_router(network_router, prefix="/network")
+   client = TestClient(app)
+
+   assert client.post("/network/sync").status_code == 401
+   assert client.post("/network/peers", data={"url": "http://127.0.0.1:9"}).status_code == 401
@@ -0,0 +1,56 @@
+import asyncio
+import json
+import httpx
+import pytest
+from fastapi import FastAPI
+from api.routes.blockchain import _bulk_transaction, blockchain_router
+
+
+def line(**fields):
+   item = {"owner": "owner_1", "title": "Riad", "description": "Riad au centre", "price": 450, **fields}
+   return json.dumps(item).encode()
+
+
+def test_accepts_optional_fields():
+   tx = _bulk_transaction(line(type="riad", location="Marrakech", maxGuests=4))
+
+   assert (tx["type"], tx["location"], tx["maxGuests"]) == ("riad", "Marrakech", 4)
+   assert tx["price"] == 450.0 and tx["status"] == "pending"
+
+
+@pytest.mark.parametrize("fields", [
+   {"type": ["a"]},
+   {"type": {"name": "riad"}},
+   {"location": 12},
+   {"location": None},
+   {"maxGuests": True},
+   {"maxGuests": -1},
+   {"maxGuests": 2.5},
+   {"maxGuests": "4"},
+   {"price": "450"},
+   {"title": ""},
+])
+def test_rejects_invalid_fields(fields):
+   with pytest.raises(ValueError):
+      _bulk_transaction(line(**fields))
+
+
+def test_rejects_bad_lines_and_keeps_going():
+   app = FastAPI()
+   app.include_router(blockchain_router, prefix="/blockchain")
+   body = b"\n".join([
+      line(title="Riad bulk 1", type="riad"),
+      line(title="Riad bulk 2", type=["riad"]),
+      b"not json",
+      line(title="Riad bulk 3", maxGuests=3),
+   ])
+
+   async def upload():
+      transport = httpx.ASGITransport(app=app)
+      async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+         response = await client.post("/blockchain/submit_bulk", content=body)
+         return [json.loads(result) for result in response.text.splitlines()]
+
+   results = asyncio.run(upload())
+   assert [result["status"] for result in results] == ["accepted", "rejected", "rejected", "accepted"]
+   assert results[1]["error"] == "invalid 'type'"
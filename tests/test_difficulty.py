@@ -0,0 +1,91 @@
+import pytest
+from blockchain.block import Block
+from blockchain.blockchain import LogementBlockchain
+from blockchain.difficulty import MAX_ADJUSTMENT, from_leading_zeros, meets_target, next_difficulty, target_for
+
+
+def retarget(spacing, window=4, previous=8.0, target_block_time=60):
+   return next_difficulty(2 * window, lambda height: height * spacing, lambda height: previous, 1.0,
+                          target_block_time, window)
+
+
+def test_leading_zeros_map_to_exact_targets():
+   assert target_for(from_leading_zeros(2)) == int("00" + "f" * 62, 16)
+   assert meets_target("00" + "f" * 62, from_leading_zeros(2))
+   assert not meets_target("01" + "0" * 62, from_leading_zeros(2))
+   assert not meets_target("not hex", 1.0)
+
+
+def test_difficulty_only_moves_at_window_boundaries():
+   fixed = next_difficulty(8, lambda height: 0, lambda height: 5.0, 1.0, None, 4)
+   assert fixed == 1.0
+   # Between retargets the previous block's difficulty carries over.
+   assert next_difficulty(6, lambda height: height, lambda height: 5.0, 1.0, 60, 4) == 5.0
+   # The first window would include genesis, whose timestamp is fixed.
+   assert next_difficulty(4, lambda height: height, lambda height: 5.0, 1.0, 60, 4) == 5.0
+   assert next_difficulty(7, lambda height: height, lambda height: None, 1.0, 60, 4) == 1.0
+
+
+@pytest.mark.parametrize("spacing, expected", [
+   (60, 8.0),
+   (30, 16.0),
+   (120, 4.0),
+   (1, 8.0 * MAX_ADJUSTMENT),
+   (0, 8.0 * MAX_ADJUSTMENT),
+   (10000, 8.0 / MAX_ADJUSTMENT),
+])
+def test_retarget_follows_block_time_within_bounds(spacing, expected):
+   assert retarget(spacing) == expected
+
+
+def test_difficulty_never_drops_below_one():
+   assert retarget(10000, previous=1.5) == 1.0
+
+
+def mine(blockchain, timestamp, title):
+   previous = blockchain.last_block
+   block = Block(previous.index + 1, [{"from": "owner_1", "title": title, "price": 100.0, "status": "validated"}],
+                 timestamp, previous.hash)
+   block.hash = blockchain.proof_of_work(block)
+   return block
+
+
+def test_chain_enforces_the_retargeted_difficulty():
+   blockchain = LogementBlockchain(consensus_type='pow', difficulty=0, target_block_time=60, retarget_window=4)
+   start = blockchain.last_block.timestamp
+   for height in range(1, 8):
+      block = mine(blockchain, start + height, f"Logement {height}")
+      assert block.difficulty == 1.0
+      assert blockchain.add_block(block, block.hash)
+
+   # Blocks 4 to 7 took three seconds instead of three minutes: the maximum increase applies.
+   assert blockchain.next_difficulty() == MAX_ADJUSTMENT
+   block = mine(blockchain, start + 8, "Logement 8")
+   assert block.difficulty == MAX_ADJUSTMENT
+
+   understated = Block.from_dict(dict(block.to_dict(), difficulty=1.0))
+   understated.hash = understated.compute_hash()
+   assert not blockchain.add_block(understated, understated.hash)
+   weak = Block.from_dict(block.to_dict())
+   while meets_target(weak.compute_hash(), MAX_ADJUSTMENT):
+      weak.nonce += 1
+   assert not blockchain.add_block(weak, weak.compute_hash())
+   assert blockchain.add_block(block, block.hash)
+
+
+def test_segment_retargets_across_pending_blocks():
+   source = LogementBlockchain(consensus_type='pow', difficulty=0, target_block_time=60, retarget_window=4)
+   start = source.last_block.timestamp
+   for height in range(1, 11):
+      block = mine(source, start + height, f"Logement {height}")
+      source.add_block(block, block.hash)
+
+   follower = LogementBlockchain(consensus_type='pow', difficulty=0, target_block_time=60, retarget_window=4)
+   assert follower.append_segment(source.chain[1:]) == 10
+   assert [block.difficulty for block in follower.chain[1:]] == [1.0] * 7 + [MAX_ADJUSTMENT] * 3
+
+   tampered = [block.to_dict() for block in source.chain[1:]]
+   tampered[7]['difficulty'] = 1.0
+   with pytest.raises(ValueError):
+      LogementBlockchain(consensus_type='pow', difficulty=0, target_block_time=60,
+                         retarget_window=4).append_segment(tampered)
@@ -0,0 +1,25 @@
+from conftest import make_listing, sign
+
+
+def test_exact_check_uses_owner_listings(poa_chain, validator_keys, monkeypatch):
+   sealed = make_listing("Villa Anfa", owner="owner_1")
+   poa_chain.append_segment([sign(poa_chain, validator_keys[0], poa_chain.last_block, [sealed])])
+   poa_chain.add_new_transaction(make_listing("Studio Maarif", owner="owner_2"))
+
+   def full_scan():
+      raise AssertionError("exact check scanned the whole chain")
+   monkeypatch.setattr(poa_chain, "_iter_listing_fingerprints", full_scan)
+
+   assert poa_chain.is_duplicate_listing(make_listing("villa  anfa", owner="owner_1"))
+   assert poa_chain.is_duplicate_listing(make_listing("Studio Maarif", owner="owner_2"))
+   assert not poa_chain.is_duplicate_listing(make_listing("Villa Anfa", owner="owner_3"))
+   assert poa_chain.duplicate_stats['rejected'] == 2
+
+
+def test_owner_is_compared_exactly(poa_chain):
+   poa_chain.add_new_transaction(make_listing("Villa Anfa", owner="owner_1"))
+
+   # Same listing under another account: not a duplicate, and not even a filter positive.
+   assert not poa_chain.is_duplicate_listing(make_listing("Villa Anfa", owner="Owner_1"))
+   assert poa_chain.duplicate_stats['filter_positives'] == 0
+   assert poa_chain.is_duplicate_listing(make_listing("VILLA ANFA", owner="owner_1"))
@@ -0,0 +1,48 @@
+import json
+from api.services.blockchain_service import blockchain_service
+from api.services.event_service import _on_block, event_broker
+from blockchain.blockchain import LogementBlockchain
+from network.node import Node
+from conftest import ChainPeer, signed_blocks
+
+
+def published_since(sequence, event_type):
+   events = []
+   for number, frame in event_broker.history:
+      _, event, data = frame.strip().split("\n")
+      if number > sequence and event == f"event: {event_type}":
+         events.append(json.loads(data[len("data: "):]))
+   return events
+
+
+def listen(monkeypatch, blockchain):
+   monkeypatch.setattr(blockchain_service, "blockchain", blockchain)
+   blockchain.add_listener('block', _on_block)
+   return event_broker.sequence
+
+
+def test_segment_events_carry_each_block_listing_id(poa_chain, validator_keys, monkeypatch):
+   poa_chain.append_segment(signed_blocks(poa_chain, validator_keys[0], 1))
+   sequence = listen(monkeypatch, poa_chain)
+
+   poa_chain.append_segment(signed_blocks(poa_chain, validator_keys[0], 3))
+
+   validated = published_since(sequence, "tx_validated")
+   assert [(event['block'], event['listing_id']) for event in validated] == [(2, 2), (3, 3), (4, 4)]
+   added = published_since(sequence, "block_added")
+   assert [(event['total_blocks'], event['validated_transactions']) for event in added] == [(3, 2), (4, 3), (5, 4)]
+
+
+def test_synced_blocks_carry_each_block_listing_id(poa_chain, validator_keys, monkeypatch):
+   source = LogementBlockchain(consensus_type='poa')
+   source.add_validator(validator_keys[1])
+   source.append_segment(signed_blocks(source, validator_keys[0], 4))
+   sequence = listen(monkeypatch, poa_chain)
+
+   node = Node(poa_chain, url="http://self.example")
+   node.add_peer(ChainPeer(source))
+   assert node.sync() == 4
+
+   validated = published_since(sequence, "tx_validated")
+   assert [event['listing_id'] for event in validated] == [1, 2, 3, 4]
+   assert [event['title'] for event in validated] == [block.transactions[0]['title'] for block in source.chain[1:]]
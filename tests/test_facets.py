@@ -0,0 +1,14 @@
+from blockchain.facets import FacetIndex
+from blockchain.listing_store import DEFAULT_LOCATION, DEFAULT_TYPE
+
+
+def test_unusable_field_values_fall_back_to_defaults():
+   facets = FacetIndex()
+   facets.add(0, {"price": 300.0, "type": "riad", "location": "Fès", "maxGuests": 2})
+   facets.add(1, {"price": 10 ** 400, "type": ["a"], "location": {"city": "Fès"}, "maxGuests": float("inf")})
+
+   rows, counts = facets.query({"type": DEFAULT_TYPE})
+   assert rows.tolist() == [1]
+   assert counts["type"] == {"riad": 1, DEFAULT_TYPE: 1}
+   assert counts["location"] == {"Fès": 0, DEFAULT_LOCATION: 1}
+   assert counts["guests"] == {"1-2": 0, "3-4": 1}
@@ -0,0 +1,70 @@
+import json
+import os
+from crypto import KeyManager
+
+
+def test_export_does_not_hide_a_key_added_elsewhere(tmp_path):
+   manager = KeyManager(str(tmp_path), refresh_interval=3600)
+   manager.refresh()
+   key_id, _, _ = KeyManager(str(tmp_path)).save_key_pair(*manager.generate_key_pair()[:2])
+
+   # The export runs before the refresh interval elapsed, so it skips the scan.
+   manager.export_public_keys()
+
+   assert manager.refresh() == ([key_id], [])
+   assert manager.get_public_key(key_id) is not None
+
+
+def test_export_does_not_hide_a_removed_key(tmp_path):
+   manager = KeyManager(str(tmp_path), refresh_interval=3600)
+   key_id, _, public_path = manager.save_key_pair(*manager.generate_key_pair()[:2])
+   manager.refresh()
+   os.remove(public_path)
+
+   manager.export_public_keys()
+
+   assert manager.refresh() == ([], [key_id])
+   assert manager.get_public_key(key_id) is None
+
+
+def test_export_alone_does_not_trigger_a_rescan(tmp_path):
+   manager = KeyManager(str(tmp_path), refresh_interval=3600)
+   private_pem, public_pem, key_id = manager.generate_key_pair()
+   manager.save_key_pair(private_pem, public_pem)
+   manager.refresh()
+
+   path = manager.export_public_keys()
+
+   with open(path) as f:
+      assert json.load(f) == {key_id: public_pem}
+   assert manager._directory_mtime == os.stat(str(tmp_path)).st_mtime_ns
+   assert manager.refresh() == ([], [])
+
+
+def test_provisioning_writes_one_manifest_line_per_key(tmp_path):
+   manager = KeyManager(str(tmp_path))
+   progress = []
+
+   entries = manager.provision_keys(3, key_size=1024, workers=1, batch_size=2,
+                                    progress=lambda done, count: progress.append(done))
+
+   assert progress == [2, 3]
+   assert len({entry['key_id'] for entry in entries}) == 3
+   assert manager.read_manifest() == entries
+   assert set(manager.load_all_public_keys()) == {entry['key_id'] for entry in entries}
+
+
+def test_provisioning_resumes_after_a_partial_line(tmp_path):
+   manager = KeyManager(str(tmp_path))
+   first = manager.provision_keys(2, key_size=1024, workers=1)
+   manifest_path = os.path.join(str(tmp_path), 'provisioning_manifest.jsonl')
+   with open(manifest_path, 'a') as f:
+      f.write('{"key_id": "cut sho')
+
+   entries = manager.provision_keys(4, key_size=1024, workers=1)
+
+   assert entries[:2] == first
+   assert manager.read_manifest() == entries
+   with open(manifest_path) as f:
+      assert [json.loads(line) for line in f] == entries
+   assert manager.provision_keys(4, key_size=1024, workers=1) == entries
@@ -0,0 +1,100 @@
+import pytest
+from blockchain.block import Block
+from blockchain.blockchain import LogementBlockchain
+from blockchain.difficulty import meets_target
+from blockchain.light_client import LightClient
+from blockchain.merkle import transaction_id
+from conftest import make_listing, sign, signed_blocks
+
+
+def light_client(blockchain, trusted, **options):
+   return LightClient(blockchain.get_headers, blockchain.get_block, trusted_validators=trusted, **options)
+
+
+def test_sync_in_batches_and_resume(poa_chain, validator_keys):
+   poa_chain.append_segment(signed_blocks(poa_chain, validator_keys[0], 7))
+   client = light_client(poa_chain, {validator_keys[1]}, batch_size=3)
+
+   assert client.sync() == 8
+   assert client.height == 7 and client.tip['hash'] == poa_chain.last_block.hash
+   assert client.sync() == 0
+   poa_chain.append_segment(signed_blocks(poa_chain, validator_keys[0], 2))
+   assert client.sync() == 2
+   assert client.height == 9
+   with pytest.raises(ValueError, match="genesis"):
+      client.validate_header(poa_chain.get_headers(1, 2)[0], None)
+
+
+def test_untrusted_validator_stops_sync(poa_chain, validator_keys):
+   poa_chain.append_segment(signed_blocks(poa_chain, validator_keys[0], 3))
+   client = light_client(poa_chain, {"untrusted"})
+
+   with pytest.raises(PermissionError):
+      client.sync()
+   # Only the genesis header was accepted; nothing unvalidated is kept.
+   assert client.height == 0
+
+
+@pytest.mark.parametrize("field, value", [
+   ("hash", "0" * 64),
+   ("previous_hash", "0" * 64),
+   ("index", 5),
+   ("signature", None),
+])
+def test_tampered_headers_are_rejected(poa_chain, validator_keys, field, value):
+   poa_chain.append_segment(signed_blocks(poa_chain, validator_keys[0], 2))
+   client = light_client(poa_chain, {validator_keys[1]})
+   genesis, first, second = poa_chain.get_headers(0, 3)
+   client.validate_header(genesis, None)
+   client.validate_header(first, genesis)
+
+   tampered = dict(second, **{field: value})
+   if field != "hash":
+      tampered['hash'] = Block.hash_header(tampered)
+   with pytest.raises(ValueError):
+      client.validate_header(tampered, first)
+
+
+def test_bodies_and_proofs_are_checked_against_headers(poa_chain, validator_keys):
+   listings = [dict(tx, tx_id=transaction_id(tx)) for tx in (make_listing("Riad"), make_listing("Villa"))]
+   poa_chain.append_segment([sign(poa_chain, validator_keys[0], poa_chain.last_block, listings)])
+   client = light_client(poa_chain, {validator_keys[1]})
+   client.sync()
+
+   assert [tx['title'] for tx in client.get_transactions(1)] == ["Riad", "Villa"]
+   proof = poa_chain.get_transaction_proof(listings[1]['tx_id'])
+   assert client.verify_proof(proof)
+   assert not client.verify_proof(dict(proof, transaction=dict(proof['transaction'], price=1.0)))
+   assert not client.verify_proof(dict(proof, header=dict(proof['header'], index=2)))
+
+   client.fetch_block = lambda index: dict(poa_chain.get_block(index), transactions=listings[:1])
+   with pytest.raises(ValueError):
+      client.get_transactions(1)
+   with pytest.raises(ValueError):
+      client.get_transactions(2)
+
+
+def test_pow_headers_must_meet_their_difficulty():
+   blockchain = LogementBlockchain(consensus_type='pow', difficulty=1, target_block_time=60, retarget_window=4)
+   for height in range(1, 4):
+      block = Block(height, [make_listing(f"Logement {height}", status="validated")],
+                    blockchain.last_block.timestamp + 60, blockchain.last_block.hash)
+      block.hash = blockchain.proof_of_work(block)
+      assert blockchain.add_block(block, block.hash)
+   client = light_client(blockchain, None, consensus_type='pow', difficulty=1, target_block_time=60,
+                         retarget_window=4)
+   assert client.sync() == 4
+
+   header = blockchain.last_block.get_header()
+   weak = dict(header, index=4, previous_hash=header['hash'], nonce=0)
+   while meets_target(Block.hash_header(weak), weak['difficulty']):
+      weak['nonce'] += 1
+   weak['hash'] = Block.hash_header(weak)
+   with pytest.raises(ValueError):
+      client.validate_header(weak, client.tip)
+
+   # Easier than the schedule allows, even though the hash meets it.
+   easy = dict(weak, difficulty=1.0, nonce=0)
+   easy['hash'] = Block.hash_header(easy)
+   with pytest.raises(ValueError, match="expected"):
+      client.validate_header(easy, client.tip)
@@ -0,0 +1,15 @@
+from blockchain.listing_store import DEFAULT_LOCATION, DEFAULT_MAX_GUESTS, DEFAULT_TYPE, ListingStore
+
+
+def test_unusable_field_values_fall_back_to_defaults():
+   store = ListingStore()
+   store.append({"price": 300.0, "type": "riad", "location": "Fès", "maxGuests": 2, "timestamp": 1.7e9}, 1, 0)
+   row = store.append({
+      "price": 10 ** 400, "type": ["a"], "location": {"city": "Fès"}, "maxGuests": 10 ** 12, "timestamp": "hier"
+   }, 1, 1)
+
+   assert row == 1
+   assert store.filter(type=DEFAULT_TYPE, location=DEFAULT_LOCATION).tolist() == [False, True]
+   assert store.column('max_guests')[row] == DEFAULT_MAX_GUESTS
+   assert store.column('timestamp')[row] == 0.0
+   assert store.filter(type="riad").tolist() == [True, False]
@@ -0,0 +1,42 @@
+import pytest
+from blockchain.merkle import merkle_proof, merkle_root, transaction_id, verify_inclusion_proof, verify_merkle_proof
+from conftest import make_listing, sign
+
+
+def listings(count):
+   return [make_listing(f"Logement {i}", owner=f"owner_{i}") for i in range(count)]
+
+
+@pytest.mark.parametrize("count", [1, 2, 3, 5, 8])
+def test_every_position_proves_inclusion(count):
+   transactions = listings(count)
+   root = merkle_root(transactions)
+
+   for position, tx in enumerate(transactions):
+      assert verify_merkle_proof(tx, merkle_proof(transactions, position), root)
+
+
+def test_proof_rejects_other_transaction_or_root():
+   transactions = listings(5)
+   root = merkle_root(transactions)
+   path = merkle_proof(transactions, 2)
+
+   assert not verify_merkle_proof(dict(transactions[2], price=1.0), path, root)
+   assert not verify_merkle_proof(transactions[3], path, root)
+   assert not verify_merkle_proof(transactions[2], path, merkle_root(listings(4)))
+   with pytest.raises(IndexError):
+      merkle_proof(transactions, 5)
+
+
+def test_transaction_proof_verifies_offline(poa_chain, validator_keys):
+   transactions = [dict(tx, status="validated", tx_id=transaction_id(tx)) for tx in listings(3)]
+   poa_chain.append_segment([sign(poa_chain, validator_keys[0], poa_chain.last_block, transactions)])
+
+   proof = poa_chain.get_transaction_proof(transactions[1]['tx_id'])
+   assert proof['position'] == 1
+   assert verify_inclusion_proof(proof, trusted_validators={validator_keys[1]})
+   assert not verify_inclusion_proof(proof, trusted_validators={"untrusted"})
+
+   tampered = dict(proof, transaction=dict(proof['transaction'], price=1.0))
+   assert not verify_inclusion_proof(tampered)
+   assert poa_chain.get_transaction_proof("unknown") is None
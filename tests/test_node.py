@@ -0,0 +1,32 @@
+from network.node import Node
+
+
+class BrokenPeer:
+   url = "http://broken.example"
+
+   def get_status(self):
+      raise RuntimeError("unexpected response")
+
+
+class GarbagePeer:
+   url = "http://garbage.example"
+
+   def get_status(self):
+      return ["not", "a", "status"]
+
+
+def test_sync_skips_misbehaving_peers(poa_chain):
+   node = Node(poa_chain, url="http://self.example")
+   node.add_peer(BrokenPeer())
+   node.add_peer(GarbagePeer())
+
+   assert node.sync() == 0
+   assert node.status()['height'] == 0
+
+
+def test_announcement_with_invalid_index_is_rejected(poa_chain):
+   node = Node(poa_chain, url="http://self.example")
+   genesis = poa_chain.chain[0].to_dict()
+
+   for index in (-1, 0, -len(poa_chain.chain) - 5):
+      assert node.handle_announcement(dict(genesis, index=index)) == 'rejected'
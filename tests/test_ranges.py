@@ -0,0 +1,11 @@
+from conftest import signed_blocks
+
+
+def test_iter_blocks_and_get_headers_share_exclusive_end(poa_chain, validator_keys):
+   for block in signed_blocks(poa_chain, validator_keys[0], 4):
+      poa_chain.append_segment([block])
+
+   assert [header['index'] for header in poa_chain.get_headers(1, 3)] == [1, 2]
+   assert [block['index'] for block in poa_chain.iter_blocks(1, 3)] == [1, 2]
+   assert [block['index'] for block in poa_chain.iter_blocks(3, headers_only=True)] == [3, 4]
+   assert list(poa_chain.iter_blocks(2, 2)) == poa_chain.get_headers(2, 2) == []
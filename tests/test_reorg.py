@@ -0,0 +1,51 @@
+from blockchain.merkle import transaction_id
+from conftest import make_listing, sign
+
+
+def listing(title):
+   tx = make_listing(title)
+   tx['tx_id'] = transaction_id(tx)
+   return tx
+
+
+def test_reorg_requeues_orphaned_transactions(poa_chain, validator_keys):
+   private_pem = validator_keys[0]
+   a, b, c, d = (listing(f"Logement {name}") for name in "abcd")
+   first = sign(poa_chain, private_pem, poa_chain.last_block, [a])
+   ours = sign(poa_chain, private_pem, first, [b, c])
+   assert poa_chain.append_segment([first, ours]) == 2
+   queued = listing("Logement en attente")
+   poa_chain.add_new_transaction(queued)
+
+   theirs = sign(poa_chain, private_pem, first, [c])
+   tip = sign(poa_chain, private_pem, theirs, [d])
+   assert poa_chain.replace_chain([poa_chain.chain[0], first, theirs, tip])
+
+   assert poa_chain.last_block.hash == tip.hash
+   pending = poa_chain.unconfirmed_transactions
+   assert [tx['tx_id'] for tx in pending] == [b['tx_id'], queued['tx_id']]
+   assert pending[0]['status'] == 'pending'
+   # The orphan is pending again, so resubmitting it is a duplicate.
+   assert poa_chain.is_duplicate_listing(b)
+
+
+def test_reorg_keeps_bookings_on_their_listing(poa_chain, validator_keys):
+   private_pem = validator_keys[0]
+   a, b, c, d = (listing(f"Logement {name}") for name in "abcd")
+   first = sign(poa_chain, private_pem, poa_chain.last_block, [a])
+   ours = sign(poa_chain, private_pem, first, [b, c])
+   poa_chain.append_segment([first, ours])
+   booking = {"user": "Amina", "email": "amina@example.com", "start_date": "2030-01-01", "end_date": "2030-01-05"}
+   assert poa_chain.get_listing(3)['transaction']['title'] == c['title']
+   poa_chain.add_booking(3, booking)
+
+   theirs = sign(poa_chain, private_pem, first, [c])
+   tip = sign(poa_chain, private_pem, theirs, [d])
+   assert poa_chain.replace_chain([poa_chain.chain[0], first, theirs, tip])
+
+   # Listing c moved from ID 3 to ID 2; its booking moved with it.
+   assert poa_chain.get_listing(2)['transaction']['title'] == c['title']
+   assert poa_chain.get_bookings(2) == [booking]
+   assert poa_chain.get_bookings(3) == []
+   total, page, _ = poa_chain.get_listing_facets({'availability': 'booked'})
+   assert total == 1 and page[0][0] == 2
@@ -0,0 +1,68 @@
+import pytest
+from blockchain.search_index import TextIndex, normalize_token, tokenize
+from conftest import make_listing, sign
+
+
+@pytest.mark.parametrize("variants", [
+   ("Marrakech", "Marrakesh", "MARRAKECH"),
+   ("souk", "souq", "Souk"),
+   ("Fès", "Fez", "fes"),
+   ("Oujda", "Ujda"),
+   ("Séjour", "sejour", "SÉJOUR"),
+])
+def test_spelling_variants_share_a_token(variants):
+   assert len({normalize_token(word) for word in variants}) == 1
+
+
+def test_tokenize_drops_stopwords_and_apostrophes():
+   assert tokenize("Riad avec la vue sur le souq") == ["riad", "vue", "suk"]
+   assert tokenize("Dar Ma’ʿrifa") == tokenize("Dar Marifa")
+   assert tokenize(None) == tokenize("") == []
+
+
+def test_title_matches_rank_above_description_matches():
+   index = TextIndex()
+   index.add(1, "Appartement lumineux", "Proche de la plage")
+   index.add(2, "Plage privée", "Appartement lumineux")
+   index.add(3, "Studio calme", "Centre ville")
+
+   assert [doc_id for doc_id, _ in index.search("plage")] == [2, 1]
+
+
+def test_rare_terms_weigh_more():
+   index = TextIndex()
+   for doc_id in range(1, 5):
+      index.add(doc_id, "Appartement", "Centre ville")
+   index.add(5, "Appartement piscine", "Centre ville")
+
+   ranked = index.search("appartement piscine")
+   assert ranked[0][0] == 5
+   assert len(ranked) == 5
+   # The common term alone barely separates documents of equal length.
+   assert ranked[0][1] > 2 * ranked[1][1]
+
+
+def test_documents_are_indexed_once():
+   index = TextIndex()
+   index.add(1, "Riad", "Médina")
+   index.add(1, "Riad", "Médina")
+
+   assert len(index) == 1
+   assert index.total_length == 3.0
+   assert index.search("la et de") == []
+
+
+def test_chain_search_ranks_and_filters(poa_chain, validator_keys):
+   listings = [
+      make_listing("Riad Marrakesh", location="Marrakech", type="maison"),
+      make_listing("Villa Agadir", description="A une heure de Marrakech", location="Agadir", type="villa"),
+      make_listing("Studio Fès", location="Fès", type="appartement"),
+   ]
+   poa_chain.append_segment([sign(poa_chain, validator_keys[0], poa_chain.last_block, listings)])
+
+   total, page = poa_chain.search_listings("marrakech")
+   assert total == 2
+   assert [listing_id for listing_id, _ in page] == [1, 2]
+   total, page = poa_chain.search_listings("marrakech", type="villa")
+   assert [listing_id for listing_id, _ in page] == [2]
+   assert poa_chain.search_listings("Fez")[0] == 1
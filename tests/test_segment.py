@@ -0,0 +1,68 @@
+import time
+import pytest
+from crypto import KeyManager
+from blockchain.block import Block
+from blockchain.blockchain import LogementBlockchain
+from conftest import make_listing, signed_blocks
+
+
+def test_appends_signed_segment(poa_chain, validator_keys):
+   blocks = signed_blocks(poa_chain, validator_keys[0], 3)
+
+   assert poa_chain.append_segment([block.to_dict() for block in blocks]) == 3
+   assert poa_chain.last_block.hash == blocks[-1].hash
+   # Blocks we already hold are skipped.
+   assert poa_chain.append_segment(blocks) == 0
+
+
+def test_rejects_unsigned_pow_block(poa_chain):
+   block = Block(1, [make_listing("Logement PoW", status="validated")], time.time(), poa_chain.last_block.hash)
+   block.hash = LogementBlockchain(consensus_type='pow', difficulty=poa_chain.difficulty).proof_of_work(block)
+
+   with pytest.raises(ValueError):
+      poa_chain.append_segment([block])
+   assert not poa_chain.add_block(block, block.hash)
+   assert len(poa_chain.chain) == 1
+
+
+def test_rejects_tampered_block(poa_chain, validator_keys):
+   segment = [block.to_dict() for block in signed_blocks(poa_chain, validator_keys[0], 2)]
+   segment[1]['transactions'][0]['price'] = 1.0
+
+   with pytest.raises(ValueError):
+      poa_chain.append_segment(segment)
+   # Nothing is appended when any block of the segment is invalid.
+   assert len(poa_chain.chain) == 1
+
+
+def test_rejects_unauthorized_validator(poa_chain, tmp_path):
+   other_private, other_public, _ = KeyManager(str(tmp_path)).generate_key_pair()
+   outsider = LogementBlockchain(consensus_type='poa')
+   outsider.add_validator(other_public)
+   blocks = signed_blocks(outsider, other_private, 1, start=poa_chain.last_block)
+
+   with pytest.raises(PermissionError):
+      poa_chain.append_segment(blocks)
+   assert len(poa_chain.chain) == 1
+
+
+def test_index_failure_leaves_chain_unchanged(poa_chain, validator_keys):
+   poa_chain.append_segment(signed_blocks(poa_chain, validator_keys[0], 1))
+   blocks = signed_blocks(poa_chain, validator_keys[0], 2)
+   calls = []
+
+   def failing_add(row, tx):
+      calls.append(row)
+      if len(calls) == 2:
+         raise TypeError("unhashable type: 'list'")
+   poa_chain.facet_index.add = failing_add
+
+   transaction_count = poa_chain.transaction_count
+   with pytest.raises(ValueError):
+      poa_chain.append_segment(blocks)
+   assert len(poa_chain.chain) == 2
+   assert len(poa_chain.listing_store) == 1
+   assert poa_chain.transaction_count == transaction_count
+   # Indexes were rebuilt, so the chain accepts the same blocks once indexing works.
+   assert poa_chain.append_segment(blocks) == 2
+   assert len(poa_chain.listing_store) == 3
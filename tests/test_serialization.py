@@ -0,0 +1,81 @@
+import zlib
+import pytest
+from blockchain.block import Block
+from blockchain.serialization import MAGIC, SEGMENT_ZLIB, _write_varint, decode_blocks, decode_segment, encode_blocks
+
+
+def make_blocks(count):
+   blocks = []
+   previous_hash = "0" * 64
+   for index in range(count):
+      block = Block(index, [{"from": f"owner_{index}", "title": f"Logement {index}", "price": 100.0 + index}],
+                    1.7e9 + index, previous_hash)
+      block.hash = block.compute_hash()
+      previous_hash = block.hash
+      blocks.append(block)
+   return blocks
+
+
+def assorted_blocks():
+   """Blocks exercising every value tag and the raw/string encodings of hashes and signatures."""
+   genesis, = make_blocks(1)
+   values = {
+      "from": "owner_1", "title": "Riad", "price": 450.0, "maxGuests": 4, "negative": -7, "big": 10 ** 30,
+      "flag": True, "off": False, "missing": None, "tags": ["riad", {"nested": [1.5, "x"]}], "location": "Fès"
+   }
+   signed = Block(1, [values, dict(values, title="Riad 2")], 1.7e9, genesis.hash, nonce=12,
+                  validator="-----BEGIN PUBLIC KEY-----\nabc\n-----END PUBLIC KEY-----\n",
+                  signature="c2lnbmF0dXJl", difficulty=256.0)
+   signed.hash = signed.compute_hash()
+   # Values that cannot use the compact raw encodings.
+   odd = Block(2, [], 1700000000, "not-a-hex-hash", signature="not base64!")
+   odd.hash = "ABCDEF"
+   return [genesis, signed, odd]
+
+
+@pytest.mark.parametrize("compression", [None, 'zlib'])
+@pytest.mark.parametrize("segment_size", [1, 2, 256])
+def test_round_trip(compression, segment_size):
+   blocks = assorted_blocks()
+   decoded = decode_blocks(encode_blocks(blocks, compression=compression, segment_size=segment_size))
+
+   assert [block.to_dict() for block in decoded] == [block.to_dict() for block in blocks]
+   assert decoded[1].compute_hash() == blocks[1].hash
+   assert isinstance(decoded[2].timestamp, int)
+
+
+def zlib_segment(payload):
+   compressed = zlib.compress(payload)
+   header = bytearray([SEGMENT_ZLIB])
+   _write_varint(header, len(compressed))
+   return bytes(header) + compressed
+
+
+def test_rejects_decompression_bomb():
+   data = MAGIC + zlib_segment(b"\0" * (4 * 1024 * 1024))
+
+   with pytest.raises(ValueError):
+      decode_segment(data, len(MAGIC), max_size=1024 * 1024)
+   with pytest.raises(ValueError):
+      decode_blocks(data, max_size=1024 * 1024)
+
+
+def test_total_decoded_size_is_bounded():
+   data = encode_blocks(make_blocks(20), compression='zlib', segment_size=5)
+
+   # Each segment fits the budget on its own; all four together do not.
+   assert len(decode_segment(data, len(MAGIC), max_size=1024)[0]) == 5
+   assert len(decode_blocks(data)) == 20
+   with pytest.raises(ValueError):
+      decode_blocks(data, max_size=1024)
+
+
+@pytest.mark.parametrize("compression", [None, 'zlib'])
+def test_corrupt_data_raises_value_error(compression):
+   data = encode_blocks(make_blocks(3), compression=compression)
+
+   for cut in range(len(MAGIC) + 1, len(data)):
+      with pytest.raises(ValueError):
+         decode_blocks(data[:cut])
+   with pytest.raises(ValueError):
+      decode_blocks(MAGIC + b"\x00\x05\xff\xff\xff\xff\xff")
@@ -0,0 +1,64 @@
+import pytest
+from blockchain.signer import SignerWorker, BlockSealer
+from conftest import make_listing
+
+
+@pytest.fixture
+def sealer(poa_chain, validator_keys):
+   signer = SignerWorker()
+   signer.load_key(validator_keys[0])
+   sealer = BlockSealer(poa_chain, signer)
+   yield sealer
+   sealer.close()
+   signer.close()
+
+
+def queue_listing(blockchain, title):
+   blockchain.add_new_transaction(make_listing(title))
+   return blockchain.unconfirmed_transactions[-1]
+
+
+def test_seals_pending_transaction(poa_chain, sealer):
+   tx = queue_listing(poa_chain, "Riad Fès")
+
+   assert sealer.seal([tx]) == 1
+   assert poa_chain.last_block.transactions[0]['tx_id'] == tx['tx_id']
+   assert poa_chain.unconfirmed_transactions == []
+
+
+def test_sealer_survives_failing_commit(poa_chain, sealer, monkeypatch):
+   add_block = poa_chain.add_block
+   failures = []
+
+   def failing_add_block(block, proof):
+      if not failures:
+         failures.append(block.index)
+         raise RuntimeError("disk full")
+      return add_block(block, proof)
+
+   monkeypatch.setattr(poa_chain, 'add_block', failing_add_block)
+   first = sealer.submit([queue_listing(poa_chain, "Villa Agadir")])
+   with pytest.raises(RuntimeError):
+      first.result(timeout=10)
+
+   # The pipeline keeps running and rebases on the chain after the failure.
+   second = sealer.submit([queue_listing(poa_chain, "Studio Rabat")])
+   assert second.result(timeout=10) == 1
+   assert poa_chain.last_block.index == 1
+
+
+def test_sealer_survives_failing_signature(poa_chain, sealer, monkeypatch):
+   sign = sealer.signer.signature_manager.sign_data_with_key
+   calls = []
+
+   def failing_sign(data, key):
+      calls.append(data)
+      if len(calls) == 1:
+         raise OSError("HSM unavailable")
+      return sign(data, key)
+
+   monkeypatch.setattr(sealer.signer.signature_manager, 'sign_data_with_key', failing_sign)
+   first = sealer.submit([queue_listing(poa_chain, "Villa Agadir")])
+   with pytest.raises(OSError):
+      first.result(timeout=10)
+   assert sealer.submit([queue_listing(poa_chain, "Studio Rabat")]).result(timeout=10) == 1